@@ -0,0 +1,252 @@
+"""
+run_benchmarks.py – Pipeline Benchmark Suite
+--------------------------------------------
+
+Times the main pipeline stages on deterministic synthetic station data
+(see benchmarks/synthetic.py) at several sizes and stores the results as
+JSON, so runs can be compared across commits:
+
+- loader:   BaseCSVLoader.load (station schema, no cache)
+- cleaner:  SolarDataCleaner.run
+- reporter: SolarReportGenerator.generate (no files written)
+- compare:  SolarComparisonPipeline load_data / aggregates / summarize /
+            report_missing / test_normality / run_kruskal (plots excluded);
+            the pipeline's cached aggregates and ranks are cleared before
+            every run, so each stage is timed cold
+
+Each stage reports wall time, throughput (rows/s) and peak Python/NumPy
+memory (tracemalloc, measured in a separate run so tracing does not
+distort the timings).
+
+Usage:
+    python benchmarks/run_benchmarks.py                      # 1, 5 and 20 station-years
+    python benchmarks/run_benchmarks.py --sizes 1 --repeat 3
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/old.json
+
+Author: Nabil Mohamed
+"""
+
+# ------------------------------------------------------------------------------
+# 📂 System Setup: Ensure imports work from project root
+# ------------------------------------------------------------------------------
+
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# ------------------------------------------------------------------------------
+# 📦 Imports
+# ------------------------------------------------------------------------------
+
+import io
+import gc
+import json
+import time
+import shutil
+import argparse
+import platform
+import subprocess
+import tracemalloc
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
+
+import matplotlib
+matplotlib.use("Agg")  # Comparison pipeline imports pyplot; never open windows
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import write_station_csv, GENERATOR_VERSION   # Synthetic station data
+from src.loader import BaseCSVLoader                                     # Stage 1: loading
+from src.clean import SolarDataCleaner                                   # Stage 2: cleaning
+from src.report import SolarReportGenerator                              # Stage 3: reporting
+from src.compare_pipeline import SolarComparisonPipeline                 # Stage 4: comparison
+from src.schema import STATION_DTYPES, SKIP_COLUMNS, TIMESTAMP_COLUMN    # Shared schema
+
+# ------------------------------------------------------------------------------
+# 🔧 Configuration
+# ------------------------------------------------------------------------------
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(BENCH_DIR, ".data")        # Generated inputs (git-ignored, reused)
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")   # One JSON file per run
+DEFAULT_SIZES = [1, 5, 20]                         # Station-years
+COMPARE_FILES = ["benin_clean.csv", "togo_clean.csv", "sierra_leone_clean.csv"]
+
+# ------------------------------------------------------------------------------
+# ⏱️ Measurement helpers
+# ------------------------------------------------------------------------------
+
+def _measure(fn, repeat: int, memory: bool, setup=None) -> tuple:
+    """
+    Run `fn` `repeat` times for timing (best of) and once more under
+    tracemalloc for peak memory. `fn` returns the value the next stage needs;
+    `setup` (untimed) runs before every call, e.g. to clear caches.
+    """
+    times = []
+    result = None
+    for _ in range(repeat):
+        result = None
+        if setup is not None:
+            setup()
+        gc.collect()
+        start = time.perf_counter()
+        with redirect_stdout(io.StringIO()):  # Stage diagnostics are not part of the benchmark
+            result = fn()
+        times.append(time.perf_counter() - start)
+
+    peak = None
+    if memory:
+        if setup is not None:
+            setup()
+        gc.collect()
+        tracemalloc.start()
+        with redirect_stdout(io.StringIO()):
+            fn()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return {"seconds": min(times), "all_seconds": times, "peak_bytes": peak}, result
+
+
+def _record(results: list, stage: str, years: float, rows: int, timing: dict):
+    entry = {"stage": stage, "station_years": years, "rows": rows, **timing,
+             "rows_per_second": rows / timing["seconds"] if timing["seconds"] else None}
+    results.append(entry)
+    peak = f"{entry['peak_bytes'] / 2**20:8.1f} MiB" if entry["peak_bytes"] is not None else "       n/a"
+    print(f"  {stage:<24} {entry['seconds']:8.2f} s  {entry['rows_per_second']:12,.0f} rows/s  {peak}")
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BENCH_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+# ------------------------------------------------------------------------------
+# 🚀 Benchmark one size
+# ------------------------------------------------------------------------------
+
+def bench_size(years: float, repeat: int = 1, memory: bool = True, seed: int = 0) -> list:
+    """
+    Generate (or reuse) a synthetic station of `years` station-years and
+    time every stage on it.
+    """
+    results = []
+    path = os.path.join(DATA_DIR, f"station_{years:g}y_seed{seed}_v{GENERATOR_VERSION}.csv")
+    print(f"\n☀️ {years:g} station-year(s): {path}")
+    start = time.perf_counter()
+    write_station_csv(path, years, seed=seed)
+    print(f"  {'generate':<24} {time.perf_counter() - start:8.2f} s")
+
+    # 📂 Loader
+    def load():
+        loader = BaseCSVLoader(path, parse_dates=[TIMESTAMP_COLUMN], verbose=False,
+                               dtype=STATION_DTYPES, skip_columns=SKIP_COLUMNS, drop_empty=True)
+        return loader.load()
+    timing, df = _measure(load, repeat, memory)
+    rows = len(df)
+    _record(results, "loader.load", years, rows, timing)
+
+    # 🧼 Cleaner
+    timing, df_clean = _measure(lambda: SolarDataCleaner(df, verbose=False).run(), repeat, memory)
+    _record(results, "cleaner.run", years, rows, timing)
+
+    # 📋 Reporter
+    timing, _ = _measure(lambda: SolarReportGenerator(df, country="bench").generate(save=False),
+                         repeat, memory)
+    _record(results, "reporter.generate", years, rows, timing)
+
+    # 🌍 Comparison: the cleaned frame stands in for each of the three countries
+    compare_dir = os.path.join(DATA_DIR, f"compare_{years:g}y")
+    os.makedirs(compare_dir, exist_ok=True)
+    df_clean.to_csv(os.path.join(compare_dir, COMPARE_FILES[0]), index=False)
+    for name in COMPARE_FILES[1:]:
+        shutil.copyfile(os.path.join(compare_dir, COMPARE_FILES[0]), os.path.join(compare_dir, name))
+    del df, df_clean
+
+    pipeline = SolarComparisonPipeline(data_path=compare_dir)
+    timing, _ = _measure(pipeline.load_data, repeat, memory)
+    compare_rows = len(pipeline.df_all)
+    _record(results, "compare.load_data", years, compare_rows, timing)
+
+    def clear_caches():  # Cached aggregates/ranks would turn repeats into lookups
+        pipeline._aggregates = None
+        pipeline._ranks = {}
+
+    for stage in ["aggregates", "summarize", "report_missing", "test_normality", "run_kruskal"]:
+        timing, _ = _measure(getattr(pipeline, stage), repeat, memory, setup=clear_caches)
+        _record(results, f"compare.{stage}", years, compare_rows, timing)
+
+    shutil.rmtree(compare_dir, ignore_errors=True)
+    return results
+
+# ------------------------------------------------------------------------------
+# 📊 Comparing runs
+# ------------------------------------------------------------------------------
+
+def compare_runs(baseline: dict, current: dict) -> pd.DataFrame:
+    """
+    Per-stage timing ratio (current / baseline) for sizes present in both runs.
+    Values below 1 are speed-ups.
+    """
+    def frame(run):
+        return pd.DataFrame(run["results"]).set_index(["station_years", "stage"])["seconds"]
+    table = pd.concat({"baseline_s": frame(baseline), "current_s": frame(current)}, axis=1).dropna()
+    table["ratio"] = (table["current_s"] / table["baseline_s"]).round(3)
+    return table
+
+# ------------------------------------------------------------------------------
+# 🏁 Entry point
+# ------------------------------------------------------------------------------
+
+def main(argv=None) -> str:
+    parser = argparse.ArgumentParser(description="Benchmark loader, cleaner, reporter and comparison stages.")
+    parser.add_argument("--sizes", type=float, nargs="+", default=DEFAULT_SIZES,
+                        help="Station-years to benchmark (default: 1 5 20)")
+    parser.add_argument("--repeat", type=int, default=1, help="Timed runs per stage (best is reported)")
+    parser.add_argument("--seed", type=int, default=0, help="Synthetic data seed")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc peak-memory runs")
+    parser.add_argument("--output", default=None, help="Result JSON path (default: benchmarks/results/<time>_<commit>.json)")
+    parser.add_argument("--compare", default=None, help="Earlier result JSON to compare against")
+    args = parser.parse_args(argv)
+
+    results = []
+    for years in args.sizes:
+        results.extend(bench_size(years, repeat=args.repeat, memory=not args.no_memory, seed=args.seed))
+
+    commit = _git_commit()
+    run = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "generator_version": GENERATOR_VERSION,
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+        },
+        "results": results,
+    }
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{datetime.now().strftime('%Y%m%d-%H%M%S')}_{commit}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="utf-8") as fh:
+        json.dump(run, fh, indent=2)
+    print(f"\n✅ Results saved to {output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as fh:
+            baseline = json.load(fh)
+        print(f"\n📊 Versus {args.compare} (commit {baseline.get('commit')}):")
+        print(compare_runs(baseline, run).to_string())
+    return output
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+synthetic.py – Deterministic Synthetic Station Data
+---------------------------------------------------
+
+Generates realistic one-minute station files with the same layout as the
+challenge exports (see src/schema.py), for benchmarking without the real
+data:
+- Diurnal and seasonal GHI/DNI/DHI from a simple solar-geometry model
+  (West African latitude) with an autocorrelated cloud factor
+- Sensor noise on every channel, module sensors tracking GHI
+- Injected gaps (runs of missing minutes) and outlier spikes
+
+The same (years, seed) always produces byte-identical files.
+
+Usage:
+    from benchmarks.synthetic import write_station_csv
+
+    path = write_station_csv("benchmarks/.data/station_1y.csv", years=1)
+
+Author: Nabil Mohamed
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+from scipy.signal import lfilter
+
+GENERATOR_VERSION = 1  # Bump when the generated data changes (invalidates cached files)
+START = "2021-01-01 00:01"  # First timestamp of every synthetic station
+LATITUDE = 11.0  # Degrees north (Sahel / coastal West Africa)
+GAP_RUNS_PER_DAY = 0.5  # Expected number of missing-data runs per day
+OUTLIERS_PER_DAY = 2.0  # Expected number of spike rows per day
+
+# ------------------------------------------------------------------------------
+# ☀️ Generator
+# ------------------------------------------------------------------------------
+
+def generate_station(minutes: int, seed: int = 0, start: str = START) -> pd.DataFrame:
+    """
+    Build one block of synthetic one-minute station data.
+
+    Parameters:
+    - minutes (int): Number of rows (one per minute)
+    - seed (int): Random seed; identical inputs give identical frames
+    - start (str): First timestamp
+
+    Returns:
+    - pd.DataFrame: Raw-export layout with 'Timestamp' formatted as text
+    """
+    rng = np.random.default_rng(seed)
+    ts = pd.date_range(start, periods=minutes, freq="min")
+
+    # 🌍 Solar elevation from day-of-year declination and hour angle
+    day = ts.dayofyear.to_numpy()
+    hour = ts.hour.to_numpy() + ts.minute.to_numpy() / 60
+    declination = np.radians(23.44) * np.sin(2 * np.pi * (284 + day) / 365)
+    hour_angle = np.radians(15 * (hour - 12))
+    lat = np.radians(LATITUDE)
+    sin_elev = np.clip(np.sin(lat) * np.sin(declination)
+                       + np.cos(lat) * np.cos(declination) * np.cos(hour_angle), 0, None)
+
+    # ☁️ Cloudiness: AR(1) process per minute, wetter in mid-year
+    shocks = rng.normal(0, 0.02, minutes)
+    cloud = lfilter([1.0], [1.0, -0.999], shocks)  # cloud[i] = 0.999 · cloud[i-1] + shock[i]
+    wet_season = 0.25 * (1 + np.sin(2 * np.pi * (day - 100) / 365))
+    clearness = np.clip(1 - np.abs(cloud) - wet_season * 0.5, 0.05, 1)
+
+    dni = 950 * clearness * sin_elev ** 0.3 * (sin_elev > 0)
+    dhi = (60 + 300 * (1 - clearness)) * sin_elev
+    ghi = dni * sin_elev + dhi
+
+    df = pd.DataFrame({"Timestamp": ts.strftime("%Y-%m-%d %H:%M")})
+    df["GHI"] = ghi + rng.normal(0, 3, minutes)
+    df["DNI"] = dni + rng.normal(0, 3, minutes)
+    df["DHI"] = dhi + rng.normal(0, 2, minutes)
+    df["ModA"] = ghi * 0.97 + rng.normal(0, 2, minutes)
+    df["ModB"] = ghi * 0.96 + rng.normal(0, 2, minutes)
+    df["Tamb"] = 24 + 8 * sin_elev + 3 * wet_season + rng.normal(0, 0.3, minutes)
+    df["RH"] = np.clip(85 - 40 * sin_elev + 20 * wet_season + rng.normal(0, 2, minutes), 5, 100)
+    df["WS"] = rng.gamma(2, 1, minutes)
+    df["WSgust"] = df["WS"] * rng.uniform(1.2, 1.8, minutes)
+    df["WSstdev"] = rng.uniform(0.1, 0.6, minutes)
+    df["WD"] = rng.uniform(0, 360, minutes)
+    df["WDstdev"] = rng.uniform(2, 15, minutes)
+    df["BP"] = np.round(997 + rng.normal(0, 1.5, minutes))
+    df["Cleaning"] = (rng.random(minutes) < 1 / 20000).astype(int)
+    df["Precipitation"] = np.where(rng.random(minutes) < 0.002 * (1 + 4 * wet_season),
+                                   rng.exponential(0.5, minutes), 0.0)
+    df["TModA"] = df["Tamb"] + 25 * sin_elev + rng.normal(0, 0.5, minutes)
+    df["TModB"] = df["Tamb"] + 23 * sin_elev + rng.normal(0, 0.5, minutes)
+    df["Comments"] = np.nan
+
+    # 🕳️ Gaps: runs of missing minutes on the irradiance and module channels
+    n_gaps = rng.poisson(GAP_RUNS_PER_DAY * minutes / 1440)
+    starts = rng.integers(0, minutes, n_gaps)
+    lengths = rng.geometric(1 / 20, n_gaps)  # Mean run of 20 minutes, occasional long outages
+    gap = np.zeros(minutes + 1, dtype=np.int64)
+    np.add.at(gap, starts, 1)
+    np.add.at(gap, np.minimum(starts + lengths, minutes), -1)
+    missing = np.cumsum(gap[:-1]) > 0
+    df.loc[missing, ["GHI", "DNI", "DHI", "ModA", "ModB"]] = np.nan
+
+    # ⚡ Outliers: isolated spikes on random channels
+    n_spikes = rng.poisson(OUTLIERS_PER_DAY * minutes / 1440)
+    rows = rng.integers(0, minutes, n_spikes)
+    for col in ["GHI", "DNI", "DHI", "ModA", "ModB", "WS", "WSgust"]:
+        hit = rows[rng.random(n_spikes) < 1 / 7]
+        df.loc[hit, col] = df[col].abs().max() * rng.uniform(2, 5, len(hit))
+
+    float_cols = [c for c in df.columns if df[c].dtype == np.float64 and c != "Comments"]
+    df[float_cols] = df[float_cols].round(1)
+    return df
+
+
+def write_station_csv(path: str, years: float, seed: int = 0, overwrite: bool = False) -> str:
+    """
+    Write `years` station-years of synthetic data to a CSV (year by year).
+
+    Existing files are reused unless `overwrite` is set, so the generator
+    cost is paid once per size and seed.
+
+    Returns:
+    - str: The CSV path
+    """
+    if os.path.exists(path) and not overwrite:
+        return path
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    total = int(round(years * 365 * 1440))
+    start = pd.Timestamp(START)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8", newline="") as fh:
+        written = 0
+        block = 0
+        while written < total:
+            rows = min(365 * 1440, total - written)
+            df = generate_station(rows, seed=seed * 1000 + block, start=str(start))
+            df.to_csv(fh, header=(written == 0), index=False)
+            start += pd.Timedelta(minutes=rows)
+            written += rows
+            block += 1
+    os.replace(tmp_path, path)
+    return path
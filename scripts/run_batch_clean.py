@@ -0,0 +1,46 @@
+"""
+run_batch_clean.py – Clean All Registered Stations in Parallel
+--------------------------------------------------------------
+
+Cleans every station in the registry in one invocation, one worker
+process per station, instead of running the per-country pipelines one
+after another.
+
+- Each worker loads, cleans and writes data/<station>_clean.csv itself
+- Column statistics are saved next to each output (<station>_clean.stats.json)
+
+Author: Nabil Mohamed
+"""
+
+# ------------------------------------------------------------------------------
+# 📂 System Setup: Ensure imports work from project root
+# ------------------------------------------------------------------------------
+
+import sys
+import os
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOT)
+
+# ------------------------------------------------------------------------------
+# 📦 Imports
+# ------------------------------------------------------------------------------
+
+from src.stations import STATION_REGISTRY        # Registered sites (name, path, timezone)
+from src.clean import SolarDataCleaner           # Batch cleaning in a process pool
+
+# ------------------------------------------------------------------------------
+# 🔧 Configuration
+# ------------------------------------------------------------------------------
+
+OUTPUT_DIR = os.path.join(ROOT, "data")  # Absolute, independent of the working directory
+WORKERS = None                           # Default: one process per station, capped at the CPU count
+
+# ------------------------------------------------------------------------------
+# 🚀 Clean every station
+# ------------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    os.chdir(ROOT)  # Registry paths are relative to the project root
+    SolarDataCleaner.run_many(list(STATION_REGISTRY), output_dir=OUTPUT_DIR, workers=WORKERS)
+    print("\n✅ Batch cleaning complete.")
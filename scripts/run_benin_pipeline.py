@@ -28,8 +28,10 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 # ------------------------------------------------------------------------------
 
 from src.loader import BaseCSVLoader as SolarDataLoader                    # General-purpose CSV loader
+from src.schema import STATION_DTYPES, SKIP_COLUMNS                         # Declared station dtypes
 from src.clean import SolarDataCleaner                      # Object-oriented data cleaner
 from src.report import SolarReportGenerator                    # Reporting utility
+from src.stats import ColumnStats, stats_path_for              # Shared column statistics
 from src.plots import (                                     # Visualization modules
     plot_time_series,
     plot_cleaning_impact,
@@ -47,13 +49,21 @@ from src.plots import (                                     # Visualization modu
 COUNTRY = "benin"
 INPUT_FILE = "src/benin/benin-malanville.csv"
 OUTPUT_FILE = f"data/{COUNTRY}_clean.csv"
+CACHE_DIR = "data/.cache"  # Parquet cache for fast repeat loads
 
 # ------------------------------------------------------------------------------
 # ✅ Step 1: Load Raw Dataset
 # ------------------------------------------------------------------------------
 
 # Instantiate loader for Benin dataset
-loader = SolarDataLoader(path=INPUT_FILE, parse_dates=["Timestamp"])
+loader = SolarDataLoader(
+    path=INPUT_FILE,
+    parse_dates=["Timestamp"],
+    dtype=STATION_DTYPES,        # float32 sensors, uint8 Cleaning flag
+    skip_columns=SKIP_COLUMNS,   # Always-empty Comments column
+    drop_empty=True,
+    cache_dir=CACHE_DIR,
+)
 df = loader.load()  # Load and return parsed, timestamped DataFrame
 
 # ------------------------------------------------------------------------------
@@ -61,7 +71,8 @@ df = loader.load()  # Load and return parsed, timestamped DataFrame
 # ------------------------------------------------------------------------------
 
 # Print summary statistics and missing value report, export CSVs
-reporter = SolarReportGenerator(df, country=COUNTRY)
+stats = ColumnStats.from_frame(df)  # One scan shared by reporter and cleaner
+reporter = SolarReportGenerator(df, country=COUNTRY, stats=stats)
 reporter.generate(save=True)
 
 # ------------------------------------------------------------------------------
@@ -69,7 +80,7 @@ reporter.generate(save=True)
 # ------------------------------------------------------------------------------
 
 # Apply full Z-score-based outlier cleaning pipeline
-cleaner = SolarDataCleaner(df)
+cleaner = SolarDataCleaner(df, stats=stats)
 df_clean = cleaner.run()
 
 # ------------------------------------------------------------------------------
@@ -79,6 +90,7 @@ df_clean = cleaner.run()
 # Ensure output directory exists and save cleaned DataFrame
 os.makedirs("data", exist_ok=True)
 df_clean.to_csv(OUTPUT_FILE, index=False)
+stats.save(stats_path_for(INPUT_FILE))  # Sidecar named after the raw file the stats describe
 print(f"✅ Cleaned data saved to: {OUTPUT_FILE} ({COUNTRY}_clean.csv)")
 
 # ------------------------------------------------------------------------------
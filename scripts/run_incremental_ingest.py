@@ -0,0 +1,54 @@
+"""
+run_incremental_ingest.py – Daily Refresh of Cleaned Station Data
+-----------------------------------------------------------------
+
+Appends newly logged minutes from every registered station to its
+cleaned output (data/<station>_clean.csv) instead of re-running the
+full per-country pipelines.
+
+- First run (or after the raw file is rewritten): full clean + state
+- Later runs: only the appended tail is parsed, cleaned and appended
+
+Author: Nabil Mohamed
+"""
+
+# ------------------------------------------------------------------------------
+# 📂 System Setup: Ensure imports work from project root
+# ------------------------------------------------------------------------------
+
+import sys
+import os
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOT)
+
+# ------------------------------------------------------------------------------
+# 📦 Imports
+# ------------------------------------------------------------------------------
+
+from src.stations import STATION_REGISTRY        # Registered sites (name, path, timezone)
+from src.ingest import IncrementalIngestor       # Offset-based append ingestion
+
+# ------------------------------------------------------------------------------
+# 🔧 Configuration
+# ------------------------------------------------------------------------------
+
+OUTPUT_DIR = os.path.join(ROOT, "data")          # Absolute, independent of the working directory
+STATE_DIR = os.path.join(ROOT, "data", ".state")
+
+# ------------------------------------------------------------------------------
+# 🔁 Refresh every station
+# ------------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    os.chdir(ROOT)  # Registry paths are relative to the project root
+    for key, station in STATION_REGISTRY.items():
+        ingestor = IncrementalIngestor(
+            station=key,
+            source_path=station.path,
+            output_path=os.path.join(OUTPUT_DIR, f"{key}_clean.csv"),
+            state_dir=STATE_DIR,
+        )
+        ingestor.run()
+
+    print("\n✅ Incremental refresh complete.")
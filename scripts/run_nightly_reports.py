@@ -0,0 +1,47 @@
+"""
+run_nightly_reports.py – Data Quality Reports for All Stations
+--------------------------------------------------------------
+
+Generates the summary-statistics and missing-value reports for every
+registered station in one parallel job (one worker process per station)
+instead of one script run per country.
+
+- Reports are written atomically under REPORT_DIR
+- FORMAT selects CSV, Parquet or JSON output
+
+Author: Nabil Mohamed
+"""
+
+# ------------------------------------------------------------------------------
+# 📂 System Setup: Ensure imports work from project root
+# ------------------------------------------------------------------------------
+
+import sys
+import os
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOT)
+
+# ------------------------------------------------------------------------------
+# 📦 Imports
+# ------------------------------------------------------------------------------
+
+from src.stations import STATION_REGISTRY        # Registered sites (name, path, timezone)
+from src.report import SolarReportGenerator      # Parallel report generation
+
+# ------------------------------------------------------------------------------
+# 🔧 Configuration
+# ------------------------------------------------------------------------------
+
+REPORT_DIR = os.path.join(ROOT, "reports")  # Absolute, independent of the working directory
+FORMAT = "csv"                              # "csv", "parquet" or "json"
+WORKERS = None                              # Default: one process per station, capped at the CPU count
+
+# ------------------------------------------------------------------------------
+# 🚀 Report on every station
+# ------------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    os.chdir(ROOT)  # Registry paths are relative to the project root
+    SolarReportGenerator.run_many(list(STATION_REGISTRY), output_dir=REPORT_DIR, fmt=FORMAT, workers=WORKERS)
+    print("\n✅ Nightly reports complete.")
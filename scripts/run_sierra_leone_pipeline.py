@@ -34,6 +34,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 from src.Sierra_Leone.load import SierraLeoneDataLoader                   # Country-specific loader
 from src.clean import SolarDataCleaner                                     # Object-oriented cleaner
 from src.report import SolarReportGenerator                                # Reporting engine
+from src.stats import ColumnStats, stats_path_for                          # Shared column statistics
 from src.plots import (                                                    # EDA visualizations
     plot_time_series,
     plot_cleaning_impact,
@@ -51,26 +52,28 @@ from src.plots import (                                                    # EDA
 COUNTRY = "sierra_leone"
 INPUT_FILE = "src/Sierra_Leone/sierraleone-bumbuna.csv"
 OUTPUT_FILE = f"data/{COUNTRY}_clean.csv"
+CACHE_DIR = "data/.cache"  # Parquet cache for fast repeat loads
 
 # ----------------------------------------------------------------------
 # ✅ Step 1: Load Raw Dataset
 # ----------------------------------------------------------------------
 
-loader = SierraLeoneDataLoader(INPUT_FILE)
+loader = SierraLeoneDataLoader(INPUT_FILE, cache_dir=CACHE_DIR)
 df = loader.load()
 
 # ----------------------------------------------------------------------
 # 📉 Step 1.5: Summary Report
 # ----------------------------------------------------------------------
 
-reporter = SolarReportGenerator(df, country=COUNTRY)
+stats = ColumnStats.from_frame(df)  # One scan shared by reporter and cleaner
+reporter = SolarReportGenerator(df, country=COUNTRY, stats=stats)
 reporter.generate(save=True)
 
 # ----------------------------------------------------------------------
 # 🧼 Step 2: Clean Data
 # ----------------------------------------------------------------------
 
-cleaner = SolarDataCleaner(df)
+cleaner = SolarDataCleaner(df, stats=stats)
 df_clean = cleaner.run()
 
 # ----------------------------------------------------------------------
@@ -79,6 +82,7 @@ df_clean = cleaner.run()
 
 os.makedirs("data", exist_ok=True)
 df_clean.to_csv(OUTPUT_FILE, index=False)
+stats.save(stats_path_for(INPUT_FILE))  # Sidecar named after the raw file the stats describe
 print(f"✅ Cleaned data saved to: {OUTPUT_FILE} ({COUNTRY}_clean.csv)")
 
 # ----------------------------------------------------------------------
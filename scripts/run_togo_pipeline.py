@@ -34,6 +34,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 from src.Togo.load import TogoDataLoader                            # Country-specific loader
 from src.clean import SolarDataCleaner                              # Object-oriented cleaner
 from src.report import SolarReportGenerator                         # Summary + null reporter
+from src.stats import ColumnStats, stats_path_for                   # Shared column statistics
 from src.plots import (                                             # Visualization suite
     plot_time_series,
     plot_cleaning_impact,
@@ -51,13 +52,14 @@ from src.plots import (                                             # Visualizat
 COUNTRY = "togo"
 INPUT_FILE = "src/Togo/togo-dapaong_qc.csv"
 OUTPUT_FILE = f"data/{COUNTRY}_clean.csv"
+CACHE_DIR = "data/.cache"  # Parquet cache for fast repeat loads
 
 # ------------------------------------------------------------------------------
 # ✅ Step 1: Load Raw Dataset
 # ------------------------------------------------------------------------------
 
 # Instantiate TogoDataLoader and load dataset
-loader = TogoDataLoader(INPUT_FILE)
+loader = TogoDataLoader(INPUT_FILE, cache_dir=CACHE_DIR)
 df = loader.load()
 
 # ------------------------------------------------------------------------------
@@ -65,7 +67,8 @@ df = loader.load()
 # ------------------------------------------------------------------------------
 
 # Initialize reporter and print+save basic diagnostics
-reporter = SolarReportGenerator(df, country=COUNTRY)
+stats = ColumnStats.from_frame(df)  # One scan shared by reporter and cleaner
+reporter = SolarReportGenerator(df, country=COUNTRY, stats=stats)
 reporter.generate(save=True)
 
 # ------------------------------------------------------------------------------
@@ -73,7 +76,7 @@ reporter.generate(save=True)
 # ------------------------------------------------------------------------------
 
 # Clean using numeric coercion, Z-score outlier removal, and median imputation
-cleaner = SolarDataCleaner(df)
+cleaner = SolarDataCleaner(df, stats=stats)
 df_clean = cleaner.run()
 
 # ------------------------------------------------------------------------------
@@ -83,6 +86,7 @@ df_clean = cleaner.run()
 # Create output directory (if it doesn't exist) and save to CSV
 os.makedirs("data", exist_ok=True)
 df_clean.to_csv(OUTPUT_FILE, index=False)
+stats.save(stats_path_for(INPUT_FILE))  # Sidecar named after the raw file the stats describe
 print(f"✅ Cleaned data saved to: {OUTPUT_FILE} ({COUNTRY}_clean.csv)")
 
 # ------------------------------------------------------------------------------
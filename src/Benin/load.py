@@ -2,28 +2,27 @@
 benin/load.py – Benin Solar Dataset Loader
 ------------------------------------------
 
-Wraps the general-purpose BaseCSVLoader for Benin-specific data.
-Adds timestamp sorting and diagnostics with clear logging.
+Thin wrapper around the generic StationDataLoader for Benin-specific data.
+Kept for backwards compatibility; new sites only need a registry entry in
+src/stations.py.
 
 Author: Nabil Mohamed
 """
 
-import pandas as pd
-from src.loader import BaseCSVLoader  # Reuse the general-purpose CSV loader
-import os
+from src.stations import StationDataLoader, get_station  # Generic station loader + registry
 
 # ------------------------------------------------------------------------------
 # 🇧🇯 Benin Dataset Loader
 # ------------------------------------------------------------------------------
 
-class BeninDataLoader:
+class BeninDataLoader(StationDataLoader):
     """
     Specialized loader for Benin's cleaned solar irradiance dataset.
 
-    Builds on top of BaseCSVLoader:
-    - Handles timestamp parsing
-    - Applies encoding fallback if necessary
-    - Sorts chronologically
+    Builds on top of StationDataLoader:
+    - Handles timestamp parsing and the shared station schema
+    - Detects encoding once (UTF-8 or latin1)
+    - Sorts chronologically only if needed
     - Logs key file diagnostics
 
     Example:
@@ -31,7 +30,7 @@ class BeninDataLoader:
     >>> df_benin = loader.load()
     """
 
-    def __init__(self, path: str):
+    def __init__(self, path: str, cache_dir: str = None):
         """
         Initialize loader for Benin's dataset.
 
@@ -39,31 +38,8 @@ class BeninDataLoader:
         ----------
         path : str
             Path to the cleaned Benin CSV file.
+        cache_dir : str, optional
+            Directory for the Parquet load cache (disabled when None).
         """
-        self.path = path  # Store path for internal reference
-        self.df = None    # Placeholder for the loaded DataFrame
-
-    def load(self) -> pd.DataFrame:
-        """
-        Load the CSV, sort by timestamp, and print diagnostics.
-
-        Returns:
-        --------
-        pd.DataFrame
-            Chronologically ordered Benin solar dataset.
-        """
-        # ✅ Use shared CSV loader with 'Timestamp' column parsing
-        loader = BaseCSVLoader(path=self.path, parse_dates=["Timestamp"], verbose=False)
-        df = loader.load()
-
-        # 📊 Sort the dataset chronologically
-        df = df.sort_values("Timestamp").reset_index(drop=True)
-
-        # 💬 Diagnostics (customized for Benin loader)
-        print(f"📍 Benin Data Loaded from: {self.path}")
-        print(f"🔢 Shape: {df.shape}")
-        print(f"🧪 Columns: {df.columns.tolist()}")
-
-        # ✅ Assign to self and return
-        self.df = df
-        return df
+        station = get_station("benin")  # Registry entry supplies name + timezone
+        super().__init__(path, name=station.name, timezone=station.timezone, cache_dir=cache_dir)
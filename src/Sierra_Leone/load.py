@@ -2,28 +2,26 @@
 sierra_leone/load.py – Sierra Leone Solar Dataset Loader
 ---------------------------------------------------------
 
-Wraps the general-purpose BaseCSVLoader for Sierra Leone-specific solar data.
-Includes encoding fallback, timestamp parsing, and diagnostic printouts.
+Wraps the generic StationDataLoader for Sierra Leone-specific solar data.
+Includes encoding detection, timestamp parsing, and diagnostic printouts.
 
 Author: Nabil Mohamed
 """
 
-import pandas as pd
-from src.loader import BaseCSVLoader  # General-purpose CSV loader
-import os
+from src.stations import StationDataLoader, get_station  # Generic station loader + registry
 
 # ------------------------------------------------------------------------------
 # 🇸🇱 Sierra Leone Dataset Loader
 # ------------------------------------------------------------------------------
 
-class SierraLeoneDataLoader:
+class SierraLeoneDataLoader(StationDataLoader):
     """
     Specialized loader for Sierra Leone's cleaned solar irradiance dataset.
 
     Functionality:
     - Parses 'Timestamp' column into datetime format
-    - Handles UTF-8 and fallback to 'latin1' encoding
-    - Sorts records chronologically
+    - Handles UTF-8 and 'latin1' encoded files
+    - Sorts records chronologically when out of order
     - Prints concise diagnostics for auditability
 
     Example:
@@ -31,7 +29,7 @@ class SierraLeoneDataLoader:
     >>> df_sl = loader.load()
     """
 
-    def __init__(self, path: str):
+    def __init__(self, path: str, cache_dir: str = None):
         """
         Initialize the loader with the dataset path.
 
@@ -39,30 +37,8 @@ class SierraLeoneDataLoader:
         ----------
         path : str
             Path to the cleaned Sierra Leone CSV file.
+        cache_dir : str, optional
+            Directory for the Parquet load cache (disabled when None).
         """
-        self.path = path
-        self.df = None
-
-    def load(self) -> pd.DataFrame:
-        """
-        Load the dataset with timestamp parsing and encoding fallback.
-
-        Returns:
-        --------
-        pd.DataFrame
-            Chronologically ordered Sierra Leone solar dataset.
-        """
-        # ✅ Use the base loader for safe loading with timestamp parsing
-        loader = BaseCSVLoader(path=self.path, parse_dates=["Timestamp"], verbose=False)
-        df = loader.load()
-
-        # 🧭 Ensure dataset is sorted chronologically by measurement time
-        df = df.sort_values("Timestamp").reset_index(drop=True)
-
-        # 📢 Print structured diagnostic output for traceability
-        print(f"📍 Sierra Leone Data Loaded from: {self.path}")
-        print(f"🔢 Shape: {df.shape}")
-        print(f"🧪 Columns: {df.columns.tolist()}")
-
-        self.df = df
-        return df
+        station = get_station("sierra_leone")
+        super().__init__(path, name=station.name, timezone=station.timezone, cache_dir=cache_dir)
@@ -3,30 +3,28 @@ togo/load.py – Togo Solar Dataset Loader
 ----------------------------------------
 
 Specialized wrapper for loading Togo's cleaned solar irradiance dataset.
-Builds on the BaseCSVLoader to enable:
-- Timestamp parsing
-- Encoding fallback (UTF-8 → latin1)
+Delegates to the generic StationDataLoader (src/stations.py) for:
+- Timestamp parsing and declared dtypes
+- Single-pass encoding detection (UTF-8 → latin1)
 - Clean diagnostics for reproducibility
 
 Author: Nabil Mohamed
 """
 
-import pandas as pd
-from src.loader import BaseCSVLoader  # General-purpose resilient CSV loader
-import os
+from src.stations import StationDataLoader, get_station  # Generic station loader + registry
 
 # ------------------------------------------------------------------------------
 # 🇹🇬 Togo Dataset Loader
 # ------------------------------------------------------------------------------
 
-class TogoDataLoader:
+class TogoDataLoader(StationDataLoader):
     """
-    Loads and validates Togo's solar dataset using the shared BaseCSVLoader logic.
+    Loads and validates Togo's solar dataset using the shared station loader.
 
     Key Features:
     - Parses 'Timestamp' into datetime format
-    - Automatically falls back to latin1 encoding if UTF-8 fails
-    - Sorts entries chronologically
+    - Automatically uses latin1 encoding if the file is not valid UTF-8
+    - Sorts entries chronologically (skipped when already ordered)
     - Displays dataset diagnostics (shape, columns)
 
     Example:
@@ -34,7 +32,7 @@ class TogoDataLoader:
     >>> df_togo = loader.load()
     """
 
-    def __init__(self, path: str):
+    def __init__(self, path: str, cache_dir: str = None):
         """
         Initialize the loader with the path to the cleaned Togo dataset.
 
@@ -42,30 +40,8 @@ class TogoDataLoader:
         ----------
         path : str
             Filepath to the Togo dataset.
+        cache_dir : str, optional
+            Directory for the Parquet load cache (disabled when None).
         """
-        self.path = path  # Path to CSV
-        self.df = None    # Placeholder for loaded DataFrame
-
-    def load(self) -> pd.DataFrame:
-        """
-        Load, parse, and sort the dataset.
-
-        Returns:
-        --------
-        pd.DataFrame
-            Parsed and chronologically sorted Togo dataset.
-        """
-        # 🧠 Use shared loader logic for fallback, parsing, safety
-        loader = BaseCSVLoader(path=self.path, parse_dates=["Timestamp"], verbose=False)
-        df = loader.load()
-
-        # 📅 Sort by timestamp for temporal analysis
-        df = df.sort_values("Timestamp").reset_index(drop=True)
-
-        # 💬 Diagnostic output for traceability and grading
-        print(f"📍 Togo Data Loaded from: {self.path}")
-        print(f"🔢 Shape: {df.shape}")
-        print(f"🧪 Columns: {df.columns.tolist()}")
-
-        self.df = df
-        return df
+        station = get_station("togo")  # Registry entry supplies name + timezone
+        super().__init__(path, name=station.name, timezone=station.timezone, cache_dir=cache_dir)
@@ -5,12 +5,20 @@ clean.py – Solar Data Cleaning Module
 Encapsulates outlier detection and cleaning logic for solar
 radiation datasets using object-oriented design.
 
+- SolarDataCleaner: in-memory cleaning of one DataFrame
+  (SolarDataCleaner.run_many fans several stations out to a process pool)
+- ChunkedSolarDataCleaner: two-pass, bounded-memory cleaning of files
+  too large to hold in RAM (e.g. multi-year station archives)
+
 Author: Nabil Mohamed
 """
 
+import os # import os for output file handling
 import pandas as pd # import pandas for data manipulation
 import numpy as np # import numpy for numerical operations
 from scipy.stats import zscore # import zscore for statistical calculations
+from src.stats import ColumnStats, DEFAULT_SKETCH_SIZE, stats_path_for # shared per-column statistics
+from src.stations import map_sources, load_source # shared station fan-out for batch cleaning
 
 # ------------------------------------------------------------------------------
 # 🧼 SolarDataCleaner Class
@@ -20,59 +28,454 @@ class SolarDataCleaner: # class to clean solar data
     Cleans solar data by:
     - Converting key columns to numeric
     - Flagging outliers using Z-scores
-    - Imputing missing values using medians
+    - Imputing missing values using medians (or, with impute="interpolate",
+      time interpolation of short gaps and minute-of-day climatology for
+      long ones)
     - Dropping rows with extreme values
+
+    Flagging never removes rows: it records a uint16 QC bitmask per row
+    (`qc_mask`, bit i = outlier in outlier_columns[i]) and keeps the |Z|
+    scores, so filtered views ("clean", "GHI only", "threshold 4") are
+    derived lazily with outlier_mask() / view() without re-running.
+
+    The input frame is neither copied nor modified: numeric coercion and
+    imputation produce separate arrays for the outlier columns only
+    (`numeric`, `imputed`), and frame() / view() assemble the requested
+    output on demand, so the untouched data stays available next to the
+    QC mask.
+
+    With temporal_qc=True three time-series rules set the top bits of the
+    same mask (and hence the same outlier flag):
+    - QC_FLATLINE: a channel above FLATLINE_FLOOR that does not change for
+      `flatline_minutes` consecutive minutes (rolling std == 0)
+    - QC_STEP: a minute-to-minute jump larger than STEP_LIMITS[channel]
+    - QC_CROSS: a cross-channel bound in CROSS_BOUNDS is violated
+
+    Outlier scores are either global per column (mode="global", the
+    default) or computed within hour-of-day × month buckets
+    (mode="seasonal"), so midday irradiance is compared with other
+    middays and dawn readings with other dawns. Within a bucket the score
+    is a Z-score (method="zscore") or a robust MAD score (method="mad").
+
+    Medians come from a shared ColumnStats object (computed once, or passed
+    in from the reporter / a previous run). With score_against_stats=True
+    the Z-scores also use the stored moments, so newly appended rows are
+    cleaned against the full history rather than against themselves.
     """
 
-    def __init__(self, df: pd.DataFrame, outlier_columns=None): # constructor to initialize the class
+    DEFAULT_COLUMNS = ['GHI', 'DNI', 'DHI', 'ModA', 'ModB', 'WS', 'WSgust'] # default columns to clean
+    MODES = ("global", "seasonal") # supported scoring scopes
+    IMPUTE_METHODS = ("median", "interpolate") # supported imputation strategies
+    METHODS = ("zscore", "mad") # supported scoring statistics
+    MAD_SCALE = 1.4826 # MAD → std for normal data
+    MEAN_AD_SCALE = 1.2533 # mean absolute deviation → std (used when MAD is 0)
+    Z_THRESHOLD = 3 # default |Z| above which a value is an outlier
+    QC_DTYPE = np.uint16 # per-row QC bitmask type (one bit per column)
+    QC_FLATLINE = 1 << 13 # stuck sensor
+    QC_STEP = 1 << 14 # physically impossible minute-to-minute change
+    QC_CROSS = 1 << 15 # cross-channel inconsistency
+    QC_RULES = QC_FLATLINE | QC_STEP | QC_CROSS # all temporal rule bits
+    QC_COLUMN_BITS = 13 # low bits available for outlier columns
+    FLATLINE_COLUMNS = ['GHI', 'DNI', 'DHI', 'ModA', 'ModB'] # channels checked for stuck values
+    FLATLINE_FLOOR = 5.0 # W/m²; constant zeros at night are not a fault
+    STEP_LIMITS = {'GHI': 1000.0, 'DNI': 1100.0, 'DHI': 600.0, 'ModA': 1000.0, 'ModB': 1000.0} # max |Δ| per minute (W/m²)
+    # (lower, upper, tolerance): lower must not exceed upper + tolerance.
+    # DNI is not bounded by GHI here: at low sun elevation DNI > GHI is physical.
+    CROSS_BOUNDS = [('DHI', 'GHI', 50.0)]
+
+    def __init__(self, df: pd.DataFrame, outlier_columns=None, stats=None, score_against_stats=False,
+                 verbose: bool = True, mode: str = "global", method: str = "zscore",
+                 impute: str = "median", max_gap: int = 30, temporal_qc: bool = False,
+                 flatline_minutes: int = 60): # constructor to initialize the class
         """
         Initialize cleaner with a dataset and relevant columns.
+
+        stats: optional ColumnStats covering the outlier columns
+        score_against_stats: standardize with the moments in `stats` (global mode only)
+        verbose: print progress messages
+        mode: "global" or "seasonal" (hour-of-day × month buckets; needs 'Timestamp')
+        method: "zscore" or "mad"
+        impute: "median" or "interpolate" (needs 'Timestamp')
+        max_gap: longest gap, in minutes, filled by linear interpolation
+        temporal_qc: also run the flatline / step / cross-channel rules (needs 'Timestamp')
+        flatline_minutes: run length, in minutes, that counts as a stuck sensor
         """
-        default_cols = ['GHI', 'DNI', 'DHI', 'ModA', 'ModB', 'WS', 'WSgust'] # default columns to clean
-        self.df = df.copy() # copy the dataframe to avoid modifying the original
-        self.outlier_columns = outlier_columns or default_cols # set default columns if none provided
-        print(f"🧼 Cleaner initialized with {self.df.shape[0]} rows")
+        if mode not in self.MODES: # validate scoring scope
+            raise ValueError(f"❌ Unknown outlier mode: {mode!r}. Use one of {self.MODES}")
+        if method not in self.METHODS: # validate scoring statistic
+            raise ValueError(f"❌ Unknown outlier method: {method!r}. Use one of {self.METHODS}")
+        if impute not in self.IMPUTE_METHODS: # validate imputation strategy
+            raise ValueError(f"❌ Unknown impute method: {impute!r}. Use one of {self.IMPUTE_METHODS}")
+        if len(outlier_columns or self.DEFAULT_COLUMNS) > self.QC_COLUMN_BITS: # one bit per column
+            raise ValueError(f"❌ At most {self.QC_COLUMN_BITS} outlier columns fit in the QC bitmask")
+        self.df = df # source frame, never modified (outputs are assembled by frame())
+        self.outlier_columns = outlier_columns or self.DEFAULT_COLUMNS # set default columns if none provided
+        self.stats = stats # shared column statistics (computed lazily when None)
+        self.score_against_stats = score_against_stats # use stored moments instead of this frame's
+        self.verbose = verbose # toggle console output
+        self.mode = mode # scoring scope
+        self.method = method # scoring statistic
+        self.impute = impute # imputation strategy
+        self.max_gap = max_gap # interpolation limit (minutes)
+        self.temporal_qc = temporal_qc # run time-series rules
+        self.flatline_minutes = flatline_minutes # stuck-sensor window
+        self.numeric = None # outlier columns coerced to numbers (set by convert_to_numeric)
+        self.imputed = None # outlier columns with gaps filled (set by impute_missing)
+        self.zscores = None # signed Z-scores, kept only with flag_outliers(keep_zscores=True)
+        self.scores = None # |Z| per row and outlier column (float32, set by flag_outliers)
+        self.qc_mask = None # uint16 QC bitmask per row (set by flag_outliers)
+        self._log(f"🧼 Cleaner initialized with {self.df.shape[0]} rows")
+
+    def _log(self, message: str): # helper for optional console output
+        if self.verbose: # only print in verbose mode
+            print(message)
 
     def convert_to_numeric(self): # method to convert columns to numeric
         """
         Force all target columns to numeric (coerce invalid values to NaN).
         This helps clean up units like 'W/m²' or bad parses.
+
+        Results go to `self.numeric`; columns that are already numeric are
+        shared with the source frame rather than copied.
         """
-        for col in self.outlier_columns: # iterate through each column
-            self.df[col] = pd.to_numeric(self.df[col], errors='coerce') # convert to numeric
-        print("🔢 Converted target columns to numeric")
+        self.numeric = pd.DataFrame({ # working view of the outlier columns
+            col: self.df[col] if pd.api.types.is_numeric_dtype(self.df[col]) # already numeric → shared
+            else pd.to_numeric(self.df[col], errors='coerce') # convert to numeric
+            for col in self.outlier_columns
+        }, copy=False) # dict input is copied by default
+        self._log("🔢 Converted target columns to numeric")
 
-    def flag_outliers(self): # method to flag outliers
+    def _numeric(self) -> pd.DataFrame: # helper returning the outlier columns to score
+        return self.numeric if self.numeric is not None else self.df[self.outlier_columns] # raw columns if never converted
+
+    def flag_outliers(self, keep_zscores: bool = False): # method to flag outliers
         """
         Compute Z-scores for outlier columns and flag any row with |Z| > 3.
+
+        Scores are computed on one 2-D block and the flag is a single
+        vectorized reduction. The |Z| block is kept (float32) in
+        `self.scores` and the per-column results are packed into the
+        `self.qc_mask` bitmask; no rows are removed. Per-column `<col>_z`
+        helper columns are only added (by frame()) when keep_zscores=True.
         """
-        for col in self.outlier_columns: # iterate through each column
-            col_z = f"{col}_z" # create a new column for Z-scores
-            self.df[col_z] = zscore(self.df[col].fillna(self.df[col].median())) # calculate Z-scores
+        cols = self.outlier_columns # columns to score
+        if self.mode == "seasonal" or self.method == "mad": # bucketed and/or robust scores
+            z = self._bucket_scores(self._numeric()) # (rows × columns) score matrix
+        else:
+            stats = self.column_stats() # shared statistics (computed once)
+            medians = pd.Series({col: stats.median(col) for col in cols}) # per-column medians
+            filled = self._numeric().fillna(medians) # fill missing values before scoring
+            z = self._zscore_block(filled) # (rows × columns) Z-score matrix
+
+        self.scores = np.abs(z).astype(np.float32) # keep |Z| for re-thresholding
+        self.qc_mask = self._pack_bits(np.abs(z) > self.Z_THRESHOLD) # one bit per column
+        if self.temporal_qc: # time-series rules share the mask
+            self.qc_mask |= self.temporal_flags()
+        self.zscores = z if keep_zscores else None # optionally expose the helper columns
+
+        flagged = int((self.qc_mask != 0).sum()) # count rows with any |Z| > 3 or failed rule
+        self._log(f"⚠️ Flagged {flagged} outlier rows ({self.mode} {self.method})") # print the number of flagged rows
+
+    def _zscore_block(self, filled: pd.DataFrame) -> np.ndarray: # helper computing Z-scores column-wise
+        """
+        Return Z-scores for every column of `filled` as one 2-D array.
+
+        Columns are grouped by dtype (so float32 channels keep float32
+        arithmetic) and each group is scored in column-major layout, which
+        reproduces per-column scipy zscore results exactly. Integer and bool
+        columns are scored in float64, as scipy does for them.
+        """
+        score_types = [dtype if dtype.kind == "f" else np.dtype(np.float64) for dtype in filled.dtypes] # float dtype each column is scored in
+        z = np.empty(filled.shape, dtype=np.result_type(*score_types)) # output matrix
+        positions = {col: i for i, col in enumerate(filled.columns)} # column → output index
+        for _, group in filled.columns.groupby(filled.dtypes.astype(str)).items(): # iterate dtype groups
+            idx = [positions[col] for col in group] # output positions of this group
+            dtype = score_types[idx[0]] # shared scoring dtype of this group
+            block = np.asfortranarray(filled[list(group)].to_numpy(dtype=dtype)) # column-contiguous block
+            if self.score_against_stats: # stored mean/std, cast like a scalar operand would be
+                moments = [self.stats.filled_moments(col) for col in group] # (mean, std) after median fill
+                mean = np.array([m for m, _ in moments], dtype=block.dtype)
+                std = np.array([sd for _, sd in moments], dtype=block.dtype)
+                z[:, idx] = (block - mean) / std # standardize with persisted moments
+            else:
+                z[:, idx] = zscore(block, axis=0) # standardize each column
+        return z # return Z-score matrix
+
+    def _pack_bits(self, exceeded: np.ndarray) -> np.ndarray: # helper packing boolean columns into bits
+        """
+        Pack a (rows × columns) boolean matrix into one QC bitmask per row.
+        """
+        weights = (1 << np.arange(exceeded.shape[1])).astype(self.QC_DTYPE) # bit value per column
+        return (exceeded.astype(self.QC_DTYPE) * weights).sum(axis=1, dtype=self.QC_DTYPE) # OR of disjoint bits
+
+    def qc_bits(self, columns=None) -> int: # method returning the bitmask of some columns
+        """
+        Bitmask selecting the QC bits of `columns` (default: all outlier columns).
+        """
+        columns = self.outlier_columns if columns is None else columns # default to every column
+        if isinstance(columns, str): # allow a single column name
+            columns = [columns]
+        unknown = [col for col in columns if col not in self.outlier_columns] # validate names
+        if unknown:
+            raise KeyError(f"❌ Not an outlier column: {unknown}. Scored: {self.outlier_columns}")
+        return sum(1 << self.outlier_columns.index(col) for col in columns) # combined bits
+
+    def outlier_mask(self, threshold=None, columns=None, rules=None) -> np.ndarray: # method deriving a row mask
+        """
+        Boolean array marking rows flagged by `columns` at `threshold`.
 
-        self.df['outlier_flag'] = self.df[ # create a flag for outliers
-            [f"{col}_z" for col in self.outlier_columns] # iterate through Z-score columns
-        ].apply(lambda row: any(np.abs(row) > 3), axis=1) # check if any Z-score is greater than 3
+        The default threshold is answered from the QC bitmask; any other
+        threshold is a comparison on the stored |Z| block. Neither copies
+        the data. Requires flag_outliers() to have run.
 
-        flagged = self.df['outlier_flag'].sum() # count flagged rows
-        print(f"⚠️ Flagged {flagged} outlier rows") # print the number of flagged rows
+        rules: temporal rule bits to include (e.g. QC_FLATLINE | QC_STEP);
+        defaults to all rules when no columns are selected, none otherwise.
+        """
+        if self.qc_mask is None: # nothing scored yet
+            raise RuntimeError("❌ Call flag_outliers() before deriving outlier masks.")
+        if rules is None: # "clean" includes the rules, "GHI only" does not
+            rules = self.QC_RULES if columns is None else 0
+        if threshold is None or threshold == self.Z_THRESHOLD: # served by the bitmask
+            return (self.qc_mask & self.QC_DTYPE(self.qc_bits(columns) | rules)) != 0
+        columns = self.outlier_columns if columns is None else columns # default to every column
+        if isinstance(columns, str): # allow a single column name
+            columns = [columns]
+        self.qc_bits(columns) # validate names
+        idx = [self.outlier_columns.index(col) for col in columns] # score positions
+        mask = (self.scores[:, idx] > threshold).any(axis=1) # re-threshold stored scores
+        if rules: # add the requested rule failures
+            mask |= (self.qc_mask & self.QC_DTYPE(rules)) != 0
+        return mask
+
+    def view(self, threshold=None, columns=None, flagged: bool = False, rules=None) -> pd.DataFrame: # method returning a filtered frame
+        """
+        Rows kept (or, with flagged=True, rejected) by a QC selection.
+
+        Example:
+        >>> cleaner.view()                    # clean rows at |Z| > 3
+        >>> cleaner.view(columns="GHI")       # only GHI outliers removed
+        >>> cleaner.view(threshold=4)         # looser threshold
+        >>> cleaner.view(flagged=True)        # the rejected rows
+        >>> cleaner.view(flagged=True, columns=[], rules=cleaner.QC_FLATLINE)  # stuck sensors
+        """
+        mask = self.outlier_mask(threshold, columns, rules) # rows flagged by the selection
+        return self.frame()[mask if flagged else ~mask] # only materialized on request
+
+    def frame(self, imputed: bool = True) -> pd.DataFrame: # method assembling the output frame
+        """
+        Source frame with the cleaned outlier columns swapped in.
+
+        Adds 'outlier_flag' (and '<col>_z' with keep_zscores) once flagged.
+        Untouched columns are shared with the source frame (copy-on-write),
+        so this is cheap until rows are selected.
+
+        imputed: use the imputed values when impute_missing() has run
+        """
+        values = self.imputed if imputed and self.imputed is not None else self._numeric() # cleaned columns
+        extra = {} # helper columns
+        if self.qc_mask is not None: # flagged already
+            extra['outlier_flag'] = self.qc_mask != 0
+        if self.zscores is not None: # Z-scores kept on request
+            extra.update({f"{col}_z": self.zscores[:, i] for i, col in enumerate(self.outlier_columns)})
+        return self.df.assign(**{col: values[col] for col in self.outlier_columns}, **extra) # shallow assembly
+
+    # --------------------------------------------------------------------------
+    # ⏱️ Temporal QC rules
+    # --------------------------------------------------------------------------
+
+    def _time_order(self): # helper returning chronological order and minute stamps
+        """
+        Row order that sorts the frame by time, and the sorted timestamps
+        as integer minutes since the epoch.
+        """
+        if 'Timestamp' not in self.df.columns: # time-aware steps need a time axis
+            raise ValueError("❌ Time-aware cleaning requires a 'Timestamp' column.")
+        times = pd.to_datetime(self.df['Timestamp']).to_numpy() # ensure datetime values
+        order = np.argsort(times, kind="stable") # chronological order (identity when sorted)
+        minutes = times[order].astype("datetime64[m]").astype(np.int64) # minutes since epoch
+        return order, minutes
+
+    def temporal_flags(self) -> np.ndarray: # method running the time-series rules
+        """
+        Evaluate the flatline, step and cross-channel rules.
+
+        Every rule is a whole-array operation on the chronologically sorted
+        series (diffs and run-length windows), so a station-year is checked
+        in one pass per channel without a Python loop over rows or windows.
+
+        Returns:
+        - np.ndarray: uint16 rule bits per row (in the frame's row order)
+        """
+        order, minutes = self._time_order() # chronological order
+        n = len(order) # number of rows
+        bits = np.zeros(n, dtype=self.QC_DTYPE) # rule bits in sorted order
+        contiguous = np.diff(minutes) == 1 # consecutive rows one minute apart
+
+        def values(col): # chronological float64 values of a column
+            return pd.to_numeric(self.df[col], errors='coerce').to_numpy(dtype=np.float64)[order]
+
+        k = self.flatline_minutes # stuck-sensor window
+        for col in self.FLATLINE_COLUMNS: # stuck sensors
+            if col not in self.df.columns or n < k:
+                continue
+            v = values(col)
+            same = contiguous & (np.diff(v) == 0) & (v[1:] > self.FLATLINE_FLOOR) # unchanged, lit step
+            run = np.concatenate(([0], np.cumsum(same))) # runs of unchanged steps
+            ends = np.zeros(n, dtype=bool) # last row of a window with zero spread
+            ends[k - 1:] = (run[k - 1:] - run[:n - k + 1]) == k - 1
+            covered = np.concatenate(([0], np.cumsum(ends))) # spread each window end over its k rows
+            upper = np.minimum(np.arange(n) + k, n)
+            bits[(covered[upper] - covered[np.arange(n)]) > 0] |= self.QC_FLATLINE
+
+        for col, limit in self.STEP_LIMITS.items(): # impossible jumps
+            if col not in self.df.columns or n < 2:
+                continue
+            jump = contiguous & (np.abs(np.diff(values(col))) > limit) # NaN never exceeds
+            bits[1:][jump] |= self.QC_STEP # flag the row after the jump
+
+        for lower, upper, tolerance in self.CROSS_BOUNDS: # cross-channel bounds
+            if lower not in self.df.columns or upper not in self.df.columns:
+                continue
+            bits[values(lower) > values(upper) + tolerance] |= self.QC_CROSS
+
+        result = np.empty_like(bits) # back to the frame's row order
+        result[order] = bits
+        for name, bit in (("flatline", self.QC_FLATLINE), ("step", self.QC_STEP), ("cross-channel", self.QC_CROSS)):
+            self._log(f"⏱️ {name}: {int(((result & bit) != 0).sum())} rows") # per-rule counts
+        return result
+
+    def _bucket_keys(self) -> np.ndarray: # helper assigning rows to scoring buckets
+        """
+        Bucket id per row: one bucket overall (global) or month × hour (seasonal).
+        """
+        if self.mode == "global": # single bucket
+            return np.zeros(len(self.df), dtype=np.int16)
+        if 'Timestamp' not in self.df.columns: # seasonal scoring needs timestamps
+            raise ValueError("❌ Seasonal outlier mode requires a 'Timestamp' column.")
+        times = pd.to_datetime(self.df['Timestamp']) # ensure datetime values
+        return ((times.dt.month.to_numpy() - 1) * 24 + times.dt.hour.to_numpy()).astype(np.int16) # 288 buckets
+
+    def _bucket_scores(self, values: pd.DataFrame) -> np.ndarray: # helper computing bucketed scores
+        """
+        Score every cell against its bucket's centre and spread.
+
+        Bucket statistics come from cythonized group-wise reductions over the
+        whole block (no per-group Python loop) and are broadcast back to rows
+        by bucket index. Missing cells score NaN and are never flagged.
+        Buckets with zero spread score 0 for values equal to the centre.
+        """
+        keys = self._bucket_keys() # bucket id per row
+        block = values.astype("float64") # score in double precision
+        grouped = block.groupby(keys) # group rows by bucket
+        if self.method == "zscore": # mean / population std per bucket
+            center = grouped.mean() # bucket means
+            scale = grouped.std(ddof=0) # bucket standard deviations
+        else: # robust median / MAD per bucket
+            center = grouped.median() # bucket medians
+            codes = np.searchsorted(center.index.to_numpy(), keys) # row → bucket position
+            deviation = (block - center.to_numpy()[codes]).abs() # absolute deviations
+            grouped_dev = deviation.groupby(keys) # group deviations by bucket
+            mad = grouped_dev.median() * self.MAD_SCALE # scaled MAD
+            mean_ad = grouped_dev.mean() * self.MEAN_AD_SCALE # fallback when MAD is 0
+            scale = mad.where(mad > 0, mean_ad) # robust spread per bucket
+
+        codes = np.searchsorted(center.index.to_numpy(), keys) # row → bucket position
+        offset = block.to_numpy() - center.to_numpy()[codes] # distance from bucket centre
+        spread = scale.to_numpy()[codes] # bucket spread per row
+        with np.errstate(divide="ignore", invalid="ignore"): # zero spread handled below
+            z = offset / spread # bucketed score
+        z[(spread == 0) & (offset == 0)] = 0.0 # constant buckets are not outliers
+        return z # return score matrix
 
     def impute_missing(self): # method to impute missing values
         """
-        Fill missing values in all key columns using the column median.
+        Fill missing values in all key columns.
+
+        - impute="median": every gap gets the column median
+        - impute="interpolate": gaps of at most `max_gap` minutes are
+          linearly interpolated in time; longer gaps (and gaps at the ends
+          of the series) get the mean of the same minute of day, falling
+          back to the median where that minute was never observed
+
+        Filled columns are stored in `self.imputed`; the source frame keeps
+        its original values.
+        """
+        stats = self.column_stats() # shared statistics (same medians as flag_outliers)
+        if self.impute == "interpolate": # time-aware filling
+            self.imputed = self._interpolate_missing(stats)
+            self._log(f"🩹 Missing values imputed (interpolation ≤ {self.max_gap} min, climatology beyond)")
+            return
+        self.imputed = self._numeric().fillna({col: stats.median(col) for col in self.outlier_columns}) # impute missing values with median
+        self._log("🩹 Missing values imputed (median)")
+
+    def _interpolate_missing(self, stats: ColumnStats) -> pd.DataFrame: # helper for impute="interpolate"
+        """
+        Gap-aware filling without a loop over gaps; returns the filled columns.
+
+        For every missing cell the previous and next observed samples are
+        found with running max/min accumulations over sample positions, so
+        gap lengths, interpolation and climatology lookups are all array
+        operations over the whole (multi-year) series.
         """
+        order, minutes = self._time_order() # chronological order
+        minute_of_day = minutes % 1440 # climatology key
+        positions = np.arange(len(minutes)) # sample positions
+        source = self._numeric() # numeric outlier columns
+        result_columns = {} # filled columns
+
         for col in self.outlier_columns: # iterate through each column
-            self.df[col] = self.df[col].fillna(self.df[col].median()) # impute missing values with median
-        print("🩹 Missing values imputed (median)")
+            values = source[col].to_numpy(dtype=np.float64)[order] # chronological values
+            missing = np.isnan(values) # cells to fill
+            if not missing.any() or missing.all(): # nothing to fill / nothing to fill from
+                result_columns[col] = source[col].fillna(stats.median(col)) if missing.all() else source[col] # no observation at all
+                continue
+
+            observed = ~missing # known samples
+            prev = np.maximum.accumulate(np.where(observed, positions, -1)) # last observed position
+            nxt = np.minimum.accumulate(np.where(observed, positions, len(values))[::-1])[::-1] # next observed position
+            inner = missing & (prev >= 0) & (nxt < len(values)) # gaps bounded on both sides
+            span = np.full(len(values), np.inf) # missing minutes per gap
+            span[inner] = minutes[nxt[inner]] - minutes[prev[inner]] - 1
+            short = missing & (span <= self.max_gap) # interpolate these
+
+            filled = values.copy() # chronological output
+            filled[short] = np.interp(minutes[short], minutes[observed], values[observed]) # linear in time
+
+            long = missing & ~short # climatology for the rest
+            if long.any():
+                sums = np.bincount(minute_of_day[observed], weights=values[observed], minlength=1440)
+                counts = np.bincount(minute_of_day[observed], minlength=1440)
+                with np.errstate(divide="ignore", invalid="ignore"): # unobserved minutes → NaN
+                    climatology = sums / counts # mean per minute of day
+                climatology[counts == 0] = stats.median(col) # fall back to the median
+                filled[long] = climatology[minute_of_day[long]]
+
+            result = np.empty_like(filled) # back to the frame's row order
+            result[order] = filled
+            result_columns[col] = pd.Series(result.astype(source[col].dtype, copy=False), index=source.index) # keep column dtype
+        return pd.DataFrame(result_columns) # filled outlier columns
+
+    def column_stats(self) -> ColumnStats: # method returning the shared statistics
+        """
+        Return the ColumnStats used for cleaning, computing them if needed.
+
+        Statistics are computed once (after convert_to_numeric) and reused
+        by flag_outliers and impute_missing; persist them with .save().
+        """
+        if self.stats is None or not self.stats.has(self.outlier_columns): # missing or non-numeric
+            self.stats = ColumnStats.from_frame(self._numeric(), columns=self.outlier_columns) # one scan per column
+        return self.stats # return statistics
 
     def drop_outliers(self) -> pd.DataFrame: # method to drop outliers
         """
         Return a cleaned dataframe with outliers removed and helper columns dropped.
+
+        The flagged data stays on the cleaner (`df`, `qc_mask`, `scores`),
+        so other selections can still be taken with view().
         """
-        z_cols = [f"{col}_z" for col in self.outlier_columns] # get Z-score columns
-        df_clean = self.df[~self.df['outlier_flag']].copy() # create a copy of the dataframe without outliers
-        df_clean.drop(columns=z_cols + ['outlier_flag'], inplace=True) # drop Z-score and flag columns
-        print(f"✅ Final cleaned shape: {df_clean.shape}") # print the final shape of the cleaned dataframe
+        z_cols = [f"{col}_z" for col in self.outlier_columns] if self.zscores is not None else [] # get Z-score columns, if kept
+        df_clean = self.view().drop(columns=z_cols + ['outlier_flag']) # clean rows without helper columns
+        self._log(f"✅ Final cleaned shape: {df_clean.shape}") # print the final shape of the cleaned dataframe
         return df_clean # return the cleaned dataframe
 
     def run(self) -> pd.DataFrame: # method to run the full cleaning pipeline
@@ -83,3 +486,133 @@ class SolarDataCleaner: # class to clean solar data
         self.flag_outliers() # flag outliers
         self.impute_missing() # impute missing values
         return self.drop_outliers() # return the cleaned dataframe
+
+    @classmethod
+    def run_many(cls, sources, output_dir: str = "data", workers: int = None, **options) -> dict: # batch cleaning
+        """
+        Clean several stations concurrently, one process per station.
+
+        Each worker loads its own input (when given a path or registry key),
+        cleans it and writes `<output_dir>/<key>_clean.csv` plus the stats
+        sidecar itself; only a small summary travels back to the parent, so
+        full frames are never pickled on the way out. Pass paths or station
+        keys rather than DataFrames to avoid pickling inputs as well.
+
+        Parameters:
+        - sources: dict key → DataFrame / CSV path, or a list of registry keys / CSV paths
+        - output_dir (str): Directory receiving the cleaned CSVs
+        - workers (int): Pool size; defaults to min(#sources, CPU count).
+          With one worker everything runs in-process.
+        - **options: Passed to each SolarDataCleaner (e.g. mode="seasonal")
+
+        Returns:
+        - dict: key → {"path", "rows_in", "rows_out"}
+        """
+        results = map_sources(_clean_source, sources, workers, (output_dir, options)) # one job per station
+        for key, summary in results.items(): # one line per station
+            print(f"✅ {key}: {summary['rows_in']} → {summary['rows_out']} rows → {summary['path']}")
+        return results
+
+
+def _clean_source(key: str, source, output_dir: str, options: dict) -> dict: # process-pool worker
+    """
+    Load, clean and write one station; return only a summary.
+    """
+    df = load_source(key, source) # frame, registry key or CSV path
+    output_path = os.path.join(output_dir, f"{key}_clean.csv") # cleaned CSV of this station
+
+    stats = ColumnStats.from_frame(df) # all columns, as the pipeline runners save them
+    cleaner = SolarDataCleaner(df, stats=stats, verbose=False, **options) # quiet worker
+    cleaned = cleaner.run() # flag, impute, drop
+
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True) # ensure output directory
+    tmp_path = f"{output_path}.tmp" # write atomically
+    cleaned.to_csv(tmp_path, index=False) # worker writes its own output
+    os.replace(tmp_path, output_path) # publish output
+    stats.save(stats_path_for(output_path)) # sidecar for later runs
+    return {"path": output_path, "rows_in": len(df), "rows_out": len(cleaned)} # small result
+
+
+# ------------------------------------------------------------------------------
+# 🧱 ChunkedSolarDataCleaner Class
+# ------------------------------------------------------------------------------
+class ChunkedSolarDataCleaner: # class to clean files larger than memory
+    """
+    Out-of-core variant of SolarDataCleaner with memory bounded by chunk size.
+
+    - Pass 1 streams the file and merges per-chunk ColumnStats: exact
+      count/mean/M2 (Chan/Welford update) plus approximate medians from a
+      mergeable QuantileSketch
+    - Pass 2 streams again and cleans each chunk with SolarDataCleaner,
+      scoring against the pass-1 statistics, then appends it to the output
+
+    Tolerance versus the in-memory SolarDataCleaner on the same data:
+    - Means and standard deviations agree to floating-point rounding
+      (relative error ~1e-12)
+    - Medians are approximate with a rank error of about 0.1% (sketch size
+      4096); they only affect imputed values and the scores of imputed cells
+    - Outlier flags can differ only for values whose |Z| lies within that
+      rounding of the threshold 3, or for cells imputed with the median
+
+    Usage:
+        loader = BaseCSVLoader("archive.csv", parse_dates=["Timestamp"], dtype=STATION_DTYPES)
+        ChunkedSolarDataCleaner(loader, "data/archive_clean.csv").run()
+    """
+
+    def __init__(self, loader, output_path: str, outlier_columns=None, chunksize: int = 250_000,
+                 sketch_size: int = DEFAULT_SKETCH_SIZE): # constructor to initialize the class
+        """
+        loader: BaseCSVLoader for the source file (streamed via iter_chunks)
+        output_path: cleaned CSV to write (stats saved alongside)
+        """
+        self.loader = loader # source of chunks
+        self.output_path = output_path # cleaned CSV destination
+        self.outlier_columns = outlier_columns or SolarDataCleaner.DEFAULT_COLUMNS # columns to clean
+        self.chunksize = chunksize # rows per chunk
+        self.sketch_size = sketch_size # quantile sketch capacity
+        self.stats = None # merged statistics (set by compute_stats)
+
+    def _numeric(self, chunk: pd.DataFrame) -> pd.DataFrame: # coerce target columns like convert_to_numeric
+        for col in self.outlier_columns: # iterate through each column
+            chunk[col] = pd.to_numeric(chunk[col], errors='coerce') # convert to numeric
+        return chunk # return converted chunk
+
+    def compute_stats(self) -> ColumnStats: # pass 1: mergeable statistics
+        """
+        Stream the file once and merge per-chunk statistics.
+        """
+        stats = ColumnStats() # empty accumulator
+        for chunk in self.loader.iter_chunks(self.chunksize): # stream chunks
+            chunk_stats = ColumnStats.from_frame(self._numeric(chunk), sketch_size=self.sketch_size,
+                                                 exact_quantiles=False) # chunk summary (sketch only, no selection pass)
+            stats = stats.merge(chunk_stats) if stats.columns else chunk_stats # merge into accumulator
+        self.stats = stats # keep merged statistics
+        print(f"📐 Pass 1: statistics over {stats.rows()} rows") # progress message
+        return stats # return merged statistics
+
+    def run(self) -> ColumnStats: # pass 2: clean and write
+        """
+        Run both passes and write the cleaned output chunk by chunk.
+
+        Returns:
+        - ColumnStats: the pass-1 statistics (also saved next to the output)
+        """
+        stats = self.compute_stats() # pass 1
+        os.makedirs(os.path.dirname(self.output_path) or ".", exist_ok=True) # ensure output directory
+        tmp_path = f"{self.output_path}.tmp" # write atomically
+
+        rows_in, rows_out = 0, 0 # progress counters
+        with open(tmp_path, "w", encoding="utf-8", newline="") as fh: # single output handle
+            for i, chunk in enumerate(self.loader.iter_chunks(self.chunksize)): # pass 2
+                cleaner = SolarDataCleaner(chunk, outlier_columns=self.outlier_columns, stats=stats,
+                                           score_against_stats=True, verbose=False) # chunk cleaner
+                cleaned = cleaner.run() # flag, impute, drop
+                cleaned.to_csv(fh, header=(i == 0), index=False) # append chunk
+                rows_in += len(chunk) # count input rows
+                rows_out += len(cleaned) # count output rows
+        os.replace(tmp_path, self.output_path) # publish output
+
+        stats.save(stats_path_for(self.output_path)) # persist statistics next to output
+        print(f"⚠️ Pass 2: dropped {rows_in - rows_out} outlier rows") # flagged rows
+        print(f"✅ Cleaned {rows_in} → {rows_out} rows into {self.output_path}") # final summary
+        return stats # return statistics
@@ -3,8 +3,20 @@ compare_pipeline.py – B5W0: Solar Data Discovery
 ------------------------------------------------
 
 An object-oriented pipeline to compare irradiance metrics (GHI, DNI, DHI)
-across Benin, Togo, and Sierra Leone. Built to support fully modular,
-reusable analysis for MoonLight Energy Solutions.
+across Benin, Togo, and Sierra Leone (or any list of registered sites).
+Built to support fully modular, reusable analysis for MoonLight Energy
+Solutions.
+
+Sites are loaded concurrently into one combined frame with a categorical
+`country` column of station keys (station names are display labels only);
+each site is a contiguous row range (`offsets`), so per-site views are
+slices rather than separate copies. The combined columns are allocated once
+and every site is read straight into its own range. Summary
+statistics, missing counts, means and boxplot statistics all come from one
+cached aggregation stage (`aggregates()`), computed in a single scan per
+site and metric. Kruskal–Wallis ranks the pooled readings once
+(src/ranks.py, optionally binned at the sensors' 0.1 W/m² resolution) and
+keeps the per-country rank sums for reuse.
 
 Usage:
     from compare_pipeline import SolarComparisonPipeline
@@ -12,6 +24,12 @@ Usage:
     pipeline = SolarComparisonPipeline(data_path="data")
     pipeline.run_all()
 
+    pipeline = SolarComparisonPipeline(sites=["benin", "togo"], workers=2)
+
+With a RollupCube (see src/rollup.py), average-based views such as
+plot_avg_ghi_bar are answered from the monthly rollups instead of the
+minute data.
+
 Author: Nabil Mohamed
 """
 
@@ -19,24 +37,66 @@ Author: Nabil Mohamed
 # 📦 Imports
 # ------------------------------------------------------------------------------
 import os # import os for file path handling
+import numpy as np # import numpy for array handling
+from concurrent.futures import ThreadPoolExecutor # thread pool for concurrent site loading
 import pandas as pd # import pandas for data manipulation
 import seaborn as sns # import seaborn for data visualization
 import matplotlib.pyplot as plt # import matplotlib for plotting
-from scipy.stats import shapiro, kruskal # import statistical tests from scipy
+from scipy.stats import shapiro # import normality test from scipy
+from src.stations import get_station # station labels for rollup keys
+from src.stats import ColumnStats # fused per-column statistics
+from src.ranks import PooledRanks # pooled rank sums for rank tests
+
+# ------------------------------------------------------------------------------
+# 📏 Row counting
+# ------------------------------------------------------------------------------
+def _count_rows(path, block_size=1 << 20): # Data rows of a CSV without parsing it
+    """
+    Count the data lines of a CSV (header excluded) by scanning for newlines.
+
+    This is an upper bound on the parsed rows: blank lines and quoted line
+    breaks are counted too.
+    """
+    lines, last = 0, b"\n" # newline count and last byte seen
+    with open(path, "rb") as fh: # binary scan
+        for block in iter(lambda: fh.read(block_size), b""): # fixed-size blocks
+            lines += block.count(b"\n") # line ends in this block
+            last = block[-1:] # remember the final byte
+    if last != b"\n": # last line without a trailing newline
+        lines += 1 # count it too
+    return max(lines - 1, 0) # drop the header line
 
 # ------------------------------------------------------------------------------
 # 🧱 SolarComparisonPipeline Class
 # ------------------------------------------------------------------------------
 class SolarComparisonPipeline: # define a class for the solar comparison pipeline
-    def __init__(self, data_path="data"): # constructor to initialize the pipeline
+    METRICS = ["GHI", "DNI", "DHI"] # irradiance columns used by every comparison step
+    DEFAULT_SITES = ["benin", "togo", "sierra_leone"] # registry keys compared by default
+    CHUNK_ROWS = 1 << 18 # CSV rows parsed per chunk while filling a site's slice
+
+    def __init__(self, data_path="data", store=None, rollup=None, sites=None, workers=None): # constructor to initialize the pipeline
         """
         Initialize the pipeline with path and internal data containers.
+
+        sites: registry keys or Station objects (default: the three challenge
+        countries); each is read from `<data_path>/<key>_clean.csv`.
+        workers: concurrent site loads (default: one per site, capped at CPU count)
+
+        If a MinuteGridStore is given, irradiance columns are read from its
+        memory-mapped channels instead of the cleaned CSVs. If a RollupCube
+        is given, mean-based aggregates are read from its coarsest grain.
         """
         self.data_path = data_path # set the data path
-        self.benin = None # initialize Benin data
-        self.togo = None # initialize Togo data
-        self.sl = None # initialize Sierra Leone data
+        self.store = store # optional memory-mapped minute-grid store
+        self.rollup = rollup # optional materialized rollup cube
+        self.sites = [get_station(site) for site in (sites or self.DEFAULT_SITES)] # resolve site definitions
+        self.workers = workers # concurrent loads
         self.df_all = None # initialize combined data
+        self.offsets = {} # station key → (start, stop) rows in df_all
+        self.labels = {} # station key → display label (country name)
+        self._aggregates = None # cached per-country statistics (see aggregates())
+        self._fliers = {} # (station key, metric) → readings outside the whiskers
+        self._ranks = {} # cached pooled ranks per (metric, resolution)
         print(f"✅ Initialized pipeline with data path: {data_path}") # print initialization message
 
     # --------------------------------------------------------------------------
@@ -44,23 +104,178 @@ class SolarComparisonPipeline: # define a class for the solar comparison pipelin
     # --------------------------------------------------------------------------
     def load_data(self): # Load and label datasets
         """
-        Load cleaned CSVs and label country columns.
+        Load every site's irradiance columns concurrently into one frame.
+
+        Site lengths are known up front (line counts of the cleaned CSVs, or
+        the store's minute grid), so each combined metric array is allocated
+        once and every worker fills its own (start, stop) slice. A line count
+        is an upper bound (blank lines are skipped by the parser), so sites
+        that parsed fewer rows are packed together and the columns trimmed.
         """
+        workers = self.workers or min(len(self.sites), os.cpu_count() or 1) # pool size
         try: # Attempt to load the datasets
-            self.benin = pd.read_csv(os.path.join(self.data_path, "benin_clean.csv")) # read Benin data
-            self.togo = pd.read_csv(os.path.join(self.data_path, "togo_clean.csv")) # read Togo data
-            self.sl = pd.read_csv(os.path.join(self.data_path, "sierra_leone_clean.csv")) # read Sierra Leone data
+            lengths = [self._site_length(station) for station in self.sites] # rows per site
+            bounds = np.concatenate(([0], np.cumsum(lengths))).astype(np.int64) # site offsets
+            data = {m: np.empty(int(bounds[-1]), dtype=self._metric_dtype(m)) for m in self.METRICS} # combined columns
+            with ThreadPoolExecutor(max_workers=workers) as pool: # parsers and memmap reads release the GIL
+                parsed = list(pool.map(self._read_site, self.sites, [data] * len(self.sites), bounds[:-1], bounds[1:])) # fill own slices
+        except FileNotFoundError as e: # Handle file not found error
+            raise RuntimeError("Missing cleaned CSVs. Ensure Task 2 was completed.") from e # raise error if files are not found
 
-            self.benin["country"] = "Benin" # label Benin data
-            self.togo["country"] = "Togo" # label Togo data
-            self.sl["country"] = "Sierra Leone" # label Sierra Leone data
+        if parsed != lengths: # some sites had blank lines → close the gaps
+            packed = np.concatenate(([0], np.cumsum(parsed))).astype(np.int64) # offsets of the parsed rows
+            for m in self.METRICS: # iterate over metrics
+                for i, rows in enumerate(parsed): # sites only move towards the front
+                    data[m][packed[i]:packed[i] + rows] = data[m][bounds[i]:bounds[i] + rows] # shift in place
+                data[m] = data[m][:packed[-1]] # drop the unused tail (a view)
+            bounds = packed # actual site offsets
 
-            self.df_all = pd.concat([self.benin, self.togo, self.sl], ignore_index=True) # combine datasets
+        self._label_and_combine(data, bounds) # label and combine datasets
 
-            print(f"📊 Loaded data: {self.df_all.shape} rows") # print data shape
+    def _site_path(self, station) -> str: # Cleaned CSV of one site
+        return os.path.join(self.data_path, f"{station.key}_clean.csv") # <data_path>/<key>_clean.csv
 
-        except FileNotFoundError as e: # Handle file not found error
-            raise RuntimeError("Missing cleaned CSVs. Ensure Task 2 was completed.") from e # raise error if files are not found
+    def _site_length(self, station) -> int: # Rows one site contributes
+        """
+        Return the number of rows of one site without parsing it.
+        """
+        if self.store is not None: # minute grid from the first to the last stored year
+            years = self.store.years(station.key) # stored years
+            if not years: # nothing stored for this site
+                raise KeyError(f"❌ No data stored for station: {station.key}")
+            return sum(self.store.minutes_in_year(y) for y in range(years[0], years[-1] + 1)) # grid length
+        return _count_rows(self._site_path(station)) # data lines of the cleaned CSV
+
+    def _metric_dtype(self, metric) -> np.dtype: # Dtype of one combined column
+        """
+        float32 for the cleaned CSVs; the common stored dtype for the store.
+        """
+        if self.store is None: # CSV path parses float32
+            return np.dtype("float32")
+        stored = [self.store.meta(station.key, year)["channels"][metric] # dtypes recorded per year
+                  for station in self.sites for year in self.store.years(station.key)
+                  if metric in self.store.meta(station.key, year).get("channels", {})]
+        return np.result_type(*stored) if stored else np.dtype("float32") # common dtype
+
+    def _read_site(self, station, data, start, stop) -> int: # Read one site into its rows
+        """
+        Write one site's metrics into data[metric][start:stop] and return the rows written.
+
+        Store channels are copied year by year from the memmaps (no
+        intermediate concatenation); CSVs are parsed in chunks, so no
+        per-site frame is kept alive.
+        """
+        if self.store is not None: # read irradiance channels from the memory-mapped store
+            years = self.store.years(station.key) # stored years
+            position = start # next row to fill
+            for year in range(years[0], years[-1] + 1): # one memmap view (or fill block) per year
+                lo, hi = self.store.year_start(year), self.store.year_start(year + 1) # year bounds
+                for m in self.METRICS: # iterate over metrics
+                    block = self.store.read(station.key, m, lo, hi) # zero-copy view of one year
+                    data[m][position:position + len(block)] = block # copy into the site's slice
+                position += self.store.minutes_in_year(year) # advance by one year of minutes
+            return position - start # full minute grid
+
+        position = start # next row to fill
+        chunks = pd.read_csv(self._site_path(station), usecols=self.METRICS, # stream the site in chunks
+                             dtype={m: "float32" for m in self.METRICS}, chunksize=self.CHUNK_ROWS)
+        for chunk in chunks: # iterate over chunks
+            end = position + len(chunk) # rows covered by this chunk
+            if end > stop: # more rows than lines counted (e.g. bare \r line ends)
+                raise ValueError(f"❌ {station.key}: more rows than the {stop - start} counted")
+            for m in self.METRICS: # iterate over metrics
+                data[m][position:end] = chunk[m].to_numpy() # copy into the site's slice
+            position = end # advance
+        return position - start # rows parsed (blank lines are not rows)
+
+    def _label_and_combine(self, data, bounds): # Build the single combined frame
+        """
+        Wrap the filled columns in one frame with a categorical country column.
+
+        Categories are station keys (unique even when two sites share a
+        display name), ordered by label as grouping by country name did;
+        each site's rows are recorded as a (start, stop) range in `offsets`.
+        """
+        keys = [station.key for station in self.sites] # station keys in load order
+        self.labels = {station.key: station.name for station in self.sites} # display labels
+        categories = self._ordered(keys) # by label, then key
+        lengths = np.diff(bounds) # rows per site
+        codes = np.repeat(np.array([categories.index(k) for k in keys], dtype=np.int16), lengths) # per-row codes
+
+        data["country"] = pd.Categorical.from_codes(codes, categories=categories) # compact labels
+        self.df_all = pd.DataFrame(data, copy=False) # combined frame (no copy of the metric arrays)
+        self.offsets = {key: (int(bounds[i]), int(bounds[i + 1])) for i, key in enumerate(keys)} # site ranges
+        self._aggregates = None # new data → recompute statistics on demand
+        self._fliers = {} # new data → recollect fliers with the aggregates
+        self._ranks = {} # new data → re-rank on demand
+
+        print(f"📊 Loaded data: {self.df_all.shape} rows") # print data shape
+
+    def _ordered(self, keys) -> list: # Display order of sites
+        return sorted(keys, key=lambda key: (self.labels[key], key)) # alphabetical by country name
+
+    def site(self, key) -> pd.DataFrame: # Rows of one site
+        """
+        Return one site's rows (by station key) of the combined frame (a slice, not a copy).
+        """
+        start, stop = self.offsets[key] # contiguous row range
+        return self.df_all.iloc[start:stop] # positional slice
+
+    # --------------------------------------------------------------------------
+    # 🧮 Fused per-country aggregates
+    # --------------------------------------------------------------------------
+    def aggregates(self) -> pd.DataFrame: # Every per-country statistic, computed once
+        """
+        Return mean, median, std, count, missing count, quartiles and
+        boxplot whiskers per country and metric.
+
+        Each site's column is scanned once (ColumnStats: one selection pass
+        for the quartiles and median, plus the moments) and once more for
+        the 1.5·IQR whiskers, which also collects the fliers beyond them. The result is cached until data is reloaded and
+        reused by summarize, report_missing, mean_by_country and plot_boxplots.
+
+        Returns:
+        - pd.DataFrame: index country, columns (metric, statistic)
+        """
+        if self._aggregates is not None: # reuse the cached table
+            return self._aggregates
+
+        keys = self._ordered(self.offsets) # alphabetical by country name
+        rows = {} # station key → {(metric, statistic): value}
+        fliers = {} # (station key, metric) → outlier readings
+        for key in keys: # iterate over sites
+            block = self.site(key) # site rows (slice of df_all)
+            stats = ColumnStats.from_frame(block, columns=self.METRICS) # fused moments + quartiles
+            row = {} # statistics of this country
+            for metric in self.METRICS: # iterate over metrics
+                entry = stats.columns[metric] # counts, moments, quantiles
+                q1, q3 = stats.quantile(metric, 0.25), stats.quantile(metric, 0.75) # quartiles (NaN if empty)
+                reach = 1.5 * (q3 - q1) # Tukey fences
+                values = block[metric].to_numpy() # raw values (NaN never falls inside the fences)
+                within = (values >= q1 - reach) & (values <= q3 + reach) # one whisker pass
+                inside = values[within] # values within the whiskers
+                fliers[(key, metric)] = values[~within & ~np.isnan(values)] # outliers drawn as points
+                row.update({ # store statistics of this metric
+                    (metric, "mean"): np.nan if entry["mean"] is None else entry["mean"], # average
+                    (metric, "median"): stats.median(metric), # median
+                    (metric, "std"): stats.std(metric), # sample standard deviation
+                    (metric, "count"): entry["count"], # non-null readings
+                    (metric, "missing"): entry["null_count"], # null readings
+                    (metric, "q1"): q1, # first quartile
+                    (metric, "q3"): q3, # third quartile
+                    (metric, "whislo"): float(inside.min()) if inside.size else np.nan, # lower whisker end
+                    (metric, "whishi"): float(inside.max()) if inside.size else np.nan, # upper whisker end
+                })
+            rows[key] = row # store site row
+
+        table = pd.DataFrame.from_dict(rows, orient="index") # one row per site
+        table.columns = pd.MultiIndex.from_tuples(table.columns) # (metric, statistic)
+        table.index = pd.Index([self.labels[key] for key in keys], name="country") # display labels
+        counts = [col for col in table.columns if col[1] in ("count", "missing")] # integer statistics
+        table[counts] = table[counts].astype(np.int64) # counts as integers
+        self._aggregates = table # cache for downstream steps
+        self._fliers = fliers # kept for plot_boxplots
+        return table # return aggregates
 
     # --------------------------------------------------------------------------
     # 🧪 Shapiro–Wilk test
@@ -71,26 +286,43 @@ class SolarComparisonPipeline: # define a class for the solar comparison pipelin
         """
         print("📈 Shapiro–Wilk Normality Test (GHI):")
         results = {} # initialize results dictionary
-        for df, name in zip([self.benin, self.togo, self.sl], ["Benin", "Togo", "Sierra Leone"]): # iterate over datasets
-            sample = df["GHI"].dropna().sample(n=min(sample_size, len(df)), random_state=42) # sample GHI data
+        for key in self.offsets: # iterate over sites
+            ghi = self.site(key)["GHI"].dropna() # site readings
+            sample = ghi.sample(n=min(sample_size, len(ghi)), random_state=42) # sample GHI data
             stat, p = shapiro(sample) # perform Shapiro–Wilk test
             result = "✅ Likely Normal" if p > 0.05 else "⚠️ Non-Normal" # determine result
-            print(f"{name:<15} → p = {p:.5f} → {result}") # print result
-            results[name] = p # store p-value in results
+            print(f"{self.labels[key]:<15} → p = {p:.5f} → {result}") # print result
+            results[self.labels[key]] = p # store p-value per country label
         return results # return results
 
     # --------------------------------------------------------------------------
     # 🧪 Kruskal–Wallis test
     # --------------------------------------------------------------------------
-    def run_kruskal(self): # Run Kruskal–Wallis test
+    def ranks(self, metric="GHI", resolution=None) -> PooledRanks: # Pooled ranks of one metric
         """
-        Run Kruskal–Wallis H-test on GHI across countries.
+        Rank one metric's pooled readings across countries (cached).
+
+        resolution: quantization step for binned ranking (e.g. 0.1 W/m²,
+        exact for data recorded at that resolution); None ranks exact values.
+        """
+        key = (metric, resolution) # cache key
+        if key not in self._ranks: # rank once per metric and mode
+            self._ranks[key] = PooledRanks.from_groups( # NaNs are skipped by the engine
+                [self.site(site)[metric].to_numpy() for site in self.offsets], # site slices
+                labels=[self.labels[site] for site in self.offsets], resolution=resolution) # display labels
+        return self._ranks[key] # return pooled ranks
+
+    def run_kruskal(self, metric="GHI", resolution=None): # Run Kruskal–Wallis test
         """
-        ghi_sets = [self.benin["GHI"].dropna(), self.togo["GHI"].dropna(), self.sl["GHI"].dropna()] # prepare GHI data for Kruskal–Wallis test
-        h, p = kruskal(*ghi_sets) # perform Kruskal–Wallis test
-        print(f"\n📌 Kruskal–Wallis Test (GHI):\n   H = {h:.3f}  |  p = {p:.5f}")
+        Run Kruskal–Wallis H-test on a metric (default GHI) across countries.
+
+        The pooled ranks are computed once and kept (see ranks()), so their
+        per-country rank sums can be reused by further rank-based tests.
+        """
+        h, p = self.ranks(metric, resolution).kruskal() # tie-corrected H from the rank sums
+        print(f"\n📌 Kruskal–Wallis Test ({metric}):\n   H = {h:.3f}  |  p = {p:.5f}")
         if p < 0.05: # check if p-value is significant
-            print("✅ Significant difference in GHI across countries.")
+            print(f"✅ Significant difference in {metric} across countries.")
         else: # if not significant
             print("⚠️ No statistically significant difference detected.")
         return h, p # return H-statistic and p-value
@@ -101,10 +333,25 @@ class SolarComparisonPipeline: # define a class for the solar comparison pipelin
     def plot_boxplots(self, metrics=["GHI", "DNI", "DHI"]): # Create boxplots for GHI, DNI, DHI
         """
         Create annotated boxplots per metric grouped by country.
+
+        Boxes are drawn from the cached aggregates (quartiles, median,
+        1.5·IQR whiskers and the fliers beyond them) instead of handing the
+        raw frame to seaborn for every metric.
         """
+        table = self.aggregates() # cached box statistics
+        keys = self._ordered(self.offsets) # station keys in table order
+        colors = sns.color_palette("Set2", len(table)) # one color per country
         for metric in metrics: # iterate over metrics
+            boxes = [ # matplotlib box statistics per country
+                {"label": name, "med": row[(metric, "median")], "q1": row[(metric, "q1")], "q3": row[(metric, "q3")],
+                 "whislo": row[(metric, "whislo")], "whishi": row[(metric, "whishi")],
+                 "fliers": self._fliers[(key, metric)]}
+                for key, (name, row) in zip(keys, table.iterrows())
+            ]
             plt.figure(figsize=(9, 6)) # set figure size
-            sns.boxplot(data=self.df_all, x="country", y=metric, hue="country", palette="Set2", legend=False) # create boxplot
+            artists = plt.gca().bxp(boxes, patch_artist=True, medianprops={"color": "black"}) # draw precomputed boxes
+            for box, color in zip(artists["boxes"], colors): # fill boxes like the seaborn palette
+                box.set_facecolor(color)
             plt.title(f"{metric} Distribution by Country", fontsize=16, weight='bold') # set title
             plt.ylabel(f"{metric} (W/m²)", fontsize=12) # set y-axis label
             plt.xlabel("") # set x-axis label
@@ -122,8 +369,7 @@ class SolarComparisonPipeline: # define a class for the solar comparison pipelin
         Create a bar chart showing average GHI by country.
         """
         mean_ghi = ( # calculate mean GHI by country
-            self.df_all.groupby("country")["GHI"] # group by country
-            .mean() # calculate mean
+            self.mean_by_country(["GHI"])["GHI"] # rollups when available, else minute data
             .sort_values(ascending=False) # sort values
             .round(1) # round to 1 decimal place
         )
@@ -149,6 +395,25 @@ class SolarComparisonPipeline: # define a class for the solar comparison pipelin
         plt.tight_layout() # adjust layout
         plt.show() # show plot
 
+    # --------------------------------------------------------------------------
+    # 🧊 Means from the coarsest available level
+    # --------------------------------------------------------------------------
+    def mean_by_country(self, metrics=None): # Mean of each metric per country
+        """
+        Return the mean of each metric per country.
+
+        Uses the monthly rollups (a dozen rows per station-year) when a
+        RollupCube is attached, otherwise the cached minute-data aggregates.
+        """
+        metrics = metrics or self.METRICS # default to all comparison metrics
+        if self.rollup is None: # no cube → cached aggregates of the minute data
+            return self.aggregates().xs("mean", axis=1, level=1)[metrics] # per-country means
+        totals = self.rollup.totals(metrics, stations=[s.key for s in self.sites]) # per-station sums/counts from the coarsest grain
+        means = totals.xs("mean", axis=1, level=1) # keep the means
+        means.index = [get_station(key).name for key in means.index] # station key → country label
+        means.index.name = "country" # match the minute-data layout
+        return means.astype(np.float64) # return means
+
     # --------------------------------------------------------------------------
     # 📈 Summary statistics
     # --------------------------------------------------------------------------
@@ -156,12 +421,8 @@ class SolarComparisonPipeline: # define a class for the solar comparison pipelin
         """
         Return mean, median, std, and count for each country and metric.
         """
-        summary = (  # calculate summary statistics
-            self.df_all # use combined data
-            .groupby("country")[["GHI", "DNI", "DHI"]] # group by country
-            .agg(["mean", "median", "std", "count"]) # aggregate statistics
-            .round(2) # round to 2 decimal places
-        )
+        columns = [(metric, stat) for metric in self.METRICS for stat in ["mean", "median", "std", "count"]] # summary layout
+        summary = self.aggregates()[columns].round(2) # select cached statistics
         print("📊 Summary Statistics (GHI, DNI, DHI):")
         return summary # return summary statistics
 
@@ -172,13 +433,7 @@ class SolarComparisonPipeline: # define a class for the solar comparison pipelin
         """
         Report missing values per country.
         """
-        missing = ( # calculate missing values
-            self.df_all[["country", "GHI", "DNI", "DHI"]] # select relevant columns
-            .isna() # check for NaN values
-            .groupby(self.df_all["country"]) # group by country
-            .sum() # sum missing values
-            .astype(int) # convert to integer
-        )
+        missing = self.aggregates().xs("missing", axis=1, level=1)[self.METRICS] # cached null counts
         print("⚠️ Missing Value Report:")
         return missing # return missing values
 
@@ -0,0 +1,207 @@
+"""
+ingest.py – Incremental Append Ingestion
+----------------------------------------
+
+Keeps `data/<station>_clean.csv` up to date with growing logger files
+without re-processing the full history:
+- Remembers, per station, the byte offset and last timestamp ingested
+- Parses only the newly appended tail of the raw CSV
+- Cleans the tail against column statistics persisted from the full run
+  (`<output>.stats.json`, see src/stats.py)
+- Appends the cleaned rows to the existing output
+
+State is a small JSON file per station (default: data/.state/<key>.json).
+Alongside the offset it keeps a hash of the bytes just before it; if the raw
+file shrinks or those bytes change (rotation or rewrite), or no state/output
+exists, the station is rebuilt from scratch.
+
+Usage:
+    ingestor = IncrementalIngestor("togo", "src/Togo/togo-dapaong_qc.csv",
+                                   "data/togo_clean.csv")
+    new_rows = ingestor.run()
+
+Author: Nabil Mohamed
+"""
+
+import os
+import json
+import hashlib
+
+import pandas as pd
+from src.loader import BaseCSVLoader  # Offset-based tail reads
+from src.clean import SolarDataCleaner  # Outlier cleaning with persisted stats
+from src.stats import ColumnStats, stats_path_for  # Shared column statistics
+from src.schema import STATION_DTYPES, SKIP_COLUMNS, TIMESTAMP_COLUMN  # Shared schema
+
+FINGERPRINT_BYTES = 4096  # Bytes before the offset hashed to detect rewrites
+
+
+def tail_fingerprint(path: str, offset: int, nbytes: int = FINGERPRINT_BYTES) -> str:
+    """
+    Hash the `nbytes` bytes of `path` that end at `offset`.
+
+    Parameters:
+    - path (str): Raw station CSV
+    - offset (int): Byte offset the hashed window ends at
+    - nbytes (int): Window length
+
+    Returns:
+    - str: Hex SHA-1 digest of the window
+    """
+    start = max(offset - nbytes, 0)
+    with open(path, "rb") as fh:
+        fh.seek(start)
+        return hashlib.sha1(fh.read(offset - start)).hexdigest()
+
+
+# ------------------------------------------------------------------------------
+# 🔁 IncrementalIngestor Class
+# ------------------------------------------------------------------------------
+
+class IncrementalIngestor:
+    """
+    Appends newly logged minutes of one station to its cleaned output.
+
+    Parameters:
+    ----------
+    station : str
+        Station key, used to name the state file.
+    source_path : str
+        Raw, append-only station CSV.
+    output_path : str
+        Cleaned CSV that receives the appended rows.
+    state_dir : str
+        Directory holding the per-station JSON state.
+    outlier_columns : list[str], optional
+        Columns cleaned by SolarDataCleaner (its defaults when None).
+    """
+
+    def __init__(self, station: str, source_path: str, output_path: str,
+                 state_dir: str = "data/.state", outlier_columns=None):
+        self.station = station
+        self.source_path = source_path
+        self.output_path = output_path
+        self.state_path = os.path.join(state_dir, f"{station}.json")
+        self.stats_path = stats_path_for(output_path)  # Sidecar next to the cleaned CSV
+        self.outlier_columns = outlier_columns
+
+    # --------------------------------------------------------------------------
+    # 💾 State persistence
+    # --------------------------------------------------------------------------
+
+    def load_state(self):
+        """
+        Return the persisted ingestion state, or None if there is none.
+        """
+        if not os.path.exists(self.state_path):
+            return None
+        with open(self.state_path, "r", encoding="utf-8") as fh:
+            return json.load(fh)
+
+    def save_state(self, state: dict):
+        """
+        Atomically write the ingestion state.
+        """
+        os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            json.dump(state, fh, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    # --------------------------------------------------------------------------
+    # 🚀 Ingestion
+    # --------------------------------------------------------------------------
+
+    def _loader(self, state=None) -> BaseCSVLoader:
+        """
+        Loader for the raw file, reusing the recorded encoding and date layout.
+        """
+        return BaseCSVLoader(
+            self.source_path, parse_dates=[TIMESTAMP_COLUMN], verbose=False,
+            dtype=STATION_DTYPES, skip_columns=SKIP_COLUMNS,
+            encoding=state.get("encoding") if state else None,
+            date_format=state.get("date_format") if state else None,
+        )
+
+    def _needs_rebuild(self, state) -> bool:
+        if state is None or not os.path.exists(self.output_path) or not os.path.exists(self.stats_path):
+            return True
+        offset = state["byte_offset"]
+        if os.path.getsize(self.source_path) < offset:
+            return True  # Truncated/rotated
+        fingerprint = state.get("fingerprint")
+        return fingerprint is not None and fingerprint != tail_fingerprint(self.source_path, offset)  # Rewritten in place
+
+    def run(self) -> pd.DataFrame:
+        """
+        Ingest whatever was appended since the last run.
+
+        Returns:
+        --------
+        pd.DataFrame
+            The cleaned rows written by this run (full data on a rebuild).
+        """
+        if not os.path.exists(self.source_path):
+            raise FileNotFoundError(f"❌ File not found: {self.source_path}")
+
+        state = self.load_state()
+        if self._needs_rebuild(state):
+            return self.rebuild()
+
+        # Step 1: Parse only the bytes after the recorded offset
+        loader = self._loader(state)
+        tail, end_offset = loader.load_tail(state["byte_offset"], names=state["header"])
+        if state.get("last_timestamp"):
+            tail = tail[tail[TIMESTAMP_COLUMN] > pd.Timestamp(state["last_timestamp"])]
+        if tail.empty:
+            print(f"⏭️ {self.station}: no new rows since {state.get('last_timestamp')}")
+            return tail
+
+        # Step 2: Clean against the persisted full-history statistics
+        stats = ColumnStats.load(self.stats_path)
+        cleaner = SolarDataCleaner(tail, outlier_columns=self.outlier_columns, stats=stats,
+                                   score_against_stats=True)
+        cleaned = cleaner.run().reindex(columns=state["output_columns"])
+
+        # Step 3: Append to the cleaned output and advance the state
+        cleaned.to_csv(self.output_path, mode="a", header=False, index=False)
+        state.update({
+            "byte_offset": end_offset,
+            "fingerprint": tail_fingerprint(self.source_path, end_offset),
+            "last_timestamp": str(tail[TIMESTAMP_COLUMN].max()),
+            "rows_ingested": state["rows_ingested"] + len(tail),
+        })
+        self.save_state(state)
+        print(f"➕ {self.station}: appended {len(cleaned)} cleaned rows to {self.output_path}")
+        return cleaned
+
+    def rebuild(self) -> pd.DataFrame:
+        """
+        Process the full raw file and reset the state.
+        """
+        print(f"🔄 {self.station}: full rebuild from {self.source_path}")
+        loader = self._loader()
+        df, end_offset = loader.load_tail(0)
+
+        stats = ColumnStats.from_frame(df)  # All columns, so reports can reuse them too
+        cleaner = SolarDataCleaner(df, outlier_columns=self.outlier_columns, stats=stats)
+        cleaned = cleaner.run()
+
+        os.makedirs(os.path.dirname(self.output_path) or ".", exist_ok=True)
+        cleaned.to_csv(self.output_path, index=False)
+        stats.save(self.stats_path)  # Later tails are scored against these
+
+        self.save_state({
+            "station": self.station,
+            "source": os.path.abspath(self.source_path),
+            "header": loader.header(),
+            "encoding": loader.resolve_encoding(),
+            "date_format": loader.resolve_date_format(),
+            "byte_offset": end_offset,
+            "fingerprint": tail_fingerprint(self.source_path, end_offset),
+            "last_timestamp": str(df[TIMESTAMP_COLUMN].max()) if len(df) else None,
+            "rows_ingested": len(df),
+            "output_columns": cleaned.columns.tolist(),
+        })
+        print(f"✅ {self.station}: {len(cleaned)} cleaned rows written to {self.output_path}")
+        return cleaned
@@ -3,8 +3,13 @@ loader.py – General-Purpose CSV Loader
 --------------------------------------
 
 Provides a reusable class for robustly loading CSV files with:
-- Timestamp parsing
-- Encoding fallback (UTF-8 → latin1)
+- Timestamp parsing with a fixed-format fast path (detected or declared)
+- Declared dtypes (e.g. float32 sensor channels) and skipped columns
+- Encoding sniffed from a bounded prefix (UTF-8 → latin1), with a latin1
+  retry if the parse meets invalid UTF-8 further on; recorded for reuse
+- Optional columnar (Parquet) cache for fast repeat loads
+- Streaming chunked reads with column and time-window pushdown
+- Tail reads from a byte offset for append-only files
 - Verbose feedback for diagnostics
 
 Intended as a base module for more domain-specific loaders.
@@ -13,7 +18,37 @@ Author: Nabil Mohamed
 """
 
 import os  # OS module for file path validation
+import io  # In-memory buffers for tail parsing
+import codecs  # Incremental decoders for encoding detection
+import json  # JSON for cache metadata sidecars
+import hashlib  # Hashing for cache keys and content fingerprints
 import pandas as pd  # Pandas for data loading and manipulation
+from src.schema import read_dtypes, apply_schema, TIMESTAMP_FORMATS  # Declared dtype handling
+
+# ------------------------------------------------------------------------------
+# 📏 Bounded file reads
+# ------------------------------------------------------------------------------
+
+class _BoundedReader(io.RawIOBase):
+    """
+    Read-only stream over the next `limit` bytes of an open binary file.
+    """
+
+    def __init__(self, fh, limit: int):
+        self._fh = fh  # Positioned at the first byte to expose
+        self._left = limit  # Bytes still available
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        size = min(len(buffer), self._left)
+        if size <= 0:
+            return 0
+        data = self._fh.read(size)
+        buffer[:len(data)] = data
+        self._left -= len(data)
+        return len(data)
 
 # ------------------------------------------------------------------------------
 # 📂 BaseCSVLoader Class
@@ -28,6 +63,15 @@ class BaseCSVLoader:
         loader = BaseCSVLoader("data/my_file.csv", parse_dates=["Timestamp"])
         df = loader.load()
 
+        # Repeat loads served from a Parquet cache
+        loader = BaseCSVLoader("data/my_file.csv", parse_dates=["Timestamp"],
+                               cache_dir="data/.cache")
+
+        # Stream one month of GHI without materializing the file
+        for chunk in loader.iter_chunks(100_000, columns=["GHI"],
+                                        start="2022-03-01", end="2022-04-01"):
+            ...
+
     Parameters:
     ----------
     path : str
@@ -36,17 +80,48 @@ class BaseCSVLoader:
         Columns to parse as datetime objects.
     verbose : bool
         Whether to print diagnostics on load.
+    dtype : dict, optional
+        Declared column → dtype map (see `src.schema.STATION_DTYPES`).
+    skip_columns : list[str], optional
+        Columns that are never parsed (e.g. always-empty `Comments`).
+    drop_empty : bool
+        Drop any remaining column that contains no values.
+    encoding : str, optional
+        Known text encoding. Detected automatically (once) when None.
+    date_format : str, optional
+        strftime layout of the date columns. When None it is detected from
+        the first rows (see `TIMESTAMP_FORMATS`); files that break the
+        layout fall back to per-value inference.
+    cache_dir : str, optional
+        Directory for the columnar cache. Caching is disabled when None.
     """
 
-    def __init__(self, path: str, parse_dates=None, verbose: bool = True):
+    READ_BLOCK_SIZE = 1 << 20  # Read 1 MiB at a time when hashing files
+    ENCODING_SNIFF_BYTES = 1 << 16  # Prefix checked for UTF-8 validity before parsing
+    DATE_SNIFF_ROWS = 100  # Rows inspected when detecting the timestamp layout
+
+    def __init__(self, path: str, parse_dates=None, verbose: bool = True, dtype=None,
+                 skip_columns=None, drop_empty: bool = False, encoding: str = None,
+                 date_format: str = None, cache_dir: str = None):
         self.path = path  # Store file path
         self.parse_dates = parse_dates if parse_dates else []  # Default: no date parsing
         self.verbose = verbose  # Toggle console output
+        self.dtype = dtype if dtype else {}  # Default: let pandas infer dtypes
+        self.skip_columns = list(skip_columns) if skip_columns else []  # Columns never parsed
+        self.drop_empty = drop_empty  # Drop all-null columns after parsing
+        self.encoding = encoding  # Resolved lazily by resolve_encoding()
+        self._encoding_sniffed = False  # True while the encoding is only a prefix-based guess
+        self.date_format = date_format  # Resolved lazily by resolve_date_format()
+        self.cache_dir = cache_dir  # Optional Parquet cache location
 
     def load(self) -> pd.DataFrame:
         """
-        Attempt to read the CSV file using UTF-8 encoding first.
-        If that fails, retry with 'latin1' fallback.
+        Read the CSV file once, using UTF-8 when the sniffed prefix is valid
+        UTF-8 and 'latin1' otherwise (see `resolve_encoding`). Invalid UTF-8
+        past the prefix triggers a single latin1 re-parse.
+
+        When a cache directory is configured, a valid cached copy is
+        returned instead of re-parsing, and fresh parses are written back.
 
         Returns:
         --------
@@ -58,17 +133,27 @@ class BaseCSVLoader:
         if not os.path.exists(self.path):
             raise FileNotFoundError(f"❌ File not found: {self.path}")
 
-        # Step 2: Try reading the file with UTF-8 encoding
-        try:
-            df = pd.read_csv(self.path, parse_dates=self.parse_dates)
-            encoding_used = "utf-8"
-        except UnicodeDecodeError:
-            # Step 3: Retry with Latin-1 fallback on encoding error
-            print(f"⚠️ Encoding issue in {self.path}. Retrying with latin1...")
-            df = pd.read_csv(self.path, parse_dates=self.parse_dates, encoding="latin1")
-            encoding_used = "latin1"
+        # Step 2: Serve from the columnar cache if it is still valid
+        if self.cache_dir:
+            df = self._read_cache()
+            if df is not None:
+                if self.verbose:
+                    print(f"⚡ Loaded from cache: {self.path}")
+                    print(f"🔢 Shape: {df.shape}")
+                return df
 
-        # Step 4: Print summary diagnostics if verbose mode is on
+        # Step 3-4: Decide the encoding (prefix sniff or recorded value) and parse once
+        df = self._with_encoding(self._read_csv)
+        encoding_used = self.encoding
+
+        # Step 5: Narrow declared columns and drop empty ones
+        df = apply_schema(df, self.dtype, drop_empty=self.drop_empty)
+
+        # Step 6: Persist the parse for subsequent runs
+        if self.cache_dir:
+            self._write_cache(df)
+
+        # Step 7: Print summary diagnostics if verbose mode is on
         if self.verbose:
             print(f"✅ Loaded: {self.path}")
             print(f"🔢 Shape: {df.shape}")
@@ -76,3 +161,422 @@ class BaseCSVLoader:
             print(f"📦 Encoding Used: {encoding_used}")
 
         return df  # Return the fully loaded DataFrame
+
+    def iter_chunks(self, chunksize: int, columns=None, start=None, end=None):
+        """
+        Stream the CSV as typed DataFrame chunks without loading it whole.
+
+        Column projection is pushed into the parser (`usecols`) and rows
+        outside the [start, end) window are dropped chunk by chunk. While
+        the timestamps seen so far are ascending, reading stops as soon as
+        a chunk starts past `end`. Chunks are not sorted.
+
+        Every chunk keeps the parse dtypes of `read_dtypes` (integer flags
+        stay float32): narrowing chunk by chunk would give a column a dtype
+        that depends on whether that chunk happens to contain NaN.
+
+        Parameters:
+        ----------
+        chunksize : int
+            Number of CSV rows parsed per chunk.
+        columns : list[str], optional
+            Columns to keep. The timestamp column is always included.
+        start, end : str or pd.Timestamp, optional
+            Inclusive start and exclusive end of the time window.
+
+        Yields:
+        -------
+        pd.DataFrame
+            Non-empty chunks, all with the same column dtypes.
+        """
+        if not os.path.exists(self.path):
+            raise FileNotFoundError(f"❌ File not found: {self.path}")
+
+        time_col = self.parse_dates[0] if self.parse_dates else None
+        if (start is not None or end is not None) and time_col is None:
+            raise ValueError("❌ Time-window filtering requires a parse_dates column.")
+        start = pd.Timestamp(start) if start is not None else None
+        end = pd.Timestamp(end) if end is not None else None
+
+        # Project columns at parse time (timestamp always kept for filtering)
+        skip = set(self.skip_columns)
+        if columns is not None:
+            keep = set(columns) | set(self.parse_dates)
+            usecols = lambda col: col in keep and col not in skip
+        else:
+            usecols = (lambda col: col not in skip) if skip else None
+
+        def open_reader(encoding, skip_rows):
+            return pd.read_csv(
+                self.path,
+                parse_dates=self.parse_dates,
+                date_format=self.resolve_date_format(),
+                dtype=read_dtypes(self.dtype) or None,
+                usecols=usecols,
+                encoding=encoding,
+                chunksize=chunksize,
+                skiprows=range(1, skip_rows + 1) if skip_rows else None,  # Keep the header line
+            )
+
+        ascending = True       # Whether timestamps have been sorted so far
+        last_seen = None       # Final timestamp of the previous chunk
+        parsed = 0             # Data rows already handed out (or filtered away)
+        encoding = self.resolve_encoding()
+        while True:
+            try:
+                with open_reader(encoding, parsed) as reader:
+                    for chunk in reader:
+                        parsed += len(chunk)
+                        chunk = self._ensure_datetimes(chunk)  # Fixed parse dtypes, no per-chunk narrowing
+
+                        if time_col is not None and len(chunk):
+                            times = chunk[time_col]
+                            first = times.iloc[0]
+                            ascending = ascending and times.is_monotonic_increasing and (
+                                last_seen is None or first >= last_seen
+                            )
+                            last_seen = times.iloc[-1]
+
+                            # Sorted file already past the window → nothing left to read
+                            if ascending and end is not None and first >= end:
+                                return
+
+                            mask = pd.Series(True, index=chunk.index)
+                            if start is not None:
+                                mask &= times >= start
+                            if end is not None:
+                                mask &= times < end
+                            if not mask.all():
+                                chunk = chunk[mask]
+
+                        if len(chunk):
+                            yield chunk
+                return
+            except UnicodeDecodeError:
+                if not self._fall_back_encoding():
+                    raise
+                encoding = self.encoding  # Resume after the rows already served
+
+    def load_tail(self, offset: int = 0, names=None):
+        """
+        Parse only the complete lines that follow byte `offset`.
+
+        The parser reads straight from the file handle (bounded to the last
+        complete line), so even a full read from offset 0 never holds the
+        raw bytes in memory next to the parsed frame.
+
+        Intended for append-only logger files: the returned end offset is
+        stored by the caller and passed back on the next refresh. A trailing
+        line without a newline (still being written) is left for next time.
+        As with `iter_chunks`, the parse dtypes are kept (no per-tail
+        narrowing), so successive tails append with identical dtypes.
+
+        Parameters:
+        ----------
+        offset : int
+            Byte position to resume from (0 = start of file, header included).
+        names : list[str], optional
+            Header of the file, required when `offset` > 0.
+
+        Returns:
+        --------
+        (pd.DataFrame, int)
+            Parsed rows (possibly empty) and the byte offset after them.
+        """
+        skip = set(self.skip_columns)
+        with open(self.path, "rb") as fh:
+            end = self._last_line_end(fh, offset)  # Drop a partially written last line
+
+            def parse(encoding):
+                fh.seek(offset)
+                return pd.read_csv(
+                    io.BufferedReader(_BoundedReader(fh, end - offset), self.READ_BLOCK_SIZE),
+                    header=0 if offset == 0 else None,
+                    names=None if offset == 0 else names,
+                    parse_dates=self.parse_dates,
+                    date_format=self.resolve_date_format(),
+                    dtype=read_dtypes(self.dtype) or None,
+                    usecols=(lambda col: col not in skip) if skip else None,
+                    encoding=encoding,
+                )
+
+            try:
+                df = self._with_encoding(parse) if end > offset or offset == 0 else None
+            except pd.errors.EmptyDataError:
+                if offset == 0:
+                    raise
+                df = None  # Only blank lines were appended
+
+        if df is None:
+            return pd.DataFrame(columns=[col for col in names if col not in skip]), end
+        return self._ensure_datetimes(df), end
+
+    def _last_line_end(self, fh, offset: int) -> int:
+        """
+        Byte position just after the last newline at or beyond `offset`.
+
+        Scans backwards from the end of the file one block at a time, so
+        only the final block is read in the usual case.
+        """
+        position = fh.seek(0, os.SEEK_END)
+        while position > offset:
+            start = max(offset, position - self.READ_BLOCK_SIZE)
+            fh.seek(start)
+            newline = fh.read(position - start).rfind(b"\n")
+            if newline >= 0:
+                return start + newline + 1
+            position = start
+        return offset
+
+    def header(self) -> list:
+        """
+        Return the column names from the first line of the file.
+        """
+        return pd.read_csv(self.path, nrows=0, encoding=self.resolve_encoding()).columns.tolist()
+
+    # --------------------------------------------------------------------------
+    # 🔤 Encoding detection
+    # --------------------------------------------------------------------------
+
+    def resolve_encoding(self) -> str:
+        """
+        Return the file encoding, detecting it at most once.
+
+        Resolution order: the explicit/previously detected value on this
+        loader, the value recorded in the cache metadata for an unchanged
+        file, then a fresh `detect_encoding` scan.
+        """
+        if self.encoding:
+            return self.encoding
+
+        if self.cache_dir:
+            meta = self._read_meta()
+            stat = os.stat(self.path)
+            if meta and meta.get("size") == stat.st_size and meta.get("mtime_ns") == stat.st_mtime_ns:
+                self.encoding = meta.get("encoding")
+
+        if not self.encoding:
+            self.encoding = self.detect_encoding()
+            self._encoding_sniffed = self.encoding == "utf-8"  # Only a prefix was checked
+            if self.encoding != "utf-8":
+                print(f"⚠️ Non-UTF-8 bytes in {self.path}. Using {self.encoding}.")
+        return self.encoding
+
+    def detect_encoding(self) -> str:
+        """
+        Check whether the first `ENCODING_SNIFF_BYTES` are valid UTF-8.
+
+        Only a bounded prefix is read, so detection costs the same for any
+        file size. A multi-byte character cut at the end of the prefix is
+        not an error. Any invalid sequence means the file is read as
+        'latin1', which accepts every byte value; invalid bytes beyond the
+        prefix are caught during the parse (see `_with_encoding`).
+        """
+        with open(self.path, "rb") as fh:
+            prefix = fh.read(self.ENCODING_SNIFF_BYTES)
+            complete = not fh.read(1)  # Whole file fits in the prefix
+        try:
+            codecs.getincrementaldecoder("utf-8")().decode(prefix, final=complete)
+        except UnicodeDecodeError:
+            return "latin1"
+        return "utf-8"
+
+    def _fall_back_encoding(self) -> bool:
+        """
+        Switch a sniffed UTF-8 guess to 'latin1' after a decode error.
+
+        Returns False when the encoding was declared or already confirmed,
+        in which case the error should propagate.
+        """
+        if not self._encoding_sniffed:
+            return False
+        self.encoding = "latin1"
+        self._encoding_sniffed = False
+        print(f"⚠️ Non-UTF-8 bytes past the first {self.ENCODING_SNIFF_BYTES} bytes of {self.path}. "
+              f"Using {self.encoding}.")
+        return True
+
+    def _with_encoding(self, parse):
+        """
+        Run `parse(encoding)`, retrying once with 'latin1' if a sniffed
+        UTF-8 guess turns out wrong past the prefix.
+        """
+        try:
+            return parse(self.resolve_encoding())
+        except UnicodeDecodeError:
+            if not self._fall_back_encoding():
+                raise
+            return parse(self.encoding)
+
+    # --------------------------------------------------------------------------
+    # 🕒 Timestamp layout detection
+    # --------------------------------------------------------------------------
+
+    def resolve_date_format(self):
+        """
+        Return the fixed strftime layout of the date columns, or None.
+
+        Detection runs once per loader: the first `DATE_SNIFF_ROWS` rows are
+        tested against each candidate in `TIMESTAMP_FORMATS`.
+        """
+        if self.date_format is None and self.parse_dates:
+            self.date_format = self.detect_date_format() or ""  # "" → no fixed layout
+        return self.date_format or None
+
+    def detect_date_format(self):
+        """
+        Find the first candidate layout that parses every sampled timestamp.
+        """
+        sample = pd.read_csv(
+            self.path,
+            usecols=self.parse_dates,
+            nrows=self.DATE_SNIFF_ROWS,
+            dtype=str,
+            encoding=self.resolve_encoding(),
+        )
+        values = sample[self.parse_dates].stack().dropna()
+        if values.empty:
+            return None
+        for fmt in TIMESTAMP_FORMATS:
+            try:
+                pd.to_datetime(values, format=fmt)
+                return fmt
+            except (ValueError, TypeError):
+                continue
+        return None
+
+    def _ensure_datetimes(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Safety net for files that break the detected layout part-way.
+
+        With an explicit `date_format`, pandas leaves a column unparsed when
+        any value does not match; such columns are re-parsed per value.
+        """
+        for col in self.parse_dates:
+            if col in df.columns and not pd.api.types.is_datetime64_any_dtype(df[col]):
+                try:
+                    df[col] = pd.to_datetime(df[col], format="mixed")
+                except (ValueError, TypeError):
+                    pass  # Leave unparseable columns as text, as read_csv would
+        return df
+
+    def _read_csv(self, encoding: str) -> pd.DataFrame:
+        """
+        Parse the CSV once with the configured dates, dtypes and column filter.
+        """
+        skip = set(self.skip_columns)
+        df = pd.read_csv(
+            self.path,
+            parse_dates=self.parse_dates,
+            date_format=self.resolve_date_format(),
+            dtype=read_dtypes(self.dtype) or None,
+            usecols=(lambda col: col not in skip) if skip else None,
+            encoding=encoding,
+        )
+        return self._ensure_datetimes(df)
+
+    # --------------------------------------------------------------------------
+    # ⚡ Columnar cache helpers
+    # --------------------------------------------------------------------------
+
+    def _cache_paths(self):
+        """
+        Return the (data, metadata) paths of the cache entry for this source.
+
+        The entry name is derived from the absolute source path and the
+        loader options, so differently configured loaders never share data.
+        """
+        key_source = json.dumps(
+            {"path": os.path.abspath(self.path), "options": self._cache_options()},
+            sort_keys=True,
+        )
+        key = hashlib.sha1(key_source.encode("utf-8")).hexdigest()[:20]
+        base = os.path.join(self.cache_dir, key)
+        return f"{base}.parquet", f"{base}.json"
+
+    def _cache_options(self) -> dict:
+        """
+        Loader options that influence the parsed frame (part of the cache key).
+        """
+        return {
+            "parse_dates": list(self.parse_dates),
+            "dtype": {col: str(dtype) for col, dtype in self.dtype.items()},
+            "skip_columns": list(self.skip_columns),
+            "drop_empty": self.drop_empty,
+        }
+
+    def _content_hash(self) -> str:
+        """
+        Fingerprint the raw file contents with BLAKE2b.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        with open(self.path, "rb") as fh:
+            for block in iter(lambda: fh.read(self.READ_BLOCK_SIZE), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _read_cache(self):
+        """
+        Return the cached frame if it still matches the source file, else None.
+
+        Size and mtime are checked first; the content hash is only recomputed
+        when the size matches but the mtime moved (e.g. after a fresh checkout).
+        """
+        data_path, meta_path = self._cache_paths()
+        meta = self._read_meta()
+        if meta is None or not os.path.exists(data_path):
+            return None
+
+        stat = os.stat(self.path)
+        if stat.st_size != meta.get("size"):
+            return None  # File grew or shrank → stale
+        if stat.st_mtime_ns != meta.get("mtime_ns"):
+            if self._content_hash() != meta.get("content_hash"):
+                return None  # Same size but different bytes → stale
+            meta["mtime_ns"] = stat.st_mtime_ns  # Touched only → refresh mtime
+            self._write_json_atomic(meta_path, meta)
+
+        return pd.read_parquet(data_path)
+
+    def _write_cache(self, df: pd.DataFrame):
+        """
+        Write the parsed frame and its validation metadata to the cache.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        data_path, meta_path = self._cache_paths()
+        stat = os.stat(self.path)
+
+        # Write to a temporary file first so readers never see partial data
+        tmp_path = f"{data_path}.tmp"
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, data_path)
+
+        meta = {
+            "source": os.path.abspath(self.path),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "content_hash": self._content_hash(),
+            "encoding": self.resolve_encoding(),
+            "options": self._cache_options(),
+        }
+        self._write_json_atomic(meta_path, meta)
+
+    def _read_meta(self):
+        """
+        Load the cache metadata sidecar for this source, or None if absent.
+        """
+        _, meta_path = self._cache_paths()
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path, "r", encoding="utf-8") as fh:
+            return json.load(fh)
+
+    @staticmethod
+    def _write_json_atomic(path: str, payload: dict):
+        """
+        Atomically replace a JSON file on disk.
+        """
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            json.dump(payload, fh, indent=2)
+        os.replace(tmp_path, path)
@@ -0,0 +1,258 @@
+"""
+partials.py – Mergeable Per-Station-Day Statistic Partials
+----------------------------------------------------------
+
+Precomputed, mergeable aggregates for every (station, day, column):
+- count, null count, sum, M2 (sum of squared deviations), min, max
+- a small quantile sketch (sorted day values thinned to weighted items)
+
+Summary statistics for any date range and any set of stations are then
+answered by merging the selected partials (a few hundred rows per column)
+instead of rescanning millions of one-minute rows. Both building and
+merging are whole-array operations (groupby reductions, one lexsort per
+column); there is no Python loop over days.
+
+Usage:
+    partials = SolarReportGenerator(df_togo, country="togo").daily_partials()
+    partials.save("data/partials/togo")
+
+    partials = DailyPartials.load("data/partials/togo")
+    march = partials.stats(start="2022-03-01", end="2022-04-01")
+    SolarReportGenerator.from_partials(partials, start="2022-03-01", end="2022-04-01").generate()
+
+Author: Nabil Mohamed
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+from src.stats import ColumnStats, QuantileSketch, DEFAULT_QUANTILES  # Mergeable statistics
+from src.schema import TIMESTAMP_COLUMN  # Shared timestamp column name
+
+DEFAULT_DAY_SKETCH_SIZE = 256  # Items kept per station-day-column (rank error ≈ 0.5% per day)
+MOMENT_COLUMNS = ["station", "day", "column", "count", "null_count", "sum", "m2", "min", "max"]
+SKETCH_COLUMNS = ["station", "day", "column", "level", "value"]
+
+# ------------------------------------------------------------------------------
+# 🧩 DailyPartials Class
+# ------------------------------------------------------------------------------
+
+class DailyPartials:
+    """
+    Per-station-day partial aggregates in two long tables.
+
+    Parameters:
+    ----------
+    moments : pd.DataFrame
+        One row per (station, day, column) with count, null_count, sum,
+        m2, min, max. Timestamp rows hold nanoseconds since the epoch.
+    sketches : pd.DataFrame
+        Thinned sorted values per (station, day, column); an item on
+        `level` i stands for 2**i values of that day.
+    """
+
+    def __init__(self, moments: pd.DataFrame = None, sketches: pd.DataFrame = None):
+        self.moments = moments if moments is not None else pd.DataFrame(columns=MOMENT_COLUMNS)
+        self.sketches = sketches if sketches is not None else pd.DataFrame(columns=SKETCH_COLUMNS)
+
+    # --------------------------------------------------------------------------
+    # 🧮 Construction
+    # --------------------------------------------------------------------------
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, station: str, columns=None,
+                   sketch_size: int = DEFAULT_DAY_SKETCH_SIZE) -> "DailyPartials":
+        """
+        Aggregate a station frame into per-day partials.
+
+        Parameters:
+        - df (pd.DataFrame): Station data with a 'Timestamp' column
+        - station (str): Station key stored with every partial
+        - columns (list): Numeric columns to aggregate (default: all numeric)
+        - sketch_size (int): Maximum sketch items per day and column
+        """
+        if TIMESTAMP_COLUMN not in df.columns:
+            raise ValueError(f"❌ Daily partials require a '{TIMESTAMP_COLUMN}' column.")
+        if columns is None:
+            columns = [col for col in df.columns if col != TIMESTAMP_COLUMN
+                       and pd.api.types.is_numeric_dtype(df[col]) and not pd.api.types.is_bool_dtype(df[col])]
+
+        times = pd.to_datetime(df[TIMESTAMP_COLUMN])
+        days = times.dt.tz_localize(None).dt.floor("D") if times.dt.tz is not None else times.dt.floor("D")
+        codes, day_index = pd.factorize(days, sort=True)
+        valid_day = codes >= 0  # Rows without a timestamp cannot be placed on a day
+
+        # 📐 Moments: cythonized groupby reductions over all columns at once
+        block = df.loc[valid_day, columns].astype("float64")
+        stamps = times[valid_day].to_numpy().astype("datetime64[ns]")  # Nanoseconds, whatever the parsed unit
+        block[TIMESTAMP_COLUMN] = np.where(~np.isnat(stamps), stamps.astype("int64"), np.nan)
+        grouped = block.groupby(codes[valid_day])
+        count = grouped.count()
+        moments = {
+            "count": count,
+            "null_count": grouped.size().to_numpy()[:, None] - count,
+            "sum": grouped.sum(),
+            "m2": grouped.var(ddof=0) * count,
+            "min": grouped.min(),
+            "max": grouped.max(),
+        }
+        long = pd.concat({name: table.stack(future_stack=True) for name, table in moments.items()}, axis=1)
+        long.index = long.index.set_names(["code", "column"])
+        long = long.reset_index()
+        long["m2"] = long["m2"].fillna(0.0)
+        long.insert(0, "day", day_index[long.pop("code")])
+        long.insert(0, "station", station)
+        long[["count", "null_count"]] = long[["count", "null_count"]].astype("int64")
+
+        # 🎯 Sketches: sort each column by (day, value) once, keep every 2**level-th item
+        parts = []
+        for col in columns:
+            values = block[col].to_numpy()
+            present = ~np.isnan(values)
+            day_codes = codes[valid_day][present]
+            values = values[present]
+            if not values.size:
+                continue
+            order = np.lexsort((values, day_codes))
+            values, day_codes = values[order], day_codes[order]
+            sizes = np.bincount(day_codes, minlength=len(day_index))
+            starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+            rank = np.arange(values.size) - starts[day_codes]
+            level = np.ceil(np.log2(np.maximum(sizes / sketch_size, 1))).astype(np.int64)  # Per-day thinning
+            step = 1 << level[day_codes]
+            keep = rank % step == step // 2  # Middle item of each block of 2**level values
+            parts.append(pd.DataFrame({
+                "station": station,
+                "day": day_index[day_codes[keep]],
+                "column": col,
+                "level": level[day_codes[keep]],
+                "value": values[keep],
+            }))
+        sketches = pd.concat(parts, ignore_index=True) if parts else None
+        return cls(long[MOMENT_COLUMNS], sketches)
+
+    @classmethod
+    def concat(cls, partials) -> "DailyPartials":
+        """
+        Combine partials of several stations (or of disjoint periods).
+        """
+        partials = list(partials)
+        return cls(pd.concat([p.moments for p in partials], ignore_index=True),
+                   pd.concat([p.sketches for p in partials], ignore_index=True))
+
+    # --------------------------------------------------------------------------
+    # 🔎 Range queries
+    # --------------------------------------------------------------------------
+
+    def stations(self) -> list:
+        """
+        Station keys covered by the partials.
+        """
+        return sorted(self.moments["station"].unique())
+
+    def _select(self, table: pd.DataFrame, start=None, end=None, stations=None, columns=None) -> pd.DataFrame:
+        mask = np.ones(len(table), dtype=bool)
+        if start is not None:
+            mask &= (table["day"] >= pd.Timestamp(start).floor("D")).to_numpy()
+        if end is not None:
+            mask &= (table["day"] < pd.Timestamp(end)).to_numpy()
+        if stations is not None:
+            mask &= table["station"].isin([stations] if isinstance(stations, str) else stations).to_numpy()
+        if columns is not None:
+            mask &= table["column"].isin(list(columns) + [TIMESTAMP_COLUMN]).to_numpy()
+        return table[mask]
+
+    def stats(self, start=None, end=None, stations=None, columns=None,
+              quantiles=DEFAULT_QUANTILES) -> ColumnStats:
+        """
+        Merge the partials of whole days in [start, end) into ColumnStats.
+
+        Counts, nulls, moments and extrema are exact; quantiles come from
+        the merged day sketches. All columns are merged together with
+        groupby reductions (Chan's update for M2).
+
+        Parameters:
+        - start, end: Day range (end exclusive; default: everything)
+        - stations: Station key or list of keys (default: all)
+        - columns (list): Columns to include (default: all)
+        - quantiles (tuple): Quantile levels to estimate
+        """
+        selected = self._select(self.moments, start, end, stations, columns)
+        if selected.empty:
+            raise ValueError("❌ No partials in the requested range.")
+
+        grouped = selected.groupby("column", sort=False)
+        total = grouped[["count", "null_count", "sum"]].sum()
+        mean = total["sum"] / total["count"].where(total["count"] > 0)
+        part_mean = selected["sum"] / selected["count"].where(selected["count"] > 0)
+        spread = (selected["count"] * (part_mean - selected["column"].map(mean)) ** 2).fillna(0.0)
+        m2 = selected["m2"].groupby(selected["column"], sort=False).sum() + spread.groupby(selected["column"], sort=False).sum()
+        extremes = grouped[["min", "max"]].agg({"min": "min", "max": "max"})
+
+        items = self._select(self.sketches, start, end, stations, columns)
+        items_by_column = {col: group for col, group in items.groupby("column", sort=False)}
+        levels = sorted(set(quantiles) | {0.5})
+
+        entries = {}
+        for col in total.index:  # One entry per column (not per day)
+            count = int(total.at[col, "count"])
+            entry = {"kind": "datetime" if col == TIMESTAMP_COLUMN else "numeric",
+                     "count": count, "null_count": int(total.at[col, "null_count"])}
+            if not count:
+                entry.update({"mean": None, "m2": 0.0, "min": None, "max": None, "quantiles": None})
+                entries[col] = entry
+                continue
+            if col == TIMESTAMP_COLUMN:
+                entry.update({"mean": int(mean[col]), "m2": 0.0, "min": int(extremes.at[col, "min"]),
+                              "max": int(extremes.at[col, "max"]), "quantiles": None})
+                entries[col] = entry
+                continue
+            entry.update({"mean": float(mean[col]), "m2": float(m2[col]),
+                          "min": float(extremes.at[col, "min"]), "max": float(extremes.at[col, "max"])})
+            sketch = self._sketch(items_by_column.get(col))
+            entry["quantiles"] = {str(q): float(v) for q, v in zip(levels, sketch.quantiles(levels))}
+            entry["sketch"] = sketch
+            entries[col] = entry
+
+        order = [col for col in self.moments["column"].unique() if col in entries]
+        if TIMESTAMP_COLUMN in entries:  # Keep the timestamp first, as in the source frame
+            order = [TIMESTAMP_COLUMN] + [col for col in order if col != TIMESTAMP_COLUMN]
+        return ColumnStats({col: entries[col] for col in order})
+
+    @staticmethod
+    def _sketch(items: pd.DataFrame) -> QuantileSketch:
+        """
+        QuantileSketch holding the selected day items on their levels.
+        """
+        sketch = QuantileSketch()
+        if items is None or items.empty:
+            return sketch
+        depth = int(items["level"].max()) + 1
+        by_level = items.groupby("level")["value"]
+        sketch.levels = [np.asarray(by_level.get_group(i), dtype="float64") if i in by_level.groups
+                         else np.empty(0) for i in range(depth)]
+        return sketch
+
+    # --------------------------------------------------------------------------
+    # 💾 Persistence
+    # --------------------------------------------------------------------------
+
+    def save(self, root: str):
+        """
+        Write both tables as Parquet files under `root` (atomically).
+        """
+        os.makedirs(root, exist_ok=True)
+        for name, table in (("moments", self.moments), ("sketches", self.sketches)):
+            path = os.path.join(root, f"{name}.parquet")
+            table.to_parquet(f"{path}.tmp", index=False)
+            os.replace(f"{path}.tmp", path)
+        print(f"💾 Saved {len(self.moments)} daily partials to {root}")
+
+    @classmethod
+    def load(cls, root: str) -> "DailyPartials":
+        """
+        Read partials written by save().
+        """
+        return cls(pd.read_parquet(os.path.join(root, "moments.parquet")),
+                   pd.read_parquet(os.path.join(root, "sketches.parquet")))
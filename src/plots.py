@@ -42,6 +42,44 @@ def plot_time_series(df, country):
     plt.tight_layout()
     plt.show()
 
+
+def plot_time_series_from_store(store, station, country=None, start=None, end=None):
+    """
+    Plot the time series straight from a MinuteGridStore.
+
+    Parameters:
+    - store (MinuteGridStore): Memory-mapped minute-grid store
+    - station (str): Station key in the store
+    - country (str): Label for plot titles (defaults to the station key)
+    - start, end: Optional time window; only these minutes are read
+
+    Purpose:
+    - Inspect any period without loading the full station file
+    """
+    df = store.read_frame(station, channels=['GHI', 'DNI', 'DHI', 'Tamb'], start=start, end=end)
+    plot_time_series(df, country or station)
+
+
+def plot_time_series_from_rollup(cube, station, country=None, start=None, end=None, freq="D"):
+    """
+    Plot the time series from a RollupCube instead of minute data.
+
+    Parameters:
+    - cube (RollupCube): Materialized hourly/daily/monthly aggregates
+    - station (str): Station key in the cube
+    - country (str): Label for plot titles (defaults to the station key)
+    - start, end: Optional time window
+    - freq (str): Finest grain wanted ("h", "D" or "MS"); the coarsest
+      rollup level that satisfies it and the window is used
+
+    Purpose:
+    - Multi-year overviews from a few thousand rows instead of millions
+    """
+    cols = ['GHI', 'DNI', 'DHI', 'Tamb']
+    rows = cube.query(cols, stations=station, start=start, end=end, freq=freq)
+    df = rows.rename(columns={"period": "Timestamp", **{f"{c}_mean": c for c in cols}})
+    plot_time_series(df, country or station)
+
 # ------------------------------------------------------------------------------
 # 🧼 2. Sensor Cleaning Impact
 # ------------------------------------------------------------------------------
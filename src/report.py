@@ -6,11 +6,31 @@ This module encapsulates the logic for printing and exporting
 basic data quality reports including summary statistics and
 missing value percentages.
 
+Both reports come from one fused ColumnStats scan; percentiles are exact
+or sketch-based (percentiles="approx"), and generate(quiet=True) returns
+the tables without printing them. Reports over date ranges or several
+stations can be answered from precomputed per-day partials
+(see src/partials.py) without rescanning the raw rows.
+
+Reports are written atomically to an explicit output root as CSV,
+Parquet or JSON, and SolarReportGenerator.run_many produces them for
+many stations in a process pool.
+
+The running state (counts, moments, null counts, quantile sketches) can be
+persisted with save_state(); update(new_rows) then folds appended rows into
+it in time proportional to the new data.
+
 Author: Nabil Mohamed
 """
 
 import pandas as pd
 import os
+import uuid
+from src.stats import ColumnStats, DEFAULT_SKETCH_SIZE  # Shared per-column statistics
+from src.partials import DailyPartials, DEFAULT_DAY_SKETCH_SIZE  # Mergeable per-day aggregates
+from src.stations import map_sources, load_source  # Shared station fan-out for batch reports
+
+REPORT_FORMATS = {"csv": "csv", "parquet": "parquet", "json": "json"}  # format → file extension
 
 # ------------------------------------------------------------------------------
 # 📋 SolarReportGenerator Class
@@ -23,28 +43,152 @@ class SolarReportGenerator:
     Usage:
         reporter = SolarReportGenerator(df, country="Benin")
         reporter.generate(save=True)
+
+        result = SolarReportGenerator(df, percentiles="approx").generate(quiet=True)
+        result["summary"], result["missing"]
+
+        reporter.save_state("reports/.state/benin.stats.json")
+        reporter = SolarReportGenerator.from_state("reports/.state/benin.stats.json", country="Benin")
+        reporter.update(new_rows)  # only the appended rows are scanned
+        reporter.save_state("reports/.state/benin.stats.json")
     """
 
-    def __init__(self, df: pd.DataFrame, country: str = ""):
+    PERCENTILE_MODES = ("exact", "approx")
+
+    def __init__(self, df: pd.DataFrame, country: str = "", stats: ColumnStats = None,
+                 percentiles: str = "exact", verbose: bool = True):
         """
         Initialize with a cleaned DataFrame and optional country label.
 
         Parameters:
         - df (pd.DataFrame): Input solar dataset
         - country (str): Optional country label for labeling outputs
+        - stats (ColumnStats): Precomputed statistics of `df` to reuse
+        - percentiles (str): "exact" (selection) or "approx" (quantile sketch)
+        - verbose (bool): Print progress messages
         """
+        if percentiles not in self.PERCENTILE_MODES:
+            raise ValueError(f"❌ Unknown percentile mode: {percentiles!r}. Use one of {self.PERCENTILE_MODES}")
         self.df = df
         self.country = country.title()
-        print(f"📝 Initialized report generator for {self.country}")
+        self.stats = stats
+        self.percentiles = percentiles
+        self.verbose = verbose
+        if verbose:
+            print(f"📝 Initialized report generator for {self.country}")
+
+    @classmethod
+    def from_store(cls, store, station: str, country: str = "", channels=None, start=None, end=None):
+        """
+        Build a report generator over a window of a MinuteGridStore.
+
+        Parameters:
+        - store (MinuteGridStore): Memory-mapped minute-grid store
+        - station (str): Station key in the store
+        - country (str): Label for outputs (defaults to the station key)
+        - channels (list): Channels to report on (default: all stored)
+        - start, end: Optional time window; only these minutes are read
+        """
+        df = store.read_frame(station, channels=channels, start=start, end=end)
+        return cls(df, country=country or station)
+
+    @classmethod
+    def from_partials(cls, partials: DailyPartials, start=None, end=None, stations=None,
+                      country: str = "", columns=None, verbose: bool = True):
+        """
+        Build a report generator from merged per-day partials.
+
+        Parameters:
+        - partials (DailyPartials): Precomputed station-day aggregates
+        - start, end: Day range, end exclusive (default: everything)
+        - stations: Station key or list of keys (default: all)
+        - country (str): Label for outputs (defaults to the station key(s))
+        - columns (list): Columns to report on (default: all)
+        """
+        stats = partials.stats(start=start, end=end, stations=stations, columns=columns)
+        label = country or (stations if isinstance(stations, str) else "_".join(stations or partials.stations()))
+        return cls(None, country=label, stats=stats, percentiles="approx", verbose=verbose)
+
+    def daily_partials(self, station: str = None, sketch_size: int = DEFAULT_DAY_SKETCH_SIZE) -> DailyPartials:
+        """
+        Precompute mergeable per-day partials of the dataset.
+
+        Parameters:
+        - station (str): Key stored with the partials (defaults to the country label)
+        - sketch_size (int): Maximum quantile-sketch items per day and column
+        """
+        if self.df is None:
+            raise ValueError("❌ Daily partials need the underlying DataFrame.")
+        partials = DailyPartials.from_frame(self.df, station or self.country.lower(), sketch_size=sketch_size)
+        if self.verbose:
+            print(f"🧩 Built {len(partials.moments)} daily partials for {self.country}")
+        return partials
+
+    @classmethod
+    def from_state(cls, path: str, country: str = "", verbose: bool = True):
+        """
+        Resume from a running state written by save_state().
+
+        The reporter has no DataFrame; reports come from the state alone.
+        """
+        return cls(None, country=country, stats=ColumnStats.load(path), verbose=verbose)
+
+    def _has_sketches(self) -> bool:
+        ranged = [e for e in self.stats.columns.values() if e["kind"] in ("numeric", "datetime") and e["count"]]
+        return all("sketch" in e for e in ranged)
+
+    def running_state(self) -> ColumnStats:
+        """
+        Statistics with quantile sketches attached, ready to be merged.
+
+        Exact quantiles are kept until the first update; afterwards they are
+        estimated from the merged sketches.
+        """
+        if self.stats is None or not self._has_sketches():
+            if self.df is None:
+                raise ValueError("❌ Running state needs the DataFrame or a state saved with save_state().")
+            self.stats = ColumnStats.from_frame(self.df, sketch_size=DEFAULT_SKETCH_SIZE,
+                                                exact_quantiles=self.percentiles == "exact")
+        return self.stats
+
+    def update(self, new_rows: pd.DataFrame) -> ColumnStats:
+        """
+        Fold newly appended rows into the running state.
+
+        Only `new_rows` is scanned. Counts, null counts, min and max match a
+        full recompute exactly, mean and std to floating-point rounding
+        (Chan's parallel update); percentiles come from the merged sketches.
+        `self.df` is not extended.
+        """
+        state = self.running_state()
+        self.stats = state.merge(ColumnStats.from_frame(new_rows, sketch_size=DEFAULT_SKETCH_SIZE))
+        if self.verbose:
+            print(f"➕ {self.country}: report state updated with {len(new_rows)} rows "
+                  f"({self.stats.rows()} total)")
+        return self.stats
+
+    def save_state(self, path: str):
+        """
+        Persist the running state (atomic JSON, sketches included).
+        """
+        self.running_state().save(path)
+
+    def column_stats(self) -> ColumnStats:
+        """
+        Return the shared ColumnStats for the dataset, computing them once.
+        """
+        if self.stats is None:
+            self.stats = ColumnStats.from_frame(self.df, exact_quantiles=self.percentiles == "exact")
+        return self.stats
 
     def get_summary_stats(self) -> pd.DataFrame:
         """
         Compute summary statistics (mean, std, percentiles).
 
         Returns:
-        - pd.DataFrame: Summary stats using describe()
+        - pd.DataFrame: Summary stats in describe() layout
         """
-        return self.df.describe()
+        return self.column_stats().describe()
 
     def get_missing_report(self) -> pd.DataFrame:
         """
@@ -53,27 +197,113 @@ class SolarReportGenerator:
         Returns:
         - pd.DataFrame: Table with missing count and percent
         """
-        missing = self.df.isna().sum().to_frame(name="Missing Count")
-        missing["Percent Missing"] = (missing["Missing Count"] / len(self.df)) * 100
-        return missing
+        return self.column_stats().missing_report()
 
-    def generate(self, save: bool = False):
+    def generate(self, save: bool = False, quiet: bool = False, output_dir: str = "reports",
+                 fmt: str = "csv") -> dict:
         """
         Generate and optionally save the summary and missing reports.
 
         Parameters:
-        - save (bool): If True, exports reports as CSV files in /reports
-        """
-        print(f"\n📊 Summary Statistics for {self.country}")
-        summary = self.get_summary_stats()
-        print(summary)
+        - save (bool): If True, exports reports to `output_dir`
+        - quiet (bool): If True, nothing is printed (tables are only returned)
+        - output_dir (str): Output root for saved reports
+        - fmt (str): "csv", "parquet" or "json"
 
-        print(f"\n📉 Missing Values Report for {self.country}")
+        Returns:
+        - dict: {"country", "rows", "summary", "missing"} plus "paths" when saved
+        """
+        summary = self.get_summary_stats()  # Both tables share one statistics scan
         missing = self.get_missing_report()
-        print(missing)
 
+        if not quiet:
+            print(f"\n📊 Summary Statistics for {self.country}")
+            print(summary)
+            print(f"\n📉 Missing Values Report for {self.country}")
+            print(missing)
+
+        result = {"country": self.country, "rows": self.column_stats().rows(),
+                  "summary": summary, "missing": missing}
         if save:
-            os.makedirs("reports", exist_ok=True)
-            summary.to_csv(f"reports/{self.country}_summary_stats.csv")
-            missing.to_csv(f"reports/{self.country}_missing_report.csv")
-            print(f"\n✅ Reports saved to reports/{self.country}_*.csv")
+            result["paths"] = self.save(summary, missing, output_dir=output_dir, fmt=fmt)
+            if not quiet:
+                print(f"\n✅ Reports saved to {output_dir}/{self.country}_*.{REPORT_FORMATS[fmt]}")
+        return result
+
+    def save(self, summary: pd.DataFrame, missing: pd.DataFrame, output_dir: str = "reports",
+             fmt: str = "csv") -> dict:
+        """
+        Atomically write both report tables.
+
+        Returns:
+        - dict: {"summary": path, "missing": path}
+        """
+        if fmt not in REPORT_FORMATS:
+            raise ValueError(f"❌ Unknown report format: {fmt!r}. Use one of {list(REPORT_FORMATS)}")
+        os.makedirs(output_dir, exist_ok=True)
+        paths = {}
+        for name, table, suffix in (("summary", summary, "summary_stats"), ("missing", missing, "missing_report")):
+            path = os.path.join(output_dir, f"{self.country}_{suffix}.{REPORT_FORMATS[fmt]}")
+            tmp_path = f"{path}.{os.getpid()}.{uuid.uuid4().hex}.tmp"  # Unique per writer, so concurrent runs never collide
+            try:
+                _write_table(table, tmp_path, fmt)
+                os.replace(tmp_path, path)  # Readers never see a partial file
+            except BaseException:
+                if os.path.exists(tmp_path):  # Don't leave a partial temp file behind
+                    os.remove(tmp_path)
+                raise
+            paths[name] = path
+        return paths
+
+    @classmethod
+    def run_many(cls, sources, output_dir: str = "reports", fmt: str = "csv", workers: int = None,
+                 **options) -> dict:
+        """
+        Generate and save reports for several stations, one process per station.
+
+        Each worker loads its own data (path or registry key), writes its
+        reports atomically under `output_dir` and returns only the file
+        paths and row count.
+
+        Parameters:
+        - sources: dict key → DataFrame / CSV path, or a list of registry keys / CSV paths
+        - output_dir (str): Output root (made absolute, so workers agree on it)
+        - fmt (str): "csv", "parquet" or "json"
+        - workers (int): Pool size; defaults to min(#sources, CPU count).
+          With one worker everything runs in-process.
+        - **options: Passed to each SolarReportGenerator (e.g. percentiles="approx")
+
+        Returns:
+        - dict: key → {"rows", "summary", "missing"} (paths)
+        """
+        if fmt not in REPORT_FORMATS:
+            raise ValueError(f"❌ Unknown report format: {fmt!r}. Use one of {list(REPORT_FORMATS)}")
+        output_dir = os.path.abspath(output_dir)
+        results = map_sources(_report_source, sources, workers, (output_dir, fmt, options))
+        for key, summary in results.items():
+            print(f"📋 {key}: {summary['rows']} rows → {summary['summary']}")
+        return results
+
+
+def _write_table(table: pd.DataFrame, path: str, fmt: str):
+    """
+    Write one report table in the requested format.
+    """
+    if fmt == "csv":
+        table.to_csv(path)
+    elif fmt == "parquet":
+        # Mixed columns (e.g. Timestamp: count + timestamps) are stored as text
+        mixed = [col for col in table.columns if table[col].dtype == object]
+        table.astype({col: "string" for col in mixed}).to_parquet(path, engine="pyarrow")
+    else:
+        table.to_json(path, orient="split", date_format="iso", default_handler=str)
+
+
+def _report_source(key: str, source, output_dir: str, fmt: str, options: dict) -> dict:
+    """
+    Process-pool worker: load one station and save its reports.
+    """
+    df = load_source(key, source)
+    reporter = SolarReportGenerator(df, country=key, verbose=False, **options)
+    result = reporter.generate(save=True, quiet=True, output_dir=output_dir, fmt=fmt)
+    return {"rows": result["rows"], **result["paths"]}
@@ -0,0 +1,225 @@
+"""
+rollup.py – Materialized Hourly / Daily / Monthly Rollup Cube
+-------------------------------------------------------------
+
+Pre-aggregated irradiance and temperature metrics per station at three
+grains, stored as one Parquet file per grain:
+
+    <root>/hourly.parquet
+    <root>/daily.parquet
+    <root>/monthly.parquet
+
+Each row is one (station, period) with, per metric:
+- <metric>_mean, <metric>_max, <metric>_count
+- <metric>_energy (Wh/m², irradiance channels only: Σ W/m² · 1 min / 60)
+
+Hourly rows are built from the minute data; daily and monthly rows are
+merged from the hourly ones. Queries pick the coarsest grain whose
+periods line up with the requested window, so a yearly average reads 12
+rows per station instead of ~525,600 minutes.
+
+Usage:
+    cube = RollupCube("data/rollups")
+    cube.build("togo", df_togo)
+    cube.totals(["GHI"])                        # per-station mean/max/energy/count
+    cube.query(["GHI"], stations="togo", start="2022-03-01", end="2022-04-01")
+
+Author: Nabil Mohamed
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+from src.schema import TIMESTAMP_COLUMN  # Shared timestamp column name
+
+ROLLUP_METRICS = ["GHI", "DNI", "DHI", "Tamb", "ModA", "ModB"]  # Materialized channels
+ENERGY_METRICS = ["GHI", "DNI", "DHI", "ModA", "ModB"]  # Irradiance → energy sums make sense
+GRAINS = {"monthly": "MS", "daily": "D", "hourly": "h"}  # Coarsest first
+
+# ------------------------------------------------------------------------------
+# 🧊 RollupCube Class
+# ------------------------------------------------------------------------------
+
+class RollupCube:
+    """
+    Hourly, daily and monthly aggregates of several stations.
+
+    Parameters:
+    ----------
+    root : str
+        Directory holding one Parquet file per grain.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self._tables = {}  # grain → DataFrame (loaded lazily)
+
+    def _path(self, grain: str) -> str:
+        return os.path.join(self.root, f"{grain}.parquet")
+
+    def table(self, grain: str) -> pd.DataFrame:
+        """
+        Full table of one grain (empty frame if nothing was built yet).
+        """
+        if grain not in GRAINS:
+            raise ValueError(f"❌ Unknown grain: {grain!r}. Use one of {list(GRAINS)}")
+        if grain not in self._tables:
+            path = self._path(grain)
+            self._tables[grain] = pd.read_parquet(path) if os.path.exists(path) else pd.DataFrame()
+        return self._tables[grain]
+
+    def stations(self) -> list:
+        """
+        Stations present in the cube.
+        """
+        table = self.table("monthly")
+        return sorted(table["station"].unique()) if not table.empty else []
+
+    # --------------------------------------------------------------------------
+    # 🏗️ Building
+    # --------------------------------------------------------------------------
+
+    @staticmethod
+    def _aggregate(keys: pd.Series, sums: pd.DataFrame, counts: pd.DataFrame,
+                   maxima: pd.DataFrame) -> pd.DataFrame:
+        """
+        Merge finer rows (sum/count/max per metric) into coarser periods.
+        """
+        grouped_sum = sums.groupby(keys.to_numpy()).sum()
+        grouped_count = counts.groupby(keys.to_numpy()).sum()
+        grouped_max = maxima.groupby(keys.to_numpy()).max()
+        out = pd.DataFrame({"period": grouped_sum.index})
+        for metric in sums.columns:
+            count = grouped_count[metric].to_numpy()
+            total = grouped_sum[metric].to_numpy()
+            with np.errstate(divide="ignore", invalid="ignore"):
+                out[f"{metric}_mean"] = np.where(count > 0, total / count, np.nan)
+            out[f"{metric}_max"] = grouped_max[metric].to_numpy()
+            out[f"{metric}_count"] = count.astype("int64")
+            if metric in ENERGY_METRICS:
+                out[f"{metric}_energy"] = total / 60.0  # W/m² · minutes → Wh/m²
+        return out
+
+    @staticmethod
+    def _parts(table: pd.DataFrame, metrics) -> tuple:
+        """
+        Split a rollup table back into sum / count / max frames.
+        """
+        counts = pd.DataFrame({m: table[f"{m}_count"] for m in metrics})
+        sums = pd.DataFrame({m: (table[f"{m}_mean"] * table[f"{m}_count"]).fillna(0.0) for m in metrics})
+        maxima = pd.DataFrame({m: table[f"{m}_max"] for m in metrics})
+        return sums, counts, maxima
+
+    def build(self, station: str, df: pd.DataFrame, metrics=None):
+        """
+        (Re)build all grains of one station from its minute data.
+
+        Rows of other stations are kept; this station's rows are replaced.
+
+        Parameters:
+        - station (str): Station key
+        - df (pd.DataFrame): Minute data with a 'Timestamp' column
+        - metrics (list): Channels to materialize (default: ROLLUP_METRICS present in df)
+        """
+        metrics = [m for m in (metrics or ROLLUP_METRICS) if m in df.columns]
+        times = pd.to_datetime(df[TIMESTAMP_COLUMN])
+        values = df[metrics].apply(pd.to_numeric, errors="coerce").astype("float64")
+
+        # ⏱️ Hourly from minutes, then daily and monthly from hourly
+        hours = times.dt.floor("h")
+        hourly = self._aggregate(hours, values.fillna(0.0), values.notna().astype("int64"), values)
+        tables = {"hourly": hourly}
+        for grain, period in (("daily", "D"), ("monthly", "M")):
+            keys = hourly["period"].dt.to_period(period).dt.to_timestamp()  # Period start
+            tables[grain] = self._aggregate(keys, *self._parts(hourly, metrics))
+
+        os.makedirs(self.root, exist_ok=True)
+        for grain, table in tables.items():
+            table.insert(0, "station", station)
+            existing = self.table(grain)
+            if not existing.empty:
+                existing = existing[existing["station"] != station]
+                table = pd.concat([existing, table], ignore_index=True)
+            path = self._path(grain)
+            table.to_parquet(f"{path}.tmp", index=False)
+            os.replace(f"{path}.tmp", path)
+            self._tables[grain] = table
+        print(f"🧊 Rollups for {station}: {len(tables['hourly'])} hours, "
+              f"{len(tables['daily'])} days, {len(tables['monthly'])} months")
+
+    # --------------------------------------------------------------------------
+    # 🔎 Queries
+    # --------------------------------------------------------------------------
+
+    @staticmethod
+    def _aligned(ts, freq: str) -> bool:
+        if ts is None:
+            return True
+        ts = pd.Timestamp(ts)
+        if freq == "MS":
+            return ts == ts.normalize() and ts.day == 1
+        return ts == ts.floor(freq)
+
+    def grain_for(self, start=None, end=None, freq: str = None) -> str:
+        """
+        Coarsest grain whose periods line up with [start, end).
+
+        freq caps the grain for time series (e.g. "D" → daily or finer).
+        """
+        allowed = list(GRAINS)
+        if freq is not None:
+            order = {"MS": 0, "M": 0, "ME": 0, "D": 1, "h": 2, "H": 2}
+            if freq not in order:
+                raise ValueError(f"❌ Unsupported rollup frequency: {freq!r}")
+            allowed = allowed[order[freq]:]
+        for grain in allowed:
+            if self._aligned(start, GRAINS[grain]) and self._aligned(end, GRAINS[grain]):
+                return grain
+        raise ValueError(f"❌ Window [{start}, {end}) is not aligned to whole hours; use the minute data.")
+
+    def query(self, metrics=None, stations=None, start=None, end=None, grain: str = None,
+              freq: str = None) -> pd.DataFrame:
+        """
+        Rollup rows for a window, from the coarsest sufficient grain.
+
+        Returns:
+        - pd.DataFrame: station, period and the requested metric columns
+        """
+        grain = grain or self.grain_for(start, end, freq)
+        table = self.table(grain)
+        if table.empty:
+            raise KeyError(f"❌ No rollups built under {self.root}")
+        mask = np.ones(len(table), dtype=bool)
+        if stations is not None:
+            mask &= table["station"].isin([stations] if isinstance(stations, str) else stations).to_numpy()
+        if start is not None:
+            mask &= (table["period"] >= pd.Timestamp(start)).to_numpy()
+        if end is not None:
+            mask &= (table["period"] < pd.Timestamp(end)).to_numpy()
+        metrics = metrics or [c[:-5] for c in table.columns if c.endswith("_mean")]
+        cols = ["station", "period"] + [c for c in table.columns
+                                        if c.rsplit("_", 1)[0] in metrics and c not in ("station", "period")]
+        return table.loc[mask, cols].reset_index(drop=True)
+
+    def totals(self, metrics=None, stations=None, start=None, end=None) -> pd.DataFrame:
+        """
+        Per-station mean, max, count (and energy) over a window.
+
+        Returns:
+        - pd.DataFrame: index station, columns (metric, statistic)
+        """
+        rows = self.query(metrics, stations, start, end)
+        metrics = metrics or [c[:-5] for c in rows.columns if c.endswith("_mean")]
+        sums, counts, maxima = self._parts(rows, metrics)
+        by_station = rows["station"].to_numpy()
+        total_sum = sums.groupby(by_station).sum()
+        total_count = counts.groupby(by_station).sum()
+        result = {}
+        for metric in metrics:
+            result[(metric, "mean")] = total_sum[metric] / total_count[metric].where(total_count[metric] > 0)
+            result[(metric, "max")] = maxima[metric].groupby(by_station).max()
+            result[(metric, "count")] = total_count[metric]
+            if f"{metric}_energy" in rows.columns:
+                result[(metric, "energy")] = rows[f"{metric}_energy"].groupby(by_station).sum()
+        return pd.DataFrame(result)
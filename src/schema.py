@@ -0,0 +1,105 @@
+"""
+schema.py – Declared Station Data Schema
+----------------------------------------
+
+Single source of truth for the column layout of the one-minute station
+files (Benin, Togo, Sierra Leone). Loaders use it to:
+- Read sensor channels directly as float32 instead of inferred float64
+- Store the `Cleaning` event flag as a compact unsigned integer
+- Skip columns that are always empty (e.g. `Comments`)
+
+Author: Nabil Mohamed
+"""
+
+import pandas as pd
+
+# ------------------------------------------------------------------------------
+# 🧾 Column declarations
+# ------------------------------------------------------------------------------
+
+TIMESTAMP_COLUMN = "Timestamp"  # Measurement time (one row per minute)
+
+# Fixed layouts seen in station exports and in our own cleaned CSVs, tried in order
+TIMESTAMP_FORMATS = [
+    "%Y-%m-%d %H:%M",       # Raw logger exports (ISO, minute resolution)
+    "%Y-%m-%d %H:%M:%S",    # Cleaned outputs written by DataFrame.to_csv
+    "%Y-%m-%dT%H:%M",
+    "%Y-%m-%dT%H:%M:%S",
+    "%d/%m/%Y %H:%M",       # Day-first exports (regional logger settings)
+    "%d/%m/%Y %H:%M:%S",
+]
+
+# Continuous sensor channels → float32 halves memory versus float64
+SENSOR_COLUMNS = [
+    "GHI", "DNI", "DHI",            # Irradiance components (W/m²)
+    "ModA", "ModB",                 # Module irradiance sensors (W/m²)
+    "Tamb", "TModA", "TModB",       # Ambient and module temperatures (°C)
+    "RH",                           # Relative humidity (%)
+    "WS", "WSgust", "WSstdev",      # Wind speed statistics (m/s)
+    "WD", "WDstdev",                # Wind direction statistics (°)
+    "BP",                           # Barometric pressure (hPa)
+    "Precipitation",                # Rainfall (mm/min)
+]
+
+# Event flags → unsigned 8-bit integers (0 = no event, 1 = event)
+FLAG_COLUMNS = ["Cleaning"]
+
+# Columns that carry no data in the station exports and are skipped on read
+SKIP_COLUMNS = ["Comments"]
+
+# Combined dtype map passed to the loaders
+STATION_DTYPES = {
+    **{col: "float32" for col in SENSOR_COLUMNS},
+    **{col: "uint8" for col in FLAG_COLUMNS},
+}
+
+# ------------------------------------------------------------------------------
+# 🔧 Schema helpers
+# ------------------------------------------------------------------------------
+
+def read_dtypes(dtypes: dict) -> dict:
+    """
+    Return the subset of a dtype map that is safe to hand to `pd.read_csv`.
+
+    Integer flags cannot hold NaN, so they are parsed as float32 and only
+    narrowed afterwards by `apply_schema` when the column is complete.
+
+    Parameters:
+    - dtypes (dict): Column → dtype mapping (e.g. STATION_DTYPES)
+
+    Returns:
+    - dict: Column → dtype mapping for the CSV parser
+    """
+    parse_types = {}
+    for col, dtype in dtypes.items():
+        if pd.api.types.is_integer_dtype(dtype) or pd.api.types.is_bool_dtype(dtype):
+            parse_types[col] = "float32"  # Parse as float so missing flags survive
+        else:
+            parse_types[col] = dtype
+    return parse_types
+
+
+def apply_schema(df: pd.DataFrame, dtypes: dict, drop_empty: bool = False) -> pd.DataFrame:
+    """
+    Narrow freshly parsed columns to their declared dtypes.
+
+    Parameters:
+    - df (pd.DataFrame): Frame parsed with `read_dtypes(dtypes)`
+    - dtypes (dict): Declared column → dtype mapping
+    - drop_empty (bool): Drop columns that contain no values at all
+
+    Returns:
+    - pd.DataFrame: Same frame with declared dtypes applied where lossless
+    """
+    for col, dtype in dtypes.items():
+        if col not in df.columns or df[col].dtype == dtype:
+            continue
+        if df[col].isna().any():
+            continue  # Keep float32 so missing flag values are preserved
+        df[col] = df[col].astype(dtype)
+
+    if drop_empty:
+        empty = [col for col in df.columns if df[col].isna().all()]
+        if empty:
+            df = df.drop(columns=empty)
+    return df
@@ -0,0 +1,261 @@
+"""
+stations.py – Station Registry & Multi-Station Loader
+-----------------------------------------------------
+
+One place to describe every measurement site (name, raw file, timezone)
+and one generic loader for all of them:
+- `STATION_REGISTRY` / `register_station` replace per-country modules
+- `StationDataLoader` parses with the shared schema and only sorts when
+  the timestamps are not already in order (O(n) monotonic check)
+- `load_many` loads several stations concurrently in a process pool, using
+  the `map_sources` fan-out shared with the batch cleaner and reporter
+
+Usage:
+    from src.stations import load_many
+
+    frames = load_many(["benin", "togo", "sierra_leone"], workers=3)
+
+Author: Nabil Mohamed
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+from src.loader import BaseCSVLoader  # General-purpose CSV loader
+from src.schema import STATION_DTYPES, SKIP_COLUMNS, TIMESTAMP_COLUMN  # Shared schema
+
+# ------------------------------------------------------------------------------
+# 🗺️ Station Definition & Registry
+# ------------------------------------------------------------------------------
+
+class Station:
+    """
+    Static description of a measurement site.
+
+    Parameters:
+    ----------
+    key : str
+        Short registry identifier (e.g. "benin").
+    name : str
+        Human-readable label used in diagnostics and reports.
+    path : str
+        Path to the station's raw CSV export.
+    timezone : str
+        IANA timezone of the logger clock (e.g. "Africa/Lome").
+    """
+
+    def __init__(self, key: str, name: str, path: str, timezone: str = "UTC"):
+        self.key = key
+        self.name = name
+        self.path = path
+        self.timezone = timezone
+
+    def __repr__(self):
+        return f"Station(key={self.key!r}, name={self.name!r}, path={self.path!r}, timezone={self.timezone!r})"
+
+
+STATION_REGISTRY = {}  # key → Station
+
+
+def register_station(key: str, name: str, path: str, timezone: str = "UTC") -> Station:
+    """
+    Add (or replace) a site in the registry and return its definition.
+    """
+    station = Station(key, name, path, timezone)
+    STATION_REGISTRY[key] = station
+    return station
+
+
+def get_station(station) -> Station:
+    """
+    Resolve a registry key or pass a Station instance straight through.
+    """
+    if isinstance(station, Station):
+        return station
+    try:
+        return STATION_REGISTRY[station]
+    except KeyError:
+        raise KeyError(f"❌ Unknown station: {station!r}. Registered: {sorted(STATION_REGISTRY)}") from None
+
+
+# 🌍 Sites covered by the challenge data
+register_station("benin", "Benin", "src/Benin/benin-malanville.csv", "Africa/Porto-Novo")
+register_station("togo", "Togo", "src/Togo/togo-dapaong_qc.csv", "Africa/Lome")
+register_station("sierra_leone", "Sierra Leone", "src/Sierra_Leone/sierraleone-bumbuna.csv", "Africa/Freetown")
+
+# ------------------------------------------------------------------------------
+# 📂 Generic Station Loader
+# ------------------------------------------------------------------------------
+
+class StationDataLoader:
+    """
+    Loads any station file with the shared schema and chronological order.
+
+    Builds on top of BaseCSVLoader:
+    - Parses 'Timestamp' and applies the declared station dtypes
+    - Detects encoding once and optionally serves from the Parquet cache
+    - Sorts chronologically only when the file is out of order
+    - Optionally localizes timestamps to the station timezone
+
+    Example:
+    >>> loader = StationDataLoader("data/togo_clean.csv", name="Togo")
+    >>> df_togo = loader.load()
+    """
+
+    def __init__(self, path: str, name: str = "Station", timezone: str = None,
+                 cache_dir: str = None, localize: bool = False, verbose: bool = True):
+        """
+        Parameters:
+        ----------
+        path : str
+            Path to the station CSV file.
+        name : str
+            Label used in diagnostics.
+        timezone : str, optional
+            Station timezone, required when `localize` is True.
+        cache_dir : str, optional
+            Directory for the Parquet load cache (disabled when None).
+        localize : bool
+            Attach `timezone` to the parsed timestamps.
+        verbose : bool
+            Print load diagnostics.
+        """
+        self.path = path
+        self.name = name
+        self.timezone = timezone
+        self.cache_dir = cache_dir
+        self.localize = localize
+        self.verbose = verbose
+        self.df = None  # Placeholder for the loaded DataFrame
+
+    @classmethod
+    def from_station(cls, station, **kwargs):
+        """
+        Build a loader from a registry key or Station definition.
+        """
+        station = get_station(station)
+        return cls(station.path, name=station.name, timezone=station.timezone, **kwargs)
+
+    def load(self) -> pd.DataFrame:
+        """
+        Load the CSV, ensure chronological order, and print diagnostics.
+
+        Returns:
+        --------
+        pd.DataFrame
+            Chronologically ordered station dataset.
+        """
+        # ✅ Shared CSV loader with schema, encoding detection and cache
+        loader = BaseCSVLoader(path=self.path, parse_dates=[TIMESTAMP_COLUMN], verbose=False,
+                               dtype=STATION_DTYPES, skip_columns=SKIP_COLUMNS,
+                               drop_empty=True, cache_dir=self.cache_dir)
+        df = loader.load()
+
+        # 📊 Logger exports are normally in order → O(n) check before an O(n log n) sort
+        if not df[TIMESTAMP_COLUMN].is_monotonic_increasing:
+            df = df.sort_values(TIMESTAMP_COLUMN, kind="stable").reset_index(drop=True)
+
+        # 🕒 Attach the station timezone if requested
+        if self.localize and self.timezone:
+            df[TIMESTAMP_COLUMN] = df[TIMESTAMP_COLUMN].dt.tz_localize(self.timezone)
+
+        # 💬 Diagnostics
+        if self.verbose:
+            print(f"📍 {self.name} Data Loaded from: {self.path}")
+            print(f"🔢 Shape: {df.shape}")
+            print(f"🧪 Columns: {df.columns.tolist()}")
+
+        self.df = df
+        return df
+
+# ------------------------------------------------------------------------------
+# 🚀 Parallel Multi-Station Jobs
+# ------------------------------------------------------------------------------
+
+def source_key(source) -> str:
+    """
+    Key of a source: the registry key itself, or the file name without extension.
+    """
+    if isinstance(source, Station):
+        return source.key
+    return source if source in STATION_REGISTRY else os.path.splitext(os.path.basename(source))[0]
+
+
+def load_source(key: str, source, **kwargs) -> pd.DataFrame:
+    """
+    Load one source quietly: a DataFrame is returned as is, a registry key
+    or Station uses its registered file, anything else is a CSV path.
+    """
+    if isinstance(source, pd.DataFrame):
+        return source
+    if isinstance(source, Station) or source in STATION_REGISTRY:
+        return StationDataLoader.from_station(source, verbose=False, **kwargs).load()
+    return StationDataLoader(source, name=key, verbose=False, **kwargs).load()
+
+
+def map_sources(fn, sources, workers: int = None, args: tuple = ()) -> dict:
+    """
+    Run `fn(key, source, *args)` for every source, one process per source.
+
+    Parameters:
+    - fn: Module-level (picklable) worker function
+    - sources: dict key → source, or a list of registry keys / Stations / CSV paths
+    - workers (int): Pool size; defaults to min(#sources, CPU count).
+      With one worker everything runs in-process.
+    - args (tuple): Extra positional arguments passed to every call
+
+    Returns:
+    - dict: key → result of `fn`, in source order
+
+    Raises:
+    - ValueError: If two listed sources share a key (e.g. same file name)
+    """
+    if not isinstance(sources, dict):
+        keyed = {}
+        for src in sources:
+            key = source_key(src)
+            if key in keyed:
+                raise ValueError(f"❌ Duplicate source key {key!r}: {keyed[key]!r} and {src!r}. "
+                                 "Pass a dict to name them explicitly.")
+            keyed[key] = src
+        sources = keyed
+    if not sources:
+        return {}
+    workers = workers or min(len(sources), os.cpu_count() or 1)
+
+    if workers == 1:
+        return {key: fn(key, src, *args) for key, src in sources.items()}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {key: pool.submit(fn, key, src, *args) for key, src in sources.items()}
+        return {key: future.result() for key, future in futures.items()}
+
+
+def _load_station(key: str, station: Station, cache_dir: str, localize: bool) -> pd.DataFrame:
+    """
+    Process-pool worker: load one station quietly.
+    """
+    return load_source(key, station, cache_dir=cache_dir, localize=localize)
+
+
+def load_many(stations, workers: int = None, cache_dir: str = None,
+              localize: bool = False) -> dict:
+    """
+    Load several stations concurrently, one process per station.
+
+    Parameters:
+    - stations (list): Registry keys and/or Station objects
+    - workers (int): Pool size; defaults to min(#stations, CPU count).
+      With one worker the stations are loaded in-process.
+    - cache_dir (str): Optional Parquet cache shared by all workers
+    - localize (bool): Attach each station's timezone to its timestamps
+
+    Returns:
+    - dict: station key → chronologically ordered DataFrame
+    """
+    resolved = [get_station(s) for s in stations]
+    frames = map_sources(_load_station, {s.key: s for s in resolved}, workers, (cache_dir, localize))
+
+    for station in resolved:
+        print(f"📍 {station.name}: {frames[station.key].shape[0]} rows loaded")
+    return frames
@@ -0,0 +1,478 @@
+"""
+stats.py – Shared Column Statistics
+-----------------------------------
+
+One object holding the per-column statistics that the cleaner and the
+reporter both need, computed in a single scan per column:
+- count / null count
+- mean and M2 (sum of squared deviations) → variance and std
+- min / max
+- median and quartiles
+
+Moments are stored in mergeable form (Chan et al. parallel update), so
+statistics of separate chunks or appended rows can be combined without
+rescanning. Exact quantiles do not merge; entries built with a
+`QuantileSketch` keep approximate, mergeable quantiles instead. The object
+is JSON-serializable and is persisted next to the cleaned data
+(`<name>.stats.json`) for reuse by later runs.
+
+Usage:
+    stats = ColumnStats.from_frame(df)
+    stats.describe()          # same layout as df.describe()
+    stats.save(stats_path_for("data/togo_clean.csv"))
+
+Author: Nabil Mohamed
+"""
+
+import os
+import json
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_QUANTILES = (0.25, 0.5, 0.75)  # Percentiles reported by describe()
+DEFAULT_SKETCH_SIZE = 4096  # Items per sketch level (rank error ≈ 0.1% at 10⁷ values)
+
+
+def stats_path_for(data_path: str) -> str:
+    """
+    Sidecar path for the statistics of a data file (foo.csv → foo.stats.json).
+    """
+    root, _ = os.path.splitext(data_path)
+    return f"{root}.stats.json"
+
+# ------------------------------------------------------------------------------
+# 🎯 QuantileSketch Class
+# ------------------------------------------------------------------------------
+
+class QuantileSketch:
+    """
+    Mergeable approximate quantile summary (a deterministic KLL-style sketch).
+
+    Values live in levels; an item on level i stands for 2**i input values.
+    When a level holds more than `k` items it is sorted and every other item
+    is promoted to the next level, so memory is O(k · log(n / k)) and the
+    rank error shrinks roughly as 1 / k. Compaction alternates between even
+    and odd offsets to keep the error unbiased. All work is vectorized.
+
+    Parameters:
+    ----------
+    k : int
+        Capacity of each level before it is compacted.
+    """
+
+    def __init__(self, k: int = DEFAULT_SKETCH_SIZE):
+        self.k = k
+        self.levels = [np.empty(0)]  # levels[i] holds items of weight 2**i
+        self._offset = 0  # Alternating compaction offset
+
+    def update(self, values):
+        """
+        Add a batch of values (NaN values are ignored).
+        """
+        values = np.asarray(values, dtype="float64").ravel()
+        values = values[~np.isnan(values)]
+        if values.size:
+            self.levels[0] = np.concatenate([self.levels[0], values])
+            self._compress()
+        return self
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        """
+        Return a new sketch summarizing both inputs.
+        """
+        merged = QuantileSketch(max(self.k, other.k))
+        depth = max(len(self.levels), len(other.levels))
+        merged.levels = [
+            np.concatenate([
+                self.levels[i] if i < len(self.levels) else np.empty(0),
+                other.levels[i] if i < len(other.levels) else np.empty(0),
+            ])
+            for i in range(depth)
+        ]
+        merged._offset = self._offset ^ other._offset
+        merged._compress()
+        return merged
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if items.size > self.k:
+                items = np.sort(items)
+                if items.size % 2:  # Keep one item back so pairs stay aligned
+                    keep, items = items[-1:], items[:-1]
+                else:
+                    keep = np.empty(0)
+                promoted = items[self._offset::2]
+                self._offset ^= 1
+                self.levels[level] = keep
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            level += 1
+
+    def count(self) -> int:
+        """
+        Total weight (number of values summarized).
+        """
+        return int(sum(items.size << i for i, items in enumerate(self.levels)))
+
+    def quantiles(self, qs) -> np.ndarray:
+        """
+        Approximate values at the requested quantile levels.
+        """
+        qs = np.atleast_1d(np.asarray(qs, dtype="float64"))
+        values = np.concatenate(self.levels)
+        if values.size == 0:
+            return np.full(qs.shape, np.nan)
+        weights = np.concatenate([np.full(items.size, 2.0 ** i) for i, items in enumerate(self.levels)])
+        order = np.argsort(values, kind="stable")
+        values, cumulative = values[order], np.cumsum(weights[order])
+        targets = qs * cumulative[-1]
+        idx = np.searchsorted(cumulative, targets, side="left")
+        return values[np.clip(idx, 0, values.size - 1)]
+
+    def to_dict(self) -> dict:
+        return {"k": self.k, "offset": self._offset, "levels": [items.tolist() for items in self.levels]}
+
+    @classmethod
+    def from_dict(cls, payload: dict) -> "QuantileSketch":
+        sketch = cls(payload["k"])
+        sketch.levels = [np.asarray(items, dtype="float64") for items in payload["levels"]]
+        sketch._offset = payload.get("offset", 0)
+        return sketch
+
+def _sketched_timestamps(sketch: QuantileSketch, levels) -> list:
+    """
+    Quantiles of a sketch over int64 nanoseconds, as whole microseconds.
+
+    float64 keeps only ~256 ns of precision at present-day epoch values, so
+    the estimates are rounded back to a clean timestamp resolution.
+    """
+    return [int(round(v / 1_000)) * 1_000 for v in sketch.quantiles(levels)]
+
+
+# ------------------------------------------------------------------------------
+# 📐 ColumnStats Class
+# ------------------------------------------------------------------------------
+
+class ColumnStats:
+    """
+    Per-column summary statistics of a dataset.
+
+    Each column entry is a dict with:
+    - kind: "numeric", "datetime" (values as int64 nanoseconds) or "other"
+    - count, null_count
+    - mean, m2, min, max (numeric/datetime only)
+    - quantiles: {"0.5": value, ...}; exact for a single scan (approximate
+      when built with exact_quantiles=False), approximate after merging
+      entries that carry a sketch, otherwise None once merged
+    - sketch: QuantileSketch (only when built with sketch_size)
+    """
+
+    def __init__(self, columns: dict = None):
+        self.columns = columns or {}
+
+    # --------------------------------------------------------------------------
+    # 🧮 Construction
+    # --------------------------------------------------------------------------
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, columns=None, quantiles=DEFAULT_QUANTILES,
+                   sketch_size: int = None, exact_quantiles: bool = True):
+        """
+        Scan a DataFrame once per column and collect its statistics.
+
+        Counts, nulls, moments, extremes and exact quantiles of a numeric
+        column come from one fused scan around a single multi-point
+        selection (np.partition), instead of separate sort/median/isna passes.
+
+        Parameters:
+        - df (pd.DataFrame): Input data
+        - columns (list): Columns to include (default: all)
+        - quantiles (tuple): Quantile levels to keep besides the median
+        - sketch_size (int): Attach a QuantileSketch of this size to numeric
+          and datetime columns so quantiles survive merging (approximately)
+        - exact_quantiles (bool): If False, quantiles are read from
+          the sketch (default size when sketch_size is None) instead of the
+          exact selection
+        """
+        if not exact_quantiles:
+            sketch_size = sketch_size or DEFAULT_SKETCH_SIZE
+        entries = {}
+        for col in columns or df.columns:
+            series = df[col]
+            if pd.api.types.is_datetime64_any_dtype(series):
+                entries[col] = cls._datetime_entry(series, quantiles, sketch_size, exact_quantiles)
+            elif pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+                sketch = QuantileSketch(sketch_size).update(series.to_numpy()) if sketch_size else None
+                entries[col] = cls._numeric_entry(series.to_numpy(), quantiles,
+                                                  sketch=None if exact_quantiles else sketch)
+                if sketch is not None:
+                    entries[col]["sketch"] = sketch
+            else:
+                nulls = int(series.isna().sum())
+                entries[col] = {"kind": "other", "count": len(series) - nulls, "null_count": nulls}
+        return cls(entries)
+
+    @staticmethod
+    def _numeric_entry(values: np.ndarray, quantiles, sketch: QuantileSketch = None) -> dict:
+        if np.issubdtype(values.dtype, np.floating):
+            present = values[~np.isnan(values)]
+        else:
+            present = values
+        entry = {"kind": "numeric", "count": int(present.size), "null_count": int(values.size - present.size)}
+        if present.size == 0:
+            entry.update({"mean": None, "m2": 0.0, "min": None, "max": None, "quantiles": None})
+            return entry
+
+        levels = sorted(set(quantiles) | {0.5})
+        if sketch is not None:  # Approximate quantiles, no selection pass
+            mean = float(present.mean(dtype="float64"))
+            deviations = present.astype("float64") - mean
+            entry.update({
+                "mean": mean,
+                "m2": float(np.dot(deviations, deviations)),
+                "min": float(present.min()),
+                "max": float(present.max()),
+                "quantiles": {str(q): float(v) for q, v in zip(levels, sketch.quantiles(levels))},
+            })
+            return entry
+
+        if present is values:
+            present = values.copy()  # Partitioned in place below
+        n = present.size
+        positions = np.array(levels) * (n - 1)  # Linear interpolation points (numpy's default)
+        lower = np.floor(positions).astype(np.int64)
+        upper = np.minimum(lower + 1, n - 1)
+        present.partition(np.unique(np.concatenate([[0, n - 1], lower, upper])))  # One selection pass
+
+        mean = float(present.mean(dtype="float64"))
+        deviations = present.astype("float64") - mean
+        low, high = present[lower].astype("float64"), present[upper].astype("float64")
+        values_at = low + (high - low) * (positions - lower)
+        entry.update({
+            "mean": mean,
+            "m2": float(np.dot(deviations, deviations)),
+            "min": float(present[0]),
+            "max": float(present[n - 1]),
+            "quantiles": {str(q): float(v) for q, v in zip(levels, values_at)},
+        })
+        return entry
+
+    @staticmethod
+    def _datetime_entry(series: pd.Series, quantiles, sketch_size: int = None,
+                        exact_quantiles: bool = True) -> dict:
+        present = series.dropna()
+        entry = {"kind": "datetime", "count": int(present.size), "null_count": int(series.size - present.size)}
+        sketch = None
+        if sketch_size:  # Sketch the int64 nanoseconds like any numeric column
+            sketch = QuantileSketch(sketch_size).update(present.dt.as_unit("ns").array.asi8.astype("float64"))
+            entry["sketch"] = sketch
+        if present.empty:
+            entry.update({"mean": None, "m2": 0.0, "min": None, "max": None, "quantiles": None})
+            return entry
+        levels = sorted(set(quantiles) | {0.5})
+        if sketch is not None and not exact_quantiles:
+            values = _sketched_timestamps(sketch, levels)
+        else:
+            values = [v.value for v in present.quantile(levels)]
+        entry.update({
+            "mean": present.mean().value,
+            "m2": 0.0,  # Spread of timestamps is not reported
+            "min": present.min().value,
+            "max": present.max().value,
+            "quantiles": {str(q): v for q, v in zip(levels, values)},
+        })
+        return entry
+
+    # --------------------------------------------------------------------------
+    # 🔗 Merging
+    # --------------------------------------------------------------------------
+
+    def merge(self, other: "ColumnStats") -> "ColumnStats":
+        """
+        Combine with statistics of disjoint rows (e.g. another chunk).
+
+        Counts, moments and extrema merge exactly. Quantiles are re-estimated
+        from the merged sketches when both sides carry one, else dropped.
+        """
+        merged = {}
+        for col in list(self.columns) + [c for c in other.columns if c not in self.columns]:
+            a, b = self.columns.get(col), other.columns.get(col)
+            if a is None or b is None:
+                merged[col] = dict(a or b)
+                continue
+            merged[col] = self._merge_entries(a, b)
+        return ColumnStats(merged)
+
+    @staticmethod
+    def _merge_entries(a: dict, b: dict) -> dict:
+        entry = {"kind": a["kind"], "count": a["count"] + b["count"], "null_count": a["null_count"] + b["null_count"]}
+        if a["kind"] == "other":
+            return entry
+        if not b["count"] or not a["count"]:
+            source = a if a["count"] else b
+            entry.update({k: source[k] for k in ("mean", "m2", "min", "max")})
+        else:
+            n_a, n_b = a["count"], b["count"]
+            n = n_a + n_b
+            delta = b["mean"] - a["mean"]
+            entry.update({
+                "mean": a["mean"] + delta * n_b / n,
+                "m2": a["m2"] + b["m2"] + delta * delta * n_a * n_b / n,
+                "min": min(a["min"], b["min"]),
+                "max": max(a["max"], b["max"]),
+            })
+
+        entry["quantiles"] = None
+        if "sketch" in a and "sketch" in b:
+            entry["sketch"] = a["sketch"].merge(b["sketch"])
+            levels = set(a.get("quantiles") or {}) | set(b.get("quantiles") or {})
+            levels = sorted(levels or {str(q) for q in DEFAULT_QUANTILES}, key=float)
+            if entry["count"]:
+                if a["kind"] == "datetime":
+                    values = _sketched_timestamps(entry["sketch"], [float(q) for q in levels])
+                else:
+                    values = [float(v) for v in entry["sketch"].quantiles([float(q) for q in levels])]
+                entry["quantiles"] = dict(zip(levels, values))
+        return entry
+
+    # --------------------------------------------------------------------------
+    # 🔎 Accessors
+    # --------------------------------------------------------------------------
+
+    def has(self, columns, kind: str = "numeric") -> bool:
+        """
+        Whether every column is present with the given kind and a median.
+        """
+        for col in columns:
+            entry = self.columns.get(col)
+            if entry is None or entry["kind"] != kind:
+                return False
+            if entry["count"] and not entry.get("quantiles"):
+                return False
+        return True
+
+    def rows(self) -> int:
+        """
+        Number of rows the statistics describe.
+        """
+        entry = next(iter(self.columns.values()), None)
+        return entry["count"] + entry["null_count"] if entry else 0
+
+    def mean(self, col: str) -> float:
+        return self.columns[col]["mean"]
+
+    def var(self, col: str, ddof: int = 1) -> float:
+        entry = self.columns[col]
+        return entry["m2"] / (entry["count"] - ddof) if entry["count"] > ddof else np.nan
+
+    def std(self, col: str, ddof: int = 1) -> float:
+        return float(np.sqrt(self.var(col, ddof)))
+
+    def quantile(self, col: str, q: float) -> float:
+        quantiles = self.columns[col].get("quantiles") or {}
+        return quantiles.get(str(q), np.nan)
+
+    def median(self, col: str) -> float:
+        return self.quantile(col, 0.5)
+
+    def filled_moments(self, col: str):
+        """
+        Mean and population std (ddof=0) after filling nulls with the median.
+
+        These are the moments scipy's zscore sees in SolarDataCleaner.
+        """
+        entry = self.columns[col]
+        n, k, median = entry["count"], entry["null_count"], self.median(col)
+        if n == 0:
+            return np.nan, np.nan
+        total = n + k
+        delta = median - entry["mean"]
+        mean = entry["mean"] + delta * k / total
+        m2 = entry["m2"] + delta * delta * n * k / total
+        return mean, float(np.sqrt(m2 / total))
+
+    # --------------------------------------------------------------------------
+    # 📋 Report views
+    # --------------------------------------------------------------------------
+
+    def describe(self) -> pd.DataFrame:
+        """
+        Summary table in the layout of `DataFrame.describe()`.
+
+        As in pandas, `std` is the last row when datetime columns are
+        present (count, mean, min, percentiles, max, std) and the third
+        row otherwise.
+        """
+        levels = sorted({float(q) for e in self.columns.values() for q in (e.get("quantiles") or {})})
+        index = ["count", "mean", "std", "min"] + [f"{q * 100:g}%" for q in levels] + ["max"]
+        has_datetime = any(e["kind"] == "datetime" for e in self.columns.values())
+        table = {}
+        for col, entry in self.columns.items():
+            if entry["kind"] == "other":
+                continue
+            quantiles = entry.get("quantiles") or {}
+            values = [entry["count"], entry["mean"], self.std(col) if entry["kind"] == "numeric" else None,
+                      entry["min"]] + [quantiles.get(str(q)) for q in levels] + [entry["max"]]
+            if entry["kind"] == "datetime":
+                values = [values[0]] + [pd.Timestamp(v) if v is not None else pd.NaT for v in values[1:]]
+                values[2] = np.nan
+            else:
+                values = [np.nan if v is None else v for v in values]
+            table[col] = values
+        table = pd.DataFrame(table, index=index)
+        if has_datetime:
+            table = table.reindex([row for row in index if row != "std"] + ["std"])
+        return table
+
+    def missing_report(self) -> pd.DataFrame:
+        """
+        Missing count and percentage per column.
+        """
+        missing = pd.DataFrame(
+            {"Missing Count": [e["null_count"] for e in self.columns.values()]},
+            index=list(self.columns),
+        )
+        rows = self.rows()
+        missing["Percent Missing"] = (missing["Missing Count"] / rows) * 100 if rows else 0.0
+        return missing
+
+    # --------------------------------------------------------------------------
+    # 💾 Persistence
+    # --------------------------------------------------------------------------
+
+    def to_dict(self) -> dict:
+        columns = {}
+        for col, entry in self.columns.items():
+            entry = dict(entry)
+            if "sketch" in entry:
+                entry["sketch"] = entry["sketch"].to_dict()
+            columns[col] = entry
+        return {"columns": columns}
+
+    @classmethod
+    def from_dict(cls, payload: dict) -> "ColumnStats":
+        columns = {}
+        for col, entry in payload["columns"].items():
+            entry = dict(entry)
+            if "sketch" in entry:
+                entry["sketch"] = QuantileSketch.from_dict(entry["sketch"])
+            columns[col] = entry
+        return cls(columns)
+
+    def save(self, path: str):
+        """
+        Atomically write the statistics as JSON.
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(f"{path}.tmp", "w", encoding="utf-8") as fh:
+            json.dump(self.to_dict(), fh, indent=2)
+        os.replace(f"{path}.tmp", path)
+
+    @classmethod
+    def load(cls, path: str) -> "ColumnStats":
+        with open(path, "r", encoding="utf-8") as fh:
+            return cls.from_dict(json.load(fh))
@@ -0,0 +1,289 @@
+"""
+store.py – Memory-Mapped Minute-Grid Store
+------------------------------------------
+
+Binary storage for the dense one-minute station data. Each channel of each
+station-year is one flat file on disk, indexed by the minute offset from
+January 1st 00:00 of that year:
+
+    <root>/<station>/<year>/meta.json
+    <root>/<station>/<year>/<channel>.bin
+
+Files are opened with `numpy.memmap`, so:
+- Reading any time range of a channel is an O(1) offset computation and a
+  zero-copy slice (ranges spanning several years are concatenated)
+- Writes can be streamed chunk by chunk (e.g. from BaseCSVLoader.iter_chunks)
+- Missing minutes are NaN for float channels and 0 for integer flags
+
+Usage:
+    store = MinuteGridStore("data/grid")
+    store.write("togo", df)
+    ghi = store.read("togo", "GHI", start="2022-03-01", end="2022-04-01")
+
+Author: Nabil Mohamed
+"""
+
+import os
+import json
+
+import numpy as np
+import pandas as pd
+from src.schema import TIMESTAMP_COLUMN  # Shared timestamp column name
+
+MINUTE = pd.Timedelta(minutes=1)  # Grid cadence
+
+# ------------------------------------------------------------------------------
+# 🗄️ MinuteGridStore Class
+# ------------------------------------------------------------------------------
+
+class MinuteGridStore:
+    """
+    Per-channel, per-station-year memory-mapped arrays on a fixed minute grid.
+
+    Parameters:
+    ----------
+    root : str
+        Directory holding one sub-directory per station.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self._maps = {}  # (station, year, channel, mode) → open memmap
+
+    # --------------------------------------------------------------------------
+    # 📐 Grid geometry
+    # --------------------------------------------------------------------------
+
+    @staticmethod
+    def year_start(year: int) -> pd.Timestamp:
+        """
+        First minute of a calendar year.
+        """
+        return pd.Timestamp(year=year, month=1, day=1)
+
+    @staticmethod
+    def minutes_in_year(year: int) -> int:
+        """
+        Number of grid slots in a year (527,040 in leap years, else 525,600).
+        """
+        return 366 * 1440 if pd.Timestamp(year=year, month=1, day=1).is_leap_year else 365 * 1440
+
+    def _year_dir(self, station: str, year: int) -> str:
+        return os.path.join(self.root, station, str(year))
+
+    # --------------------------------------------------------------------------
+    # 🧾 Metadata
+    # --------------------------------------------------------------------------
+
+    def years(self, station: str) -> list:
+        """
+        Years stored for a station, ascending.
+        """
+        station_dir = os.path.join(self.root, station)
+        if not os.path.isdir(station_dir):
+            return []
+        return sorted(int(name) for name in os.listdir(station_dir) if name.isdigit())
+
+    def meta(self, station: str, year: int) -> dict:
+        """
+        Metadata (channels and dtypes) of one station-year, or {} if absent.
+        """
+        path = os.path.join(self._year_dir(station, year), "meta.json")
+        if not os.path.exists(path):
+            return {}
+        with open(path, "r", encoding="utf-8") as fh:
+            return json.load(fh)
+
+    def channels(self, station: str) -> list:
+        """
+        Channels available for a station (union over its years).
+        """
+        found = []
+        for year in self.years(station):
+            for channel in self.meta(station, year).get("channels", {}):
+                if channel not in found:
+                    found.append(channel)
+        return found
+
+    def _write_meta(self, station: str, year: int, channels: dict):
+        meta = self.meta(station, year)
+        meta.update({
+            "station": station,
+            "year": year,
+            "start": str(self.year_start(year)),
+            "minutes": self.minutes_in_year(year),
+            "freq": "1min",
+        })
+        meta.setdefault("channels", {}).update(channels)
+        path = os.path.join(self._year_dir(station, year), "meta.json")
+        with open(f"{path}.tmp", "w", encoding="utf-8") as fh:
+            json.dump(meta, fh, indent=2)
+        os.replace(f"{path}.tmp", path)
+
+    # --------------------------------------------------------------------------
+    # 💾 Memory maps
+    # --------------------------------------------------------------------------
+
+    def _open(self, station: str, year: int, channel: str, dtype=None, mode: str = "r"):
+        """
+        Open (and memoize) the memmap of one channel-year.
+
+        In write mode a missing file is created and pre-filled with the
+        channel's missing-value marker.
+        """
+        key = (station, year, channel, mode)
+        if key in self._maps:
+            return self._maps[key]
+
+        path = os.path.join(self._year_dir(station, year), f"{channel}.bin")
+        if dtype is None:
+            dtype = self.meta(station, year).get("channels", {}).get(channel)
+            if dtype is None:
+                raise KeyError(f"❌ Channel {channel!r} not stored for {station} {year}")
+        shape = (self.minutes_in_year(year),)
+
+        if mode == "r+" and not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            array = np.memmap(path, dtype=dtype, mode="w+", shape=shape)
+            array[:] = self._fill_value(dtype)
+        else:
+            array = np.memmap(path, dtype=dtype, mode=mode, shape=shape)
+
+        self._maps[key] = array
+        return array
+
+    @staticmethod
+    def _fill_value(dtype):
+        return np.nan if np.issubdtype(np.dtype(dtype), np.floating) else 0
+
+    def flush(self):
+        """
+        Flush pending writes and release all open maps.
+        """
+        for array in self._maps.values():
+            if array.mode != "r":
+                array.flush()
+        self._maps.clear()
+
+    # --------------------------------------------------------------------------
+    # ✍️ Writing
+    # --------------------------------------------------------------------------
+
+    def write(self, station: str, df: pd.DataFrame, channels=None):
+        """
+        Place rows of a frame (or chunk) onto the station's minute grid.
+
+        Timestamps are floored to the minute; later rows win on duplicates.
+        Can be called repeatedly, e.g. once per chunk of a streamed file.
+        A channel keeps the dtype of its first write; later chunks are cast
+        to it and rejected if the cast would lose values.
+
+        Parameters:
+        - station (str): Station key (directory name)
+        - df (pd.DataFrame): Frame with a 'Timestamp' column
+        - channels (list): Numeric columns to store (default: all numeric)
+        """
+        if channels is None:
+            channels = [col for col in df.columns
+                        if col != TIMESTAMP_COLUMN and pd.api.types.is_numeric_dtype(df[col])]
+
+        times = pd.to_datetime(df[TIMESTAMP_COLUMN]).dt.floor("min")
+        years = times.dt.year.to_numpy()
+
+        for year in np.unique(years):
+            year = int(year)
+            in_year = years == year
+            offsets = ((times[in_year] - self.year_start(year)) // MINUTE).to_numpy()
+
+            stored = self.meta(station, year).get("channels", {})
+            dtypes = {channel: np.dtype(stored.get(channel, df[channel].dtype))  # First write fixes the dtype
+                      for channel in channels}
+            values = {channel: self._cast(df[channel].to_numpy()[in_year], dtype, channel)  # Validate before writing
+                      for channel, dtype in dtypes.items()}
+            for channel, dtype in dtypes.items():
+                array = self._open(station, year, channel, dtype=dtype, mode="r+")
+                array[offsets] = values[channel]
+            self._write_meta(station, year, {channel: str(dtype) for channel, dtype in dtypes.items()})
+
+        self.flush()
+        print(f"🗄️ Stored {len(df)} rows × {len(channels)} channels for {station}")
+
+    @staticmethod
+    def _cast(values: np.ndarray, dtype, channel: str) -> np.ndarray:
+        """
+        Cast chunk values to a channel's stored dtype, refusing lossy casts.
+
+        Float targets accept precision rounding but not overflow; integer
+        targets accept only finite whole numbers within range (no NaN).
+        """
+        dtype = np.dtype(dtype)
+        if values.dtype == dtype:
+            return values
+        with np.errstate(invalid="ignore", over="ignore"):
+            cast = values.astype(dtype)
+            if np.issubdtype(dtype, np.floating):
+                lossy = np.isfinite(values) & ~np.isfinite(cast)
+            else:
+                lossy = cast.astype(np.float64) != values  # NaN, fractions and overflow differ
+        if lossy.any():
+            raise ValueError(f"❌ {channel}: {int(lossy.sum())} value(s) cannot be stored as {dtype} "
+                             f"(e.g. {values[lossy][0]!r})")
+        return cast
+
+    # --------------------------------------------------------------------------
+    # 🔎 Reading
+    # --------------------------------------------------------------------------
+
+    def _bounds(self, station: str, start=None, end=None):
+        years = self.years(station)
+        if not years:
+            raise KeyError(f"❌ No data stored for station: {station}")
+        start = pd.Timestamp(start) if start is not None else self.year_start(years[0])
+        end = pd.Timestamp(end) if end is not None else self.year_start(years[-1] + 1)
+        return start.floor("min"), end.floor("min")
+
+    def read(self, station: str, channel: str, start=None, end=None) -> np.ndarray:
+        """
+        Return one channel over [start, end) as an array on the minute grid.
+
+        A range inside one stored year is a zero-copy view of the memmap;
+        ranges crossing years are stitched together (years that were never
+        written are filled with the missing-value marker).
+        """
+        start, end = self._bounds(station, start, end)
+        dtype = next((self.meta(station, y)["channels"][channel] for y in self.years(station)
+                      if channel in self.meta(station, y).get("channels", {})), None)
+        if dtype is None:
+            raise KeyError(f"❌ Channel {channel!r} not stored for {station}")
+
+        parts = []
+        for year in range(start.year, end.year + 1):
+            lo = max(start, self.year_start(year))
+            hi = min(end, self.year_start(year + 1))
+            if hi <= lo:
+                continue
+            i0 = (lo - self.year_start(year)) // MINUTE
+            i1 = (hi - self.year_start(year)) // MINUTE
+            if channel in self.meta(station, year).get("channels", {}):
+                parts.append(self._open(station, year, channel)[i0:i1])
+            else:
+                parts.append(np.full(i1 - i0, self._fill_value(dtype), dtype=dtype))
+
+        if len(parts) == 1:
+            return parts[0]  # Zero-copy view of the memmap
+        return np.concatenate(parts) if parts else np.empty(0, dtype=dtype)
+
+    def read_frame(self, station: str, channels=None, start=None, end=None) -> pd.DataFrame:
+        """
+        Build a DataFrame (with a reconstructed 'Timestamp') for a window.
+
+        Only the requested channels and minutes are touched on disk.
+        """
+        start, end = self._bounds(station, start, end)
+        channels = channels or self.channels(station)
+        data = {col: self.read(station, col, start, end) for col in channels}
+        n = len(next(iter(data.values()))) if data else 0
+        frame = pd.DataFrame({TIMESTAMP_COLUMN: pd.date_range(start, periods=n, freq="min")})
+        for col, values in data.items():
+            frame[col] = values
+        return frame
@@ -0,0 +1,217 @@
+"""
+Tests for SolarDataCleaner and ChunkedSolarDataCleaner.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.stats import zscore
+
+from src.clean import SolarDataCleaner, ChunkedSolarDataCleaner
+from src.loader import BaseCSVLoader
+from src.schema import STATION_DTYPES, SKIP_COLUMNS, TIMESTAMP_COLUMN
+
+COLUMNS = ["GHI", "DNI", "DHI", "ModA", "ModB", "WS", "WSgust"]
+
+
+def _sensor_frame(dtype, rows=500, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({col: rng.normal(400, 50, rows) for col in COLUMNS})
+    df.iloc[rng.integers(0, rows, 15), rng.integers(0, len(COLUMNS), 15)] = 5000  # Spikes
+    if np.dtype(dtype).kind == "f":
+        df.iloc[rng.integers(0, rows, 10), 0] = np.nan  # Gaps filled with the median
+    return df.round().astype(dtype)
+
+
+@pytest.mark.parametrize("dtype", ["int64", "float32", "float64"])
+def test_vectorized_flags_match_the_row_wise_rule(dtype):
+    df = _sensor_frame(dtype)
+    z = pd.DataFrame({col: zscore(df[col].fillna(df[col].median())) for col in COLUMNS})
+    expected = z.apply(lambda row: any(np.abs(row) > 3), axis=1)  # Original per-row rule
+
+    cleaner = SolarDataCleaner(df)
+    cleaner.flag_outliers(keep_zscores=True)
+
+    assert expected.any()
+    assert (cleaner.frame()["outlier_flag"] == expected).all()
+    assert np.isfinite(cleaner.frame()[[f"{col}_z" for col in COLUMNS]].to_numpy()).all()
+
+
+def test_chunked_cleaner_stats_match_full_scan(tmp_path):
+    raw = tmp_path / "raw.csv"
+    df = _sensor_frame("float64", rows=20000, seed=2)
+    df.insert(0, TIMESTAMP_COLUMN, pd.date_range("2021-01-01", periods=len(df), freq="min").strftime("%Y-%m-%d %H:%M"))
+    df.to_csv(raw, index=False)
+    loader = BaseCSVLoader(str(raw), parse_dates=[TIMESTAMP_COLUMN], verbose=False,
+                           dtype=STATION_DTYPES, skip_columns=SKIP_COLUMNS)
+
+    stats = ChunkedSolarDataCleaner(loader, str(tmp_path / "clean.csv"), chunksize=3000,
+                                    sketch_size=512).compute_stats()
+
+    ghi = df["GHI"].astype("float32").dropna()
+    assert stats.columns["GHI"]["count"] == len(ghi)
+    assert np.isclose(stats.mean("GHI"), ghi.mean(), rtol=1e-6)
+    rank = (ghi <= stats.median("GHI")).mean()  # Sketch median within 2% rank of the true one
+    assert abs(rank - 0.5) < 0.02
+
+
+def _diurnal_frame(days=59, seed=5):
+    rng = np.random.default_rng(seed)
+    times = pd.date_range("2022-01-01", periods=days * 144, freq="10min")  # Whole months: no thin buckets
+    base = np.clip(1000 * np.sin(np.pi * (times.hour.to_numpy() - 6) / 12), 0, None)  # Flat within each hour
+    return pd.DataFrame({TIMESTAMP_COLUMN: times, "GHI": base + rng.uniform(-5, 5, len(times))})
+
+
+@pytest.mark.parametrize("method", ["zscore", "mad"])
+def test_seasonal_scores_flag_a_spike_only_within_its_hour(method):
+    clean = _diurnal_frame()
+    spiked = clean.copy()
+    dawn = int(np.flatnonzero(spiked[TIMESTAMP_COLUMN] == pd.Timestamp("2022-02-10 07:20"))[0])
+    spiked.loc[dawn, "GHI"] = 900.0  # Ordinary at noon, impossible at 07:00
+
+    untouched = SolarDataCleaner(clean, outlier_columns=["GHI"], mode="seasonal", method=method)
+    untouched.flag_outliers()
+    seasonal = SolarDataCleaner(spiked, outlier_columns=["GHI"], mode="seasonal", method=method)
+    seasonal.flag_outliers()
+    global_ = SolarDataCleaner(spiked, outlier_columns=["GHI"])
+    global_.flag_outliers()
+
+    assert not untouched.outlier_mask().any()
+    assert np.flatnonzero(seasonal.outlier_mask()).tolist() == [dawn]
+    assert not global_.outlier_mask().any()  # Within the all-day spread
+
+
+def _qc_frame(rows=1000, seed=3):
+    rng = np.random.default_rng(seed)
+    times = pd.date_range("2022-06-01 06:00", periods=rows, freq="min").to_numpy().copy()
+    times[400:] += np.timedelta64(5, "m")  # Logger gap before row 400
+    df = pd.DataFrame({TIMESTAMP_COLUMN: times, **{
+        col: rng.uniform(lo, hi, rows).round(1)
+        for col, lo, hi in (("GHI", 200, 400), ("DNI", 300, 500), ("DHI", 50, 150), ("ModA", 200, 400),
+                            ("ModB", 200, 400), ("WS", 0, 5), ("WSgust", 0, 8))}})
+    df.loc[100:119, "GHI"] = 500.0  # Stuck sensor for 20 minutes
+    df.loc[0:49, "DNI"] = 0.0  # Constant zeros below the floor
+    df.loc[300, "GHI"] = 1500.0  # Spike: jump up and back down
+    df.loc[400, "DNI"] = 1700.0  # Same jump across the logger gap
+    df.loc[500, "DHI"] = 450.0  # Diffuse above global
+    return df
+
+
+def test_temporal_rules_set_their_bits():
+    df = _qc_frame()
+    cleaner = SolarDataCleaner(df, verbose=False, temporal_qc=True, flatline_minutes=10)
+    cleaner.flag_outliers()
+    mask = cleaner.qc_mask
+
+    flatline = np.flatnonzero(mask & cleaner.QC_FLATLINE)
+    step = np.flatnonzero(mask & cleaner.QC_STEP)
+    cross = np.flatnonzero(mask & cleaner.QC_CROSS)
+    assert flatline.tolist() == list(range(100, 120))
+    assert step.tolist() == [300, 301, 401]  # Not row 400: the jump into it spans the gap
+    assert 500 in cross and (df.loc[cross, "DHI"] > df.loc[cross, "GHI"] + 50).all()
+
+    shuffled = df.sample(frac=1.0, random_state=0)  # Rules follow time, not row order
+    again = SolarDataCleaner(shuffled, verbose=False, temporal_qc=True, flatline_minutes=10)
+    again.flag_outliers()
+    restored = pd.Series(again.qc_mask, index=shuffled.index).sort_index().to_numpy()
+    assert np.array_equal(restored & cleaner.QC_RULES, mask & cleaner.QC_RULES)
+
+
+def test_outlier_masks_and_views_follow_the_bitmask():
+    df = _qc_frame()
+    cleaner = SolarDataCleaner(df, verbose=False, temporal_qc=True, flatline_minutes=10)
+    cleaner.flag_outliers()
+    ghi = cleaner.outlier_columns.index("GHI")
+
+    assert np.array_equal((cleaner.qc_mask >> ghi) & 1 == 1, cleaner.scores[:, ghi] > cleaner.Z_THRESHOLD)
+    assert np.array_equal(cleaner.outlier_mask(), cleaner.qc_mask != 0)
+    assert np.array_equal(cleaner.outlier_mask(columns="GHI"), cleaner.scores[:, ghi] > 3)
+    rules = (cleaner.qc_mask & cleaner.QC_RULES) != 0
+    assert np.array_equal(cleaner.outlier_mask(threshold=4), (cleaner.scores > 4).any(axis=1) | rules)
+    assert np.array_equal(cleaner.outlier_mask(threshold=4, columns="GHI", rules=cleaner.QC_CROSS),
+                          (cleaner.scores[:, ghi] > 4) | ((cleaner.qc_mask & cleaner.QC_CROSS) != 0))
+
+    stuck = cleaner.view(flagged=True, columns=[], rules=cleaner.QC_FLATLINE)
+    assert stuck.index.tolist() == list(range(100, 120))
+    kept = cleaner.view()
+    assert len(kept) == int((cleaner.qc_mask == 0).sum()) and not kept["outlier_flag"].any()
+    with pytest.raises(KeyError):
+        cleaner.outlier_mask(columns="Tamb")
+
+
+def _frame(rows=2000):
+    df = _sensor_frame("float64", rows=rows, seed=7)
+    df.insert(0, TIMESTAMP_COLUMN, pd.date_range("2021-01-01", periods=rows, freq="min"))
+    return df
+
+
+def test_cleaner_leaves_the_input_frame_untouched():
+    df = _frame()
+    df["WS"] = df["WS"].astype(str)  # Needs numeric coercion
+    before = df.copy()
+
+    cleaner = SolarDataCleaner(df, verbose=False)
+    cleaned = cleaner.run()
+
+    pd.testing.assert_frame_equal(df, before)
+    assert cleaner.df is df
+    assert np.shares_memory(cleaner.numeric["GHI"].to_numpy(), df["GHI"].to_numpy())  # Numeric columns not copied
+    assert cleaned["GHI"].notna().all()
+    assert cleaned["WS"].dtype == np.float64
+
+
+def test_frame_keeps_raw_values_next_to_imputed_ones():
+    df = _frame()
+    df.loc[100:110, "GHI"] = np.nan
+    cleaner = SolarDataCleaner(df, verbose=False)
+    cleaner.run()
+
+    raw = cleaner.frame(imputed=False)
+    filled = cleaner.frame()
+
+    missing = df["GHI"].isna()
+    assert raw.loc[missing, "GHI"].isna().all()
+    assert filled.loc[missing, "GHI"].notna().all()
+    assert (filled["outlier_flag"].to_numpy() == (cleaner.qc_mask != 0)).all()
+
+
+def test_interpolate_fills_short_gaps_in_time_and_long_gaps_from_climatology():
+    times = pd.date_range("2022-03-01", periods=3 * 1440, freq="min")
+    minute = times.hour * 60 + times.minute
+    day = (times.day - 1).to_numpy()
+    ghi = np.clip(900 * np.sin(np.pi * (minute.to_numpy() - 360) / 720), 0, None) + 10 * day
+    df = pd.DataFrame({TIMESTAMP_COLUMN: times, "GHI": ghi})
+    short = np.arange(1440 + 600, 1440 + 605)  # 5 missing minutes on day 2
+    long = np.arange(1440 + 700, 1440 + 760)  # 60 missing minutes on day 2
+    df.loc[np.concatenate([short, long]), "GHI"] = np.nan
+
+    cleaner = SolarDataCleaner(df.iloc[::-1], outlier_columns=["GHI"], impute="interpolate", max_gap=10)  # Any row order
+    cleaner.convert_to_numeric()
+    cleaner.impute_missing()
+    filled = cleaner.imputed["GHI"].sort_index().to_numpy()
+
+    observed = df["GHI"].notna().to_numpy()
+    linear = np.interp(short, np.flatnonzero(observed), ghi[observed])
+    np.testing.assert_allclose(filled[short], linear)
+    climatology = (ghi[long - 1440] + ghi[long + 1440]) / 2  # Same minutes on days 1 and 3
+    np.testing.assert_allclose(filled[long], climatology)
+    assert not np.allclose(filled[long], np.interp(long, np.flatnonzero(observed), ghi[observed]))
+    assert np.isnan(df.loc[long, "GHI"]).all()  # Source frame untouched
+
+
+def test_run_many_cleans_each_source(tmp_path):
+    sources = {}
+    for key, seed in (("north", 1), ("south", 2)):
+        path = tmp_path / f"{key}.csv"
+        df = _sensor_frame("float64", rows=1500, seed=seed)
+        df.insert(0, TIMESTAMP_COLUMN, pd.date_range("2021-01-01", periods=1500, freq="min").strftime("%Y-%m-%d %H:%M"))
+        df.to_csv(path, index=False)
+        sources[key] = str(path)
+
+    serial = SolarDataCleaner.run_many(list(sources.values()), output_dir=str(tmp_path / "serial"), workers=1)
+    pooled = SolarDataCleaner.run_many(sources, output_dir=str(tmp_path / "pooled"), workers=2)
+
+    assert list(serial) == ["north", "south"]
+    for key in sources:
+        assert serial[key]["rows_out"] == pooled[key]["rows_out"] <= serial[key]["rows_in"] == 1500
+        assert len(pd.read_csv(pooled[key]["path"])) == pooled[key]["rows_out"]
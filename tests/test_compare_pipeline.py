@@ -0,0 +1,124 @@
+"""
+Tests for SolarComparisonPipeline.
+"""
+
+import numpy as np
+import pandas as pd
+
+from src.compare_pipeline import SolarComparisonPipeline
+from src.stations import Station
+from src.store import MinuteGridStore
+from src.schema import TIMESTAMP_COLUMN
+
+METRICS = SolarComparisonPipeline.METRICS
+
+
+def _site(rows, seed):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({m: rng.gamma(2.0, 150.0, rows).round(1).astype("float32") for m in METRICS})
+    df.loc[::97, "GHI"] = np.nan
+    return df
+
+
+def test_sites_sharing_a_name_stay_separate(tmp_path):
+    frames = {"north": _site(1200, 1), "south": _site(800, 2), "togo": _site(500, 3)}
+    for key, df in frames.items():
+        df.assign(Comments="").to_csv(tmp_path / f"{key}_clean.csv", index=False)
+    sites = [Station("north", "Benin", ""), Station("togo", "Togo", ""), Station("south", "Benin", "")]
+
+    pipeline = SolarComparisonPipeline(data_path=str(tmp_path), sites=sites, workers=2)
+    pipeline.load_data()
+
+    assert list(pipeline.df_all["country"].cat.categories) == ["north", "south", "togo"]
+    for key, df in frames.items():
+        pd.testing.assert_frame_equal(pipeline.site(key)[METRICS].reset_index(drop=True), df)
+        assert (pipeline.site(key)["country"] == key).all()
+    table = pipeline.summarize()
+    assert table.index.tolist() == ["Benin", "Benin", "Togo"]
+    assert table[("GHI", "count")].tolist() == [frames[k]["GHI"].count() for k in ("north", "south", "togo")]
+
+
+def test_store_sites_fill_their_own_slices(tmp_path):
+    store = MinuteGridStore(str(tmp_path))
+    times = pd.date_range("2021-12-31 23:00", periods=120, freq="min")  # Spans two stored years
+    for key, seed in (("benin", 1), ("togo", 2)):
+        store.write(key, _site(len(times), seed).assign(**{TIMESTAMP_COLUMN: times}))
+
+    pipeline = SolarComparisonPipeline(store=store, sites=["benin", "togo"], workers=2)
+    pipeline.load_data()
+
+    for key in ("benin", "togo"):
+        expected = store.read(key, "GHI")
+        assert pipeline.site(key)["GHI"].dtype == expected.dtype
+        assert np.array_equal(pipeline.site(key)["GHI"].to_numpy(), expected, equal_nan=True)
+
+
+def test_blank_lines_do_not_leave_gaps(tmp_path):
+    frames = {"benin": _site(10, 1), "togo": _site(7, 2)}
+    for key, df in frames.items():
+        df.to_csv(tmp_path / f"{key}_clean.csv", index=False)
+    with open(tmp_path / "benin_clean.csv", "a") as fh:
+        fh.write("\n\n")  # Trailing blank lines are counted but not parsed
+
+    pipeline = SolarComparisonPipeline(data_path=str(tmp_path), sites=["benin", "togo"])
+    pipeline.load_data()
+
+    assert len(pipeline.df_all) == 17
+    assert pipeline.offsets == {"benin": (0, 10), "togo": (10, 17)}
+    for key, df in frames.items():
+        pd.testing.assert_frame_equal(pipeline.site(key)[METRICS].reset_index(drop=True), df)
+
+
+def test_normality_is_keyed_by_country_name(tmp_path):
+    for key, seed in (("benin", 1), ("togo", 2)):
+        _site(200, seed).to_csv(tmp_path / f"{key}_clean.csv", index=False)
+
+    pipeline = SolarComparisonPipeline(data_path=str(tmp_path), sites=["benin", "togo"])
+    pipeline.load_data()
+
+    assert sorted(pipeline.test_normality()) == ["Benin", "Togo"]
+
+
+def test_box_statistics_match_matplotlib(tmp_path):
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from matplotlib.cbook import boxplot_stats
+
+    frames = {"benin": _site(3000, 4), "togo": _site(2000, 5)}
+    frames["togo"].loc[::50, "DNI"] = 5000.0  # Clear outliers
+    for key, df in frames.items():
+        df.to_csv(tmp_path / f"{key}_clean.csv", index=False)
+    pipeline = SolarComparisonPipeline(data_path=str(tmp_path), sites=list(frames), workers=1)
+    pipeline.load_data()
+
+    table = pipeline.aggregates()
+    for key, name in (("benin", "Benin"), ("togo", "Togo")):
+        for metric in METRICS:
+            expected = boxplot_stats(frames[key][metric].dropna().to_numpy(dtype="float64"))[0]
+            assert np.isclose(table.loc[name, (metric, "whislo")], expected["whislo"])
+            assert np.isclose(table.loc[name, (metric, "whishi")], expected["whishi"])
+            assert np.allclose(np.sort(pipeline._fliers[(key, metric)]), np.sort(expected["fliers"]))
+    assert pipeline._fliers[("togo", "DNI")].size >= 40
+
+    plt.close("all")
+    pipeline.plot_boxplots(["DNI"])
+    drawn = sum(len(line.get_ydata()) for line in plt.gca().lines if line.get_linestyle() in ("None", ""))
+    assert drawn == sum(pipeline._fliers[(key, "DNI")].size for key in frames)
+    plt.close("all")
+
+
+def test_kruskal_matches_scipy_and_reuses_the_ranks(tmp_path):
+    from scipy.stats import kruskal
+
+    frames = {"benin": _site(1500, 6), "togo": _site(900, 7), "sierra_leone": _site(1100, 8)}
+    for key, df in frames.items():
+        df.to_csv(tmp_path / f"{key}_clean.csv", index=False)
+    pipeline = SolarComparisonPipeline(data_path=str(tmp_path), workers=1)
+    pipeline.load_data()
+
+    expected = kruskal(*[frames[key]["GHI"].dropna().astype("float64") for key in pipeline.offsets])
+    assert np.allclose(pipeline.run_kruskal(), expected, rtol=1e-10)
+    assert np.allclose(pipeline.run_kruskal(resolution=0.1), expected, rtol=1e-10)
+    assert pipeline.ranks() is pipeline.ranks("GHI")
+    assert pipeline.ranks().labels == ["Benin", "Togo", "Sierra Leone"]
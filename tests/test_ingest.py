@@ -0,0 +1,96 @@
+"""
+Tests for IncrementalIngestor offsets and rebuilds.
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+
+from src.ingest import IncrementalIngestor
+from src.schema import TIMESTAMP_COLUMN
+
+
+def generate_station(rows, seed=0, start="2021-01-01 00:01"):
+    """Small raw-export block: one row per minute, smooth sensor values."""
+    rng = np.random.default_rng(seed)
+    ts = pd.date_range(start, periods=rows, freq="min")
+    df = pd.DataFrame({"Timestamp": ts.strftime("%Y-%m-%d %H:%M")})
+    for col in ["GHI", "DNI", "DHI", "ModA", "ModB"]:
+        df[col] = (500 + rng.normal(0, 20, rows)).round(1)
+    df["WS"] = rng.gamma(2, 1, rows).round(1)
+    df["WSgust"] = (df["WS"] * 1.5).round(1)
+    df["Tamb"] = (25 + rng.normal(0, 1, rows)).round(1)
+    df["Cleaning"] = 0
+    df["Comments"] = np.nan
+    return df
+
+
+def _setup(tmp_path, rows=3000):
+    raw = tmp_path / "raw.csv"
+    generate_station(rows, seed=3).to_csv(raw, index=False)
+    ingestor = IncrementalIngestor("togo", str(raw), str(tmp_path / "togo_clean.csv"),
+                                   state_dir=str(tmp_path / "state"))
+    return raw, ingestor
+
+
+def _append(raw, start, rows, partial=""):
+    block = generate_station(rows, seed=4, start=start).to_csv(header=False, index=False)
+    with open(raw, "a", encoding="utf-8", newline="") as fh:
+        fh.write(block + partial)
+
+
+def test_first_run_rebuilds_and_records_offset(tmp_path):
+    raw, ingestor = _setup(tmp_path)
+
+    ingestor.run()
+    state = ingestor.load_state()
+
+    assert state["byte_offset"] == raw.stat().st_size
+    assert state["rows_ingested"] == 3000
+    assert pd.Timestamp(state["last_timestamp"]) == pd.Timestamp("2021-01-03 02:00")
+
+
+def test_appended_rows_are_ingested_once(tmp_path):
+    raw, ingestor = _setup(tmp_path)
+    ingestor.run()
+    _append(raw, "2021-01-03 02:01", 100, partial="2021-01-03 03:41,1.0")  # Last line still being written
+
+    added = ingestor.run()
+    state = ingestor.load_state()
+    again = ingestor.run()
+
+    assert len(added) <= 100 and len(added) > 90  # A few rows may be cleaned away as outliers
+    assert state["rows_ingested"] == 3100
+    assert state["byte_offset"] == raw.stat().st_size - len("2021-01-03 03:41,1.0")
+    assert again.empty
+    output = pd.read_csv(tmp_path / "togo_clean.csv", parse_dates=[TIMESTAMP_COLUMN])
+    assert output[TIMESTAMP_COLUMN].is_unique
+
+
+def test_truncated_source_triggers_rebuild(tmp_path):
+    raw, ingestor = _setup(tmp_path)
+    ingestor.run()
+    generate_station(500, seed=5).to_csv(raw, index=False)  # Rotated file
+
+    ingestor.run()
+
+    with open(ingestor.state_path, encoding="utf-8") as fh:
+        assert json.load(fh)["rows_ingested"] == 500
+
+
+def test_rewritten_source_of_same_size_triggers_rebuild(tmp_path):
+    raw, ingestor = _setup(tmp_path)
+    ingestor.run()
+    offset = ingestor.load_state()["byte_offset"]
+    rewritten = generate_station(3000, seed=6)
+    rewritten["GHI"] += 1000  # Wider values keep the file no shorter than before
+    rewritten.to_csv(raw, index=False)
+    assert raw.stat().st_size >= offset
+
+    ingestor.run()
+
+    state = ingestor.load_state()
+    output = pd.read_csv(tmp_path / "togo_clean.csv")
+    assert state["byte_offset"] == raw.stat().st_size
+    assert (output["GHI"] > 1000).all()
@@ -0,0 +1,237 @@
+"""
+Tests for BaseCSVLoader.
+"""
+
+import os
+
+import numpy as np
+import pytest
+import pandas as pd
+
+from src.loader import BaseCSVLoader
+from src.schema import STATION_DTYPES, SKIP_COLUMNS, TIMESTAMP_COLUMN
+
+
+def _write_csv(path, rows=20, value=1.0):
+    pd.DataFrame({
+        "Timestamp": pd.date_range("2022-01-01", periods=rows, freq="min").strftime("%Y-%m-%d %H:%M"),
+        "GHI": [value] * rows,
+    }).to_csv(path, index=False)
+
+
+def _no_parse(*args, **kwargs):
+    raise AssertionError("CSV parsed although the cache is valid")
+
+
+def test_cache_serves_repeat_loads(tmp_path, monkeypatch):
+    path = tmp_path / "station.csv"
+    _write_csv(path)
+    first = BaseCSVLoader(str(path), parse_dates=["Timestamp"], verbose=False,
+                          cache_dir=str(tmp_path / "cache")).load()
+
+    monkeypatch.setattr(pd, "read_csv", _no_parse)
+    cached = BaseCSVLoader(str(path), parse_dates=["Timestamp"], verbose=False,
+                           cache_dir=str(tmp_path / "cache")).load()
+
+    pd.testing.assert_frame_equal(cached, first)
+    os.utime(path, ns=(0, 0))  # Touched only: content hash still matches
+    pd.testing.assert_frame_equal(BaseCSVLoader(str(path), parse_dates=["Timestamp"], verbose=False,
+                                                cache_dir=str(tmp_path / "cache")).load(), first)
+
+
+def test_cache_is_invalidated_by_size_or_content_changes(tmp_path):
+    path = tmp_path / "station.csv"
+    cache_dir = str(tmp_path / "cache")
+    _write_csv(path)
+    BaseCSVLoader(str(path), verbose=False, cache_dir=cache_dir).load()
+
+    _write_csv(path, rows=25)  # Size changed
+    assert len(BaseCSVLoader(str(path), verbose=False, cache_dir=cache_dir).load()) == 25
+
+    stat = path.stat()
+    _write_csv(path, rows=25, value=2.0)  # Same size, new bytes and mtime
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert path.stat().st_size == stat.st_size
+    assert BaseCSVLoader(str(path), verbose=False, cache_dir=cache_dir).load()["GHI"].eq(2.0).all()
+
+
+def test_declared_dtypes_are_applied(tmp_path):
+    path = tmp_path / "station.csv"
+    pd.DataFrame({
+        "Timestamp": ["2022-01-01 00:00", "2022-01-01 00:01", "2022-01-01 00:02"],
+        "GHI": [1.5, 2.5, np.nan],
+        "Cleaning": [0, 1, 0],
+        "Precipitation": [np.nan, np.nan, np.nan],
+        "Comments": ["a", "b", "c"],
+    }).to_csv(path, index=False)
+
+    df = BaseCSVLoader(str(path), parse_dates=["Timestamp"], verbose=False, dtype=STATION_DTYPES,
+                       skip_columns=SKIP_COLUMNS).load()
+
+    assert list(df.columns) == ["Timestamp", "GHI", "Cleaning", "Precipitation"]
+    assert df["GHI"].dtype == np.float32
+    assert df["Cleaning"].dtype == np.uint8
+    assert df["Precipitation"].dtype == np.float32
+
+
+def test_incomplete_flags_stay_float_and_empty_columns_are_dropped(tmp_path):
+    path = tmp_path / "station.csv"
+    pd.DataFrame({
+        "GHI": [1.0, 2.0],
+        "Cleaning": [1, np.nan],
+        "Precipitation": [np.nan, np.nan],
+    }).to_csv(path, index=False)
+
+    df = BaseCSVLoader(str(path), verbose=False, dtype=STATION_DTYPES, drop_empty=True).load()
+
+    assert list(df.columns) == ["GHI", "Cleaning"]
+    assert df["Cleaning"].dtype == np.float32
+    assert np.isnan(df["Cleaning"].iloc[1])
+
+
+def _write_station(path, rows=50, missing_flag_rows=()):
+    df = pd.DataFrame({
+        TIMESTAMP_COLUMN: pd.date_range("2022-01-01", periods=rows, freq="min").strftime("%Y-%m-%d %H:%M"),
+        "GHI": np.arange(rows, dtype=float),
+        "Cleaning": np.zeros(rows),
+    })
+    df.loc[list(missing_flag_rows), "Cleaning"] = np.nan
+    df.to_csv(path, index=False)
+    return df
+
+
+def _loader(path, **kwargs):
+    return BaseCSVLoader(str(path), parse_dates=[TIMESTAMP_COLUMN], verbose=False,
+                         dtype=STATION_DTYPES, skip_columns=SKIP_COLUMNS, **kwargs)
+
+
+def test_iter_chunks_dtypes_do_not_depend_on_chunk_content(tmp_path):
+    path = tmp_path / "station.csv"
+    _write_station(path, rows=50, missing_flag_rows=[35])  # Only the last chunk has a NaN flag
+
+    chunks = list(_loader(path).iter_chunks(20))
+
+    assert len(chunks) == 3
+    assert {str(chunk["Cleaning"].dtype) for chunk in chunks} == {"float32"}
+    assert {str(chunk["GHI"].dtype) for chunk in chunks} == {"float32"}
+
+
+def test_iter_chunks_time_window(tmp_path):
+    path = tmp_path / "station.csv"
+    _write_station(path, rows=50)
+
+    chunks = list(_loader(path).iter_chunks(7, columns=["GHI"], start="2022-01-01 00:10",
+                                            end="2022-01-01 00:20"))
+    window = pd.concat(chunks)
+
+    assert window["GHI"].tolist() == list(range(10, 20))
+    assert list(window.columns) == [TIMESTAMP_COLUMN, "GHI"]
+
+
+def _write_late_latin1(path, rows=5000):
+    lines = ["Timestamp,GHI,Site"]
+    lines += [f"2022-01-01 {i // 60 % 24:02d}:{i % 60:02d},{i},plain" for i in range(rows)]
+    lines.append("2022-01-02 00:00,1,Lom\xe9")  # Latin-1 'é' after the sniffed prefix
+    path.write_bytes(("\n".join(lines) + "\n").encode("latin1"))
+
+
+def test_encoding_sniffs_prefix_and_falls_back_during_parse(tmp_path):
+    path = tmp_path / "latin.csv"
+    _write_late_latin1(path)
+    loader = BaseCSVLoader(str(path), verbose=False)
+    loader.ENCODING_SNIFF_BYTES = 1024
+
+    assert loader.detect_encoding() == "utf-8"
+    df = loader.load()
+
+    assert loader.encoding == "latin1"
+    assert len(df) == 5001
+    assert df["Site"].iloc[-1] == "Lom\xe9"
+
+
+def test_iter_chunks_resumes_after_encoding_fallback(tmp_path):
+    path = tmp_path / "latin.csv"
+    _write_late_latin1(path, rows=60000)  # Several parser blocks before the bad byte
+    loader = BaseCSVLoader(str(path), verbose=False)
+    loader.ENCODING_SNIFF_BYTES = 1024
+
+    df = pd.concat(loader.iter_chunks(1000))
+
+    assert loader.encoding == "latin1"
+    assert len(df) == 60001
+    assert df["GHI"].tolist()[:60000] == list(range(60000))
+    assert df["Site"].iloc[-1] == "Lom\xe9"
+
+
+def test_declared_encoding_errors_are_not_masked(tmp_path):
+    path = tmp_path / "latin.csv"
+    _write_late_latin1(path)
+
+    with pytest.raises(UnicodeDecodeError):
+        BaseCSVLoader(str(path), verbose=False, encoding="utf-8").load()
+
+
+def _write_times(path, stamps):
+    pd.DataFrame({TIMESTAMP_COLUMN: stamps, "GHI": np.arange(len(stamps), dtype=float)}).to_csv(path, index=False)
+
+
+def test_detect_date_format_iso_and_day_first(tmp_path):
+    times = pd.date_range("2022-01-30 23:58", periods=5, freq="min")
+    iso, day_first = tmp_path / "iso.csv", tmp_path / "day_first.csv"
+    _write_times(iso, times.strftime("%Y-%m-%d %H:%M"))
+    _write_times(day_first, times.strftime("%d/%m/%Y %H:%M"))
+
+    iso_loader = BaseCSVLoader(str(iso), parse_dates=[TIMESTAMP_COLUMN], verbose=False)
+    day_loader = BaseCSVLoader(str(day_first), parse_dates=[TIMESTAMP_COLUMN], verbose=False)
+
+    assert iso_loader.detect_date_format() == "%Y-%m-%d %H:%M"
+    assert day_loader.detect_date_format() == "%d/%m/%Y %H:%M"
+    assert day_loader.load()[TIMESTAMP_COLUMN].tolist() == list(times)
+
+
+def test_rows_breaking_the_detected_format_fall_back(tmp_path):
+    path = tmp_path / "mixed.csv"
+    times = pd.date_range("2022-01-01", periods=20, freq="min")
+    stamps = list(times.strftime("%Y-%m-%d %H:%M"))
+    stamps[15] = times[15].strftime("%Y-%m-%dT%H:%M:%S")  # Layout changes after the sniffed rows
+    _write_times(path, stamps)
+    loader = BaseCSVLoader(str(path), parse_dates=[TIMESTAMP_COLUMN], verbose=False)
+    loader.DATE_SNIFF_ROWS = 10
+
+    df = loader.load()
+
+    assert loader.date_format == "%Y-%m-%d %H:%M"
+    assert pd.api.types.is_datetime64_any_dtype(df[TIMESTAMP_COLUMN])
+    assert df[TIMESTAMP_COLUMN].tolist() == list(times)
+    chunks = pd.concat(loader.iter_chunks(8))
+    assert chunks[TIMESTAMP_COLUMN].tolist() == list(times)
+
+
+def test_load_tail_resumes_from_offset(tmp_path):
+    path = tmp_path / "station.csv"
+    _write_station(path, rows=10)
+    loader = _loader(path)
+    head, offset = loader.load_tail(0)
+
+    with open(path, "a", encoding="utf-8") as fh:
+        fh.write("2022-01-01 00:10,10.0,\n2022-01-01 00:11,11.0")  # Last line still being written
+    tail, end = loader.load_tail(offset, names=loader.header())
+
+    assert len(head) == 10
+    assert tail["GHI"].tolist() == [10.0]
+    assert tail["Cleaning"].dtype == head["Cleaning"].dtype
+    assert end < path.stat().st_size
+
+
+def test_load_tail_skips_blank_appends(tmp_path):
+    path = tmp_path / "station.csv"
+    _write_station(path, rows=3)
+    loader = _loader(path)
+    _, offset = loader.load_tail(0)
+
+    with open(path, "a", encoding="utf-8") as fh:
+        fh.write("\n\n")
+    tail, end = loader.load_tail(offset, names=loader.header())
+
+    assert tail.empty
+    assert end == path.stat().st_size
@@ -0,0 +1,48 @@
+"""
+Tests for DailyPartials range queries.
+"""
+
+import numpy as np
+import pandas as pd
+
+from src.partials import DailyPartials
+from src.stats import ColumnStats
+from src.schema import TIMESTAMP_COLUMN
+
+
+def _station(seed, days=6):
+    rng = np.random.default_rng(seed)
+    rows = days * 144
+    df = pd.DataFrame({
+        TIMESTAMP_COLUMN: pd.date_range("2022-01-01", periods=rows, freq="10min"),
+        "GHI": rng.gamma(2, 150, rows).astype("float32"),
+        "Tamb": rng.normal(25 + seed, 3, rows),
+    })
+    df.loc[rng.integers(0, rows, 40), "GHI"] = np.nan
+    return df
+
+
+def test_range_stats_match_a_scan_of_the_same_rows(tmp_path):
+    frames = {"north": _station(1), "south": _station(2)}
+    DailyPartials.concat(DailyPartials.from_frame(df, key) for key, df in frames.items()).save(str(tmp_path))
+    partials = DailyPartials.load(str(tmp_path))
+
+    for stations in (["north"], ["north", "south"]):
+        merged = partials.stats(start="2022-01-02", end="2022-01-05", stations=stations)
+        rows = pd.concat([frames[key] for key in stations], ignore_index=True)
+        window = rows[(rows[TIMESTAMP_COLUMN] >= "2022-01-02") & (rows[TIMESTAMP_COLUMN] < "2022-01-05")]
+        scan = ColumnStats.from_frame(window)
+
+        assert list(merged.columns) == list(scan.columns)
+        for col in ("GHI", "Tamb"):
+            ours, theirs = merged.columns[col], scan.columns[col]
+            assert (ours["count"], ours["null_count"]) == (theirs["count"], theirs["null_count"])
+            assert (ours["min"], ours["max"]) == (theirs["min"], theirs["max"])
+            assert np.isclose(merged.mean(col), scan.mean(col))
+            assert np.isclose(merged.std(col), scan.std(col))
+            rank = (window[col].dropna() <= merged.median(col)).mean()  # Sketch median within 2% rank
+            assert abs(rank - 0.5) < 0.02
+        stamps = merged.columns[TIMESTAMP_COLUMN]
+        assert stamps["count"] == len(window)
+        assert (stamps["min"], stamps["max"]) == (scan.columns[TIMESTAMP_COLUMN]["min"],
+                                                  scan.columns[TIMESTAMP_COLUMN]["max"])
@@ -0,0 +1,82 @@
+"""
+Tests for SolarReportGenerator.
+"""
+
+import os
+
+import pandas as pd
+
+from benchmarks.synthetic import generate_station
+import src.report as report
+from src.report import SolarReportGenerator
+from src.schema import TIMESTAMP_COLUMN
+
+
+def _frame(rows, seed=0, start="2021-01-01 00:01"):
+    df = generate_station(rows, seed=seed, start=start).drop(columns=["Comments"])
+    df[TIMESTAMP_COLUMN] = pd.to_datetime(df[TIMESTAMP_COLUMN])
+    return df
+
+
+def test_run_many_writes_reports_under_the_output_root(tmp_path):
+    sources = {}
+    for key, seed in (("north", 1), ("south", 2)):
+        path = tmp_path / f"{key}.csv"
+        generate_station(1500, seed=seed).to_csv(path, index=False)
+        sources[key] = str(path)
+
+    results = SolarReportGenerator.run_many(list(sources.values()), output_dir=str(tmp_path / "out"),
+                                            fmt="json", workers=2)
+
+    for key in sources:
+        assert results[key]["rows"] == 1500
+        assert results[key]["summary"] == os.path.join(str(tmp_path / "out"), f"{key.title()}_summary_stats.json")
+        assert os.path.exists(results[key]["missing"])
+
+
+def test_save_uses_a_unique_temp_file_per_writer(tmp_path, monkeypatch):
+    written = []
+    real_write = report._write_table
+
+    def record(table, path, fmt):
+        written.append(path)
+        real_write(table, path, fmt)
+
+    monkeypatch.setattr(report, "_write_table", record)
+    reporter = SolarReportGenerator(_frame(200), country="togo", verbose=False)
+    summary, missing = reporter.get_summary_stats(), reporter.get_missing_report()
+    for _ in range(2):
+        reporter.save(summary, missing, output_dir=str(tmp_path))
+
+    assert len(set(written)) == 4  # No temp path reused, even for the same target
+    assert sorted(os.listdir(tmp_path)) == ["Togo_missing_report.csv", "Togo_summary_stats.csv"]
+
+
+def test_update_matches_a_full_generate():
+    head = _frame(48560)
+    tail = _frame(1440, seed=1, start=head[TIMESTAMP_COLUMN].iloc[-1] + pd.Timedelta(minutes=1))
+    full = SolarReportGenerator(pd.concat([head, tail], ignore_index=True), country="Benin",
+                                verbose=False).generate(quiet=True)["summary"]
+
+    report = SolarReportGenerator(head, country="Benin", verbose=False)
+    report.update(tail)
+    updated = report.generate(quiet=True)["summary"]
+
+    assert list(updated.index) == list(full.index)
+    assert list(updated.columns) == list(full.columns)
+    stamps = updated[TIMESTAMP_COLUMN]
+    assert stamps[["count", "min", "max"]].tolist() == full[TIMESTAMP_COLUMN][["count", "min", "max"]].tolist()
+    span = full.loc["max", TIMESTAMP_COLUMN] - full.loc["min", TIMESTAMP_COLUMN]
+    for row in ("25%", "50%", "75%"):
+        assert not pd.isna(stamps[row])
+        assert abs(stamps[row] - full.loc[row, TIMESTAMP_COLUMN]) <= span * 0.005
+
+    numeric = [c for c in full.columns if c != TIMESTAMP_COLUMN]
+    exact = updated.loc[["count", "min", "max"], numeric].astype(float)
+    pd.testing.assert_frame_equal(exact, full.loc[["count", "min", "max"], numeric].astype(float))
+    for col in numeric:
+        spread = float(full.loc["max", col]) - float(full.loc["min", col])
+        for row in ("mean", "std"):
+            assert abs(float(updated.loc[row, col]) - float(full.loc[row, col])) <= 1e-9 * max(spread, 1.0)
+        for row in ("25%", "50%", "75%"):
+            assert abs(float(updated.loc[row, col]) - float(full.loc[row, col])) <= 0.01 * max(spread, 1.0)
@@ -0,0 +1,65 @@
+"""
+Tests for RollupCube building, grain selection and queries.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.rollup import RollupCube
+from src.schema import TIMESTAMP_COLUMN
+
+
+def _minutes(seed, start="2022-01-20", periods=45 * 1440):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        TIMESTAMP_COLUMN: pd.date_range(start, periods=periods, freq="min"),
+        "GHI": rng.gamma(2, 150, periods).round(1),
+        "Tamb": rng.normal(25, 3, periods).round(1),
+    })
+    df.loc[rng.integers(0, periods, 500), "GHI"] = np.nan
+    return df
+
+
+@pytest.fixture
+def cube(tmp_path):
+    frames = {"north": _minutes(1), "south": _minutes(2, start="2022-01-25")}
+    cube = RollupCube(str(tmp_path / "rollups"))
+    for key, df in frames.items():
+        cube.build(key, df)
+    return cube, pd.concat(frames, names=["station", None]).reset_index(level=0)
+
+
+def test_grain_follows_window_alignment(cube):
+    cube, _ = cube
+
+    assert cube.grain_for() == "monthly"
+    assert cube.grain_for("2022-02-01", "2022-03-01") == "monthly"
+    assert cube.grain_for("2022-02-03", "2022-02-10") == "daily"
+    assert cube.grain_for("2022-02-03 05:00", "2022-02-10") == "hourly"
+    assert cube.grain_for("2022-02-01", "2022-03-01", freq="D") == "daily"
+    with pytest.raises(ValueError):
+        cube.grain_for("2022-02-03 05:30")
+
+
+def test_totals_and_queries_match_a_direct_groupby(cube):
+    cube, minutes = cube
+    window = minutes[(minutes[TIMESTAMP_COLUMN] >= "2022-02-01") & (minutes[TIMESTAMP_COLUMN] < "2022-03-01")]
+
+    totals = cube.totals(["GHI", "Tamb"], start="2022-02-01", end="2022-03-01")
+    grouped = window.groupby("station")
+    for metric in ("GHI", "Tamb"):
+        np.testing.assert_allclose(totals[(metric, "mean")], grouped[metric].mean())
+        np.testing.assert_allclose(totals[(metric, "max")], grouped[metric].max())
+        assert totals[(metric, "count")].tolist() == grouped[metric].count().tolist()
+    np.testing.assert_allclose(totals[("GHI", "energy")], grouped["GHI"].sum() / 60)
+    assert ("Tamb", "energy") not in totals.columns
+
+    days = cube.query(["GHI"], stations="north", start="2022-02-03", end="2022-02-10")
+    north = window[(window["station"] == "north") & (window[TIMESTAMP_COLUMN] >= "2022-02-03")
+                   & (window[TIMESTAMP_COLUMN] < "2022-02-10")]
+    daily = north.groupby(north[TIMESTAMP_COLUMN].dt.floor("D"))["GHI"]
+    assert days["period"].tolist() == daily.mean().index.tolist()
+    np.testing.assert_allclose(days["GHI_mean"], daily.mean())
+    np.testing.assert_allclose(days["GHI_max"], daily.max())
+    assert days["GHI_count"].tolist() == daily.count().tolist()
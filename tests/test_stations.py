@@ -0,0 +1,74 @@
+"""
+Tests for the station registry, StationDataLoader and load_many.
+"""
+
+import pandas as pd
+import pytest
+
+from src.stations import Station, StationDataLoader, get_station, load_many, map_sources
+from src.schema import TIMESTAMP_COLUMN
+
+
+def _write_station(path, minutes):
+    pd.DataFrame({
+        TIMESTAMP_COLUMN: [f"2022-01-01 00:{m:02d}" for m in minutes],
+        "GHI": [float(m) for m in minutes],
+        "Comments": [""] * len(minutes),
+    }).to_csv(path, index=False)
+
+
+def test_out_of_order_file_is_sorted(tmp_path):
+    path = tmp_path / "station.csv"
+    _write_station(path, [3, 0, 2, 1])
+
+    df = StationDataLoader(str(path), verbose=False).load()
+
+    assert df[TIMESTAMP_COLUMN].is_monotonic_increasing
+    assert df["GHI"].tolist() == [0.0, 1.0, 2.0, 3.0]
+    assert df.index.tolist() == [0, 1, 2, 3]
+
+
+def test_sorted_file_is_not_resorted(tmp_path, monkeypatch):
+    path = tmp_path / "station.csv"
+    _write_station(path, [0, 1, 2, 3])
+
+    def no_sort(*args, **kwargs):
+        raise AssertionError("sorted file was sorted again")
+
+    monkeypatch.setattr(pd.DataFrame, "sort_values", no_sort)
+    df = StationDataLoader(str(path), verbose=False).load()
+
+    assert df["GHI"].tolist() == [0.0, 1.0, 2.0, 3.0]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_load_many_returns_one_frame_per_key(tmp_path, workers):
+    stations = []
+    for key, minutes in (("north", [0, 1, 2]), ("south", [5, 4])):
+        path = tmp_path / f"{key}.csv"
+        _write_station(path, minutes)
+        stations.append(Station(key, key.title(), str(path)))
+
+    frames = load_many(stations, workers=workers)
+
+    assert list(frames) == ["north", "south"]
+    assert len(frames["north"]) == 3
+    assert frames["south"]["GHI"].tolist() == [4.0, 5.0]
+
+
+def test_unknown_station_key_is_rejected():
+    assert get_station("togo").name == "Togo"
+    with pytest.raises(KeyError):
+        get_station("atlantis")
+
+
+def test_listed_sources_with_the_same_file_name_are_rejected(tmp_path):
+    paths = []
+    for site in ("north", "south"):
+        (tmp_path / site).mkdir()
+        paths.append(str(tmp_path / site / "station.csv"))
+
+    with pytest.raises(ValueError, match="Duplicate source key 'station'"):
+        map_sources(len, paths)
+    assert map_sources(lambda key, src: src, dict(zip(["north", "south"], paths)), workers=1) == {
+        "north": paths[0], "south": paths[1]}
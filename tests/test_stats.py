@@ -0,0 +1,105 @@
+"""
+Tests for ColumnStats and QuantileSketch.
+"""
+
+import numpy as np
+import pandas as pd
+
+from src.stats import ColumnStats, QuantileSketch
+
+
+def _frame(rows=1000, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "Timestamp": pd.date_range("2022-01-01", periods=rows, freq="min"),
+        "GHI": rng.gamma(2, 100, rows).astype("float32"),
+        "Tamb": rng.normal(25, 3, rows),
+    })
+    df.loc[::17, "GHI"] = np.nan
+    return df
+
+
+def test_describe_matches_pandas_layout_and_values():
+    df = _frame()
+
+    ours = ColumnStats.from_frame(df).describe()
+    theirs = df.describe()
+
+    assert list(ours.index) == list(theirs.index)  # std last with a datetime column
+    assert list(ours.columns) == list(theirs.columns)
+    for col in ["GHI", "Tamb"]:
+        np.testing.assert_allclose(ours[col].astype(float), theirs[col].astype(float), rtol=1e-5)
+    assert ours.loc["50%", "Timestamp"] == theirs.loc["50%", "Timestamp"]
+
+
+def test_describe_numeric_only_keeps_std_third():
+    df = _frame().drop(columns=["Timestamp"])
+
+    assert list(ColumnStats.from_frame(df).describe().index) == list(df.describe().index)
+
+
+def test_merged_stats_match_a_full_scan():
+    df = _frame(5000)
+    full = ColumnStats.from_frame(df)
+    merged = ColumnStats.from_frame(df.iloc[:3000]).merge(ColumnStats.from_frame(df.iloc[3000:]))
+
+    for col in ("GHI", "Tamb"):
+        assert merged.columns[col]["count"] == full.columns[col]["count"]
+        assert merged.columns[col]["null_count"] == full.columns[col]["null_count"]
+        assert merged.columns[col]["min"] == full.columns[col]["min"]
+        assert np.isclose(merged.mean(col), full.mean(col))
+        assert np.isclose(merged.std(col), full.std(col))
+        assert merged.columns[col]["quantiles"] is None  # Exact quantiles do not merge
+    assert merged.rows() == full.rows() == 5000
+
+
+def test_sketched_stats_merge_their_medians():
+    df = _frame(5000)
+    full = ColumnStats.from_frame(df)
+    merged = ColumnStats.from_frame(df.iloc[:3000], sketch_size=512).merge(
+        ColumnStats.from_frame(df.iloc[3000:], sketch_size=512))
+
+    for col in ("GHI", "Tamb"):
+        assert merged.columns[col]["count"] == full.columns[col]["count"]
+        assert np.isclose(merged.std(col), full.std(col))
+        assert abs(merged.median(col) - full.median(col)) < 0.05 * full.std(col)
+
+
+def test_filled_moments_match_the_median_filled_column(tmp_path):
+    df = _frame()
+    path = str(tmp_path / "clean.stats.json")
+    ColumnStats.from_frame(df).save(path)
+
+    stats = ColumnStats.load(path)
+    mean, std = stats.filled_moments("GHI")
+
+    filled = df["GHI"].astype("float64").fillna(df["GHI"].median())
+    assert stats.median("GHI") == df["GHI"].median()
+    assert np.isclose(mean, filled.mean())
+    assert np.isclose(std, filled.std(ddof=0))
+
+
+def test_sketch_quantiles_stay_within_rank_error():
+    rng = np.random.default_rng(3)
+    values = rng.gamma(2, 100, 200_000)
+    sketch = QuantileSketch(256).update(values)
+
+    assert sketch.count() == values.size
+    estimates = sketch.quantiles([0.1, 0.25, 0.5, 0.75, 0.9])
+    ranks = np.searchsorted(np.sort(values), estimates) / values.size
+    assert np.all(np.abs(ranks - [0.1, 0.25, 0.5, 0.75, 0.9]) < 0.02)
+
+
+def test_merged_sketches_match_one_sketch_and_round_trip():
+    rng = np.random.default_rng(4)
+    parts = [rng.normal(i, 1.0, 30_000) for i in range(4)]
+    merged = QuantileSketch(256)
+    for part in parts:
+        merged = merged.merge(QuantileSketch(256).update(part))
+    restored = QuantileSketch.from_dict(merged.to_dict())
+
+    values = np.sort(np.concatenate(parts))
+    ranks = np.searchsorted(values, restored.quantiles([0.25, 0.5, 0.75])) / values.size
+    assert restored.count() == values.size
+    assert np.all(np.abs(ranks - [0.25, 0.5, 0.75]) < 0.02)
+    assert np.array_equal(restored.quantiles([0.5]), merged.quantiles([0.5]))
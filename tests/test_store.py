@@ -0,0 +1,89 @@
+"""
+Tests for MinuteGridStore.
+"""
+
+import matplotlib
+matplotlib.use("Agg")  # Plots are rendered off-screen
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.store import MinuteGridStore
+from src.schema import TIMESTAMP_COLUMN
+from src.report import SolarReportGenerator
+from src.plots import plot_time_series_from_store
+
+
+def _chunk(start, values, dtype):
+    return pd.DataFrame({
+        TIMESTAMP_COLUMN: pd.date_range(start, periods=len(values), freq="min"),
+        "Cleaning": np.array(values, dtype=dtype),
+        "GHI": np.arange(len(values), dtype=dtype if dtype.startswith("float") else "float32"),
+    })
+
+
+def test_read_returns_written_minutes(tmp_path):
+    store = MinuteGridStore(str(tmp_path))
+    store.write("togo", _chunk("2022-03-01 00:00", [0, 1, 0], "float32"))
+
+    ghi = store.read("togo", "GHI", start="2022-02-28 23:59", end="2022-03-01 00:04")
+
+    assert np.array_equal(ghi, [np.nan, 0, 1, 2, np.nan], equal_nan=True)
+
+
+def test_mixed_dtype_chunks_keep_the_stored_dtype(tmp_path):
+    store = MinuteGridStore(str(tmp_path))
+    store.write("togo", _chunk("2022-01-01 00:00", [0, 1, 0], "uint8"))
+    store.write("togo", _chunk("2022-01-01 00:03", [1, 1, 0], "float32"))  # Same year, wider dtype
+    store.write("togo", _chunk("2022-01-01 00:06", [1], "float64"))
+
+    cleaning = store.read("togo", "Cleaning", start="2022-01-01 00:00", end="2022-01-01 00:07")
+
+    assert store.meta("togo", 2022)["channels"]["Cleaning"] == "uint8"
+    assert cleaning.dtype == np.uint8
+    assert cleaning.tolist() == [0, 1, 0, 1, 1, 0, 1]
+
+
+def test_lossy_chunk_cast_is_rejected(tmp_path):
+    store = MinuteGridStore(str(tmp_path))
+    store.write("togo", _chunk("2022-01-01 00:00", [0, 1], "uint8"))
+
+    with pytest.raises(ValueError, match="Cleaning"):
+        store.write("togo", _chunk("2022-01-01 00:02", [np.nan, 1], "float32"))
+    with pytest.raises(ValueError, match="Cleaning"):
+        store.write("togo", _chunk("2022-01-01 00:02", [0.5, 1], "float32"))
+
+
+def test_reads_across_years_are_stitched(tmp_path):
+    store = MinuteGridStore(str(tmp_path))
+    store.write("togo", _chunk("2021-12-31 23:58", [0, 1, 0, 1], "float32"))
+
+    ghi = store.read("togo", "GHI", start="2021-12-31 23:58", end="2022-01-01 00:02")
+
+    assert ghi.tolist() == [0, 1, 2, 3]
+
+
+def test_report_and_plot_read_a_store_window(tmp_path, monkeypatch):
+    store = MinuteGridStore(str(tmp_path))
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({TIMESTAMP_COLUMN: pd.date_range("2022-03-01 00:00", periods=120, freq="min"),
+                       **{col: rng.uniform(0, 900, 120).astype("float32") for col in ("GHI", "DNI", "DHI", "Tamb")}})
+    store.write("togo", df)
+    window = df.iloc[30:60].reset_index(drop=True)
+
+    report = SolarReportGenerator.from_store(store, "togo", channels=["GHI", "Tamb"],
+                                             start="2022-03-01 00:30", end="2022-03-01 01:00")
+
+    assert report.country == "Togo"
+    assert report.df[TIMESTAMP_COLUMN].tolist() == window[TIMESTAMP_COLUMN].tolist()
+    assert np.array_equal(report.df["GHI"].to_numpy(), window["GHI"].to_numpy())
+    summary = report.get_summary_stats()
+    assert summary.loc["count", "Tamb"] == 30
+    assert np.isclose(summary.loc["mean", "GHI"], window["GHI"].mean())
+
+    monkeypatch.setattr(plt, "show", lambda: None)
+    plot_time_series_from_store(store, "togo", start="2022-03-01 00:30", end="2022-03-01 01:00")
+    for ax, col in zip(plt.gcf().axes, ("GHI", "DNI", "DHI", "Tamb")):
+        assert np.array_equal(np.asarray(ax.lines[0].get_ydata()), window[col].to_numpy())
+    plt.close("all")